@@ -0,0 +1,109 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Benchmark comparing sequential blocking calls of
+#              NobelPrizeGRPCClient with the same queries fanned out as
+#              concurrent futures, and as asyncio calls, over the same
+#              channel pool.
+#
+# Example (against a local server started by the script):
+#   python3 benchmark_grpc_fan_out.py --start-server snapshot --queries 200
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+from nobel_prize_grpc_client import (
+    GRPC_CHANNELS,
+    NobelPrizeGRPCClient,
+    AsyncNobelPrizeGRPCClient
+)
+from nobel_prize_load_generator import start_server
+
+QUERIES = [
+    ("count_laureates_by_category_and_years", ("physics", 2013, 2023)),
+    ("count_laureates_by_category_and_years", ("chemistry", 2015, 2020)),
+    ("count_laureates_by_motivation_keyword", ("discovery",)),
+    ("count_laureates_by_motivation_keyword", ("peace",)),
+    ("get_laureate_details_by_name", ("Alain", "Aspect")),
+    ("get_laureate_details_by_name", ("Jane", "Doe")),
+]
+
+
+def measure(run: Callable[[], list], runs: int) -> Tuple[List[float], list]:
+    """Time a strategy, returning its durations in ms and last results."""
+    durations = []
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = run()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations, results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare sequential and fanned-out gRPC calls")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument("--channels", type=int, default=GRPC_CHANNELS,
+                        help="Channels in the client pool")
+    parser.add_argument("--queries", type=int, default=100,
+                        help="Queries sent per run")
+    parser.add_argument("--runs", type=int, default=10,
+                        help="Measured runs per strategy")
+    parser.add_argument("--start-server", choices=("redis", "snapshot"),
+                        help="Start a local server with this backend first")
+    args = parser.parse_args()
+
+    target = f"{args.host}:{args.port}"
+    server = start_server(args.start_server, target) \
+        if args.start_server else None
+    queries = list(itertools.islice(itertools.cycle(QUERIES), args.queries))
+    try:
+        client = NobelPrizeGRPCClient(args.host, args.port, args.channels)
+        loop = asyncio.new_event_loop()
+
+        async def create_async_client():
+            async_client = AsyncNobelPrizeGRPCClient(args.host, args.port,
+                                                     args.channels)
+            await async_client.wait_for_ready()
+            return async_client
+
+        async_client = loop.run_until_complete(create_async_client())
+
+        strategies = {
+            "sequential": lambda: [client.call(method, query_args)
+                                   for method, query_args in queries],
+            "futures": lambda: client.fan_out(queries),
+            "asyncio": lambda: loop.run_until_complete(
+                async_client.fan_out(queries)),
+        }
+        expected = None
+        print(f"{len(queries)} queries per run over {args.channels} "
+              f"channel(s)")
+        print(f"{'strategy':12} {'p50 ms':>9} {'mean ms':>9} {'queries/s':>10}")
+        for name, run in strategies.items():
+            run()  # Warm-up
+            durations, results = measure(run, args.runs)
+            if expected is None:
+                expected = results
+            elif results != expected:
+                print(f"{name}: results differ from sequential calls")
+            median = statistics.median(durations)
+            print(f"{name:12} {median:>9.2f} "
+                  f"{statistics.mean(durations):>9.2f} "
+                  f"{len(queries) / median * 1000:>10.0f}")
+
+        loop.run_until_complete(async_client.close())
+        loop.close()
+        client.close()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
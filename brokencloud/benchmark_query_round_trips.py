@@ -0,0 +1,155 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Benchmark comparing the Redis round trips and latency of the
+#              NobelPrizeClient queries before (one FT.SEARCH followed by one
+#              JSON.GET per hit, for every query) and after (the category
+#              and year counts and the name lookup read from the hashes
+#              built at ingest, the motivation count answered by the
+#              client's motivation index after one GET of the version).
+# DEPENDENCY: Ensure that the sample Noble prize data is added to Redis DB.
+#             This can be done using the « nobel_prize_rediscloud_setup.py »
+#             script.
+
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import redis
+from dotenv import load_dotenv
+from redis.commands.search.query import Query
+from nobel_prize_client import (
+    NobelPrizeClient,
+    category_year_query,
+    motivation_query,
+    name_query
+)
+
+# Loading variables from .env file
+load_dotenv()
+
+# Constants
+REDIS_HOST = os.getenv("REDIS_HOST")
+REDIS_PORT = os.getenv("REDIS_PORT")
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+
+QUERIES = [
+    ("count_laureates_by_category_and_years", ("physics", 2013, 2023)),
+    ("count_laureates_by_motivation_keyword", ("discovery",)),
+    ("get_laureate_details_by_name", ("Alain", "Aspect")),
+]
+
+
+class RoundTripCounter:
+    """
+    Counts the packets sent to Redis by every connection of the process.
+
+    A pipeline is written to the socket with a single packed send, so the
+    number of sends equals the number of network round trips. An optional
+    artificial delay is added per send to emulate a remote Redis (~60 ms
+    for Redis Cloud) when benchmarking against a local instance.
+    """
+
+    def __init__(self, added_rtt_ms: float = 0.0):
+        self.count = 0
+        self.added_rtt = added_rtt_ms / 1000
+        self._original = redis.connection.AbstractConnection.send_packed_command
+
+    def __enter__(self):
+        counter = self
+        original = self._original
+
+        def send_packed_command(connection, command, check_health=True):
+            counter.count += 1
+            if counter.added_rtt:
+                time.sleep(counter.added_rtt)
+            return original(connection, command, check_health)
+
+        redis.connection.AbstractConnection.send_packed_command = \
+            send_packed_command
+        return self
+
+    def __exit__(self, *exc_info):
+        redis.connection.AbstractConnection.send_packed_command = \
+            self._original
+
+    def reset(self):
+        self.count = 0
+
+
+class LegacyNobelPrizeClient(NobelPrizeClient):
+    """
+    NobelPrizeClient with the original one JSON.GET per hit strategy.
+
+    The laureate counts and name lookup hashes are skipped as well, so every
+    query goes through the search, as all of them did originally.
+    """
+
+    def count_laureates_by_category_and_years(self, category: str,
+                                              start_year: int,
+                                              end_year: int) -> int:
+        return self._fold_search(
+            "count_laureates_by_category_and_years",
+            (category, start_year, end_year),
+            category_year_query(category, start_year, end_year))
+
+    def count_laureates_by_motivation_keyword(self, keyword: str) -> int:
+        return self._fold_search("count_laureates_by_motivation_keyword",
+                                 (keyword,), motivation_query(keyword))
+
+    def get_laureate_details_by_name(self, firstname: str,
+                                     surname: str) -> List[Dict[str, str]]:
+        return self._fold_search("get_laureate_details_by_name",
+                                 (firstname, surname),
+                                 name_query(firstname, surname))
+
+    def _search_pages(self, query_str: str,
+                      page_size: int = None) -> Iterator[List[Dict]]:
+        result = self.search_idx.search(Query(query_str))
+        yield [self.redis_client.json().get(doc.id) for doc in result.docs]
+
+
+def measure(counter: RoundTripCounter, func: Callable, args: tuple,
+            runs: int) -> Tuple[int, List[float]]:
+    """Return the round trips of one call and the latencies in ms."""
+    func(*args)  # Warm up the connection pool
+    delays = []
+    round_trips = 0
+    for _ in range(runs):
+        counter.reset()
+        start = time.perf_counter()
+        func(*args)
+        delays.append((time.perf_counter() - start) * 1000)
+        round_trips = counter.count
+    return round_trips, delays
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare Redis round trips before and after the fix")
+    parser.add_argument("--runs", type=int, default=50,
+                        help="Measured calls per query and strategy")
+    parser.add_argument("--added-rtt-ms", type=float, default=0.0,
+                        help="Artificial delay per round trip (e.g. 60)")
+    args = parser.parse_args()
+
+    clients = {
+        "before": LegacyNobelPrizeClient(REDIS_HOST, REDIS_PORT,
+                                         REDIS_PASSWORD),
+        "after": NobelPrizeClient(REDIS_HOST, REDIS_PORT, REDIS_PASSWORD),
+    }
+
+    print(f"{'query':40} {'strategy':8} {'round trips':>11} "
+          f"{'p50 ms':>9} {'mean ms':>9}")
+    with RoundTripCounter(args.added_rtt_ms) as counter:
+        for method, query_args in QUERIES:
+            for strategy, client in clients.items():
+                round_trips, delays = measure(
+                    counter, getattr(client, method), query_args, args.runs)
+                print(f"{method:40} {strategy:8} {round_trips:>11} "
+                      f"{statistics.median(delays):>9.3f} "
+                      f"{statistics.mean(delays):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
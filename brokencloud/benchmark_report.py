@@ -0,0 +1,471 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Latency report generator for benchmark runs. It reads any
+#              number of runs (load generator reports, microbenchmark suite
+#              results or delay CSV files such as « data/*_delays.csv ») and
+#              writes a single Markdown or HTML report with:
+#                - percentiles of every query with confidence intervals
+#                - a side-by-side comparison of every run with a baseline run
+#                - latency CDFs
+#                - throughput-vs-latency curves of runs measured at several
+#                  request rates
+#              The HTML report draws the charts as inline SVG, so it needs
+#              no plotting library and opens in any browser.
+#
+# Example:
+#   python3 benchmark_report.py \
+#       "ec2=../data/category_year_delays.csv,../data/motivation_keyword_delays.csv,../data/name_details_delays.csv" \
+#       redis=load_redis.json snapshot=load_snapshot.json --output report.html
+
+import argparse
+import csv
+import html
+import json
+import math
+import os
+import statistics
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from nobel_prize_histogram import LatencyHistogram
+
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+CDF_QUANTILES = (1.0, 5.0, 10.0, 25.0, 50.0, 75.0, 90.0, 95.0, 99.0, 99.9)
+# Query kind of the delay CSV files, by file name
+CSV_KINDS = {
+    'category_year_delays': 'category_year',
+    'motivation_keyword_delays': 'motivation_keyword',
+    'name_details_delays': 'laureate_name',
+}
+# Nanoseconds per unit named in a CSV column header
+CSV_UNITS = (('nano', 1), ('micro', 1e3), ('milli', 1e6), ('second', 1e9))
+COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+          "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf")
+
+
+class Run:
+    """Latencies of one benchmark run, per query kind, in nanoseconds."""
+
+    def __init__(self, label: str, sources: List[str]):
+        self.label = label
+        self.sources = sources
+        self.kinds: Dict[str, LatencyHistogram] = {}
+        self.throughput_qps: Optional[float] = None
+        self.errors: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        """Label, with the throughput of load generator runs."""
+        if self.throughput_qps is None:
+            return self.label
+        return f"{self.label} @ {self.throughput_qps:.0f} req/s"
+
+
+def load_csv(run: Run, path: str):
+    """Add the delays of a CSV file (first column, unit in its header)."""
+    kind = os.path.splitext(os.path.basename(path))[0]
+    kind = CSV_KINDS.get(kind, kind)
+    histogram = run.kinds.setdefault(kind, LatencyHistogram(3))
+    with open(path, 'r', newline='') as file:
+        rows = csv.reader(file)
+        header = next(rows)[0].lower()
+        scale = next((factor for unit, factor in CSV_UNITS
+                      if unit in header), 1e6)
+        for row in rows:
+            if row and row[0].strip():
+                histogram.record(round(float(row[0]) * scale))
+
+
+def load_json(run: Run, path: str):
+    """
+    Add a load generator report or microbenchmark suite result.
+
+    Suite benchmarks become query kinds, with the per-call time of every
+    sample as a latency.
+    """
+    with open(path, 'r') as file:
+        data = json.load(file)
+    if 'rpcs' in data:
+        for kind, rpc in data['rpcs'].items():
+            histogram = run.kinds.setdefault(kind, LatencyHistogram())
+            histogram.merge(LatencyHistogram.from_dict(
+                rpc['latency_histogram_ns']))
+        run.throughput_qps = data.get('throughput_qps')
+        run.errors = (run.errors or 0) + data.get('errors', 0)
+        if not run.label:
+            run.label = data.get('config', {}).get('label') or ''
+    elif 'benchmarks' in data:
+        for name, benchmark in data['benchmarks'].items():
+            histogram = run.kinds.setdefault(name, LatencyHistogram(3))
+            for value in benchmark['samples_ns']:
+                histogram.record(round(value))
+    else:
+        raise ValueError(f"{path}: not a load generator or benchmark suite "
+                         f"result")
+
+
+def load_run(spec: str) -> Run:
+    """
+    Load a run from a [LABEL=]PATH[,PATH...] argument.
+
+    All the files of one argument are merged into one run, e.g. the three
+    delay CSV files of one measurement campaign.
+    """
+    label, _, paths = spec.rpartition('=')
+    paths = [path for path in paths.split(',') if path]
+    run = Run(label, paths)
+    for path in paths:
+        if path.endswith('.csv'):
+            load_csv(run, path)
+        else:
+            load_json(run, path)
+    if not run.label:
+        run.label = os.path.splitext(os.path.basename(paths[0]))[0]
+    return run
+
+
+def percentile_ci(histogram: LatencyHistogram, percentile: float,
+                  confidence: float = 0.95) -> Tuple[int, int, int]:
+    """
+    Return a percentile and its distribution-free confidence interval.
+
+    The interval lies between the order statistics whose ranks bound the
+    percentile's rank with the given confidence (normal approximation of
+    the binomial distribution), so it makes no assumption about the shape
+    of the latency distribution.
+
+    Returns:
+        (value, lower bound, upper bound), in nanoseconds, or three Nones
+        for a histogram without samples
+    """
+    n = histogram.total_count
+    if not n:
+        return None, None, None
+    q = percentile / 100
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    spread = z * math.sqrt(n * q * (1 - q))
+    lower = max(1, math.floor(n * q - spread))
+    upper = min(n, math.ceil(n * q + spread) + 1)
+    return (histogram.percentile(percentile),
+            histogram.value_at_rank(lower), histogram.value_at_rank(upper))
+
+
+def cdf_points(histogram: LatencyHistogram) -> List[Tuple[float, float]]:
+    """
+    Return (latency in ms, cumulative fraction) at every bucket, no points
+    for a histogram without samples.
+    """
+    points = []
+    seen = 0
+    for _, highest, count in histogram.buckets():
+        seen += count
+        points.append((min(highest, histogram.max) / 1e6,
+                       seen / histogram.total_count))
+    return points
+
+
+def compare_runs(baseline: Run, run: Run,
+                 confidence: float) -> List[Dict]:
+    """
+    Compare the percentiles of two runs, query kind by query kind.
+
+    A change is significant when the confidence intervals of the two
+    percentiles do not overlap. Query kinds without samples in either run
+    are left out.
+    """
+    rows = []
+    for kind in baseline.kinds:
+        if (kind not in run.kinds or not baseline.kinds[kind].total_count or
+                not run.kinds[kind].total_count):
+            continue
+        row = {'kind': kind}
+        for percentile in (50.0, 99.0):
+            before, before_low, before_high = percentile_ci(
+                baseline.kinds[kind], percentile, confidence)
+            after, after_low, after_high = percentile_ci(
+                run.kinds[kind], percentile, confidence)
+            row[percentile] = {
+                'baseline_ns': before,
+                'run_ns': after,
+                'change': after / before - 1 if before else 0.0,
+                'significant': after_low > before_high or
+                after_high < before_low,
+            }
+        rows.append(row)
+    return rows
+
+
+def throughput_curves(runs: List[Run]) -> Dict[str, List[Run]]:
+    """Group the runs measured at several request rates by label."""
+    curves: Dict[str, List[Run]] = {}
+    for run in runs:
+        if run.throughput_qps is not None:
+            curves.setdefault(run.label, []).append(run)
+    return {label: sorted(points, key=lambda run: run.throughput_qps)
+            for label, points in curves.items() if len(points) > 1}
+
+
+def format_ms(value_ns: Optional[float]) -> str:
+    """
+    Format nanoseconds as milliseconds with 4 significant digits, "n/a"
+    for the missing value of a histogram without samples.
+    """
+    return "n/a" if value_ns is None else f"{value_ns / 1e6:.4g}"
+
+
+def format_change(change: float, significant: bool) -> str:
+    return f"{change:+.1%}" + (" *" if significant else "")
+
+
+def svg_chart(lines: List[Tuple[str, List[Tuple[float, float]]]],
+              x_label: str, y_label: str, log_x: bool = False,
+              width: int = 640, height: int = 360) -> str:
+    """
+    Draw a line chart as inline SVG.
+
+    Args:
+        lines: (legend, [(x, y), ...]) of every line
+        x_label, y_label: Axis titles
+        log_x: Logarithmic x axis (latencies spanning several decades)
+    """
+    left, right, top, bottom = 60, 20, 20, 50
+    points = [point for _, line in lines for point in line]
+    if not points:
+        return ""
+
+    def x_value(x):
+        return math.log10(max(x, 1e-9)) if log_x else x
+
+    x_min = min(x_value(x) for x, _ in points)
+    x_max = max(x_value(x) for x, _ in points)
+    y_min = min(0.0, min(y for _, y in points))
+    y_max = max(y for _, y in points) or 1.0
+    x_span = (x_max - x_min) or 1.0
+    y_span = (y_max - y_min) or 1.0
+
+    def position(x, y):
+        return (left + (x_value(x) - x_min) / x_span *
+                (width - left - right),
+                height - bottom - (y - y_min) / y_span *
+                (height - top - bottom))
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+             f'height="{height + 20 * len(lines)}" font-size="11">',
+             f'<rect x="{left}" y="{top}" width="{width - left - right}" '
+             f'height="{height - top - bottom}" fill="none" stroke="#999"/>']
+    for step in range(5):
+        x = x_min + x_span * step / 4
+        y = y_min + y_span * step / 4
+        x_text = f"{10 ** x:.3g}" if log_x else f"{x:.3g}"
+        x_position, _ = position(10 ** x if log_x else x, y_min)
+        _, y_position = position(points[0][0], y)
+        parts.append(f'<text x="{x_position:.1f}" y="{height - bottom + 15}"'
+                     f' text-anchor="middle">{x_text}</text>')
+        parts.append(f'<text x="{left - 5}" y="{y_position + 4:.1f}" '
+                     f'text-anchor="end">{y:.3g}</text>')
+    parts.append(f'<text x="{(left + width - right) / 2}" '
+                 f'y="{height - 12}" text-anchor="middle">'
+                 f'{html.escape(x_label)}</text>')
+    parts.append(f'<text x="12" y="{(top + height - bottom) / 2}" '
+                 f'text-anchor="middle" transform="rotate(-90 12 '
+                 f'{(top + height - bottom) / 2})">'
+                 f'{html.escape(y_label)}</text>')
+    for index, (legend, line) in enumerate(lines):
+        color = COLORS[index % len(COLORS)]
+        path = " ".join(f"{x:.1f},{y:.1f}" for x, y in
+                        (position(*point) for point in line))
+        parts.append(f'<polyline points="{path}" fill="none" '
+                     f'stroke="{color}" stroke-width="1.5"/>')
+        legend_y = height + 20 * index + 5
+        parts.append(f'<rect x="{left}" y="{legend_y}" width="12" '
+                     f'height="12" fill="{color}"/>')
+        parts.append(f'<text x="{left + 18}" y="{legend_y + 10}">'
+                     f'{html.escape(legend)}</text>')
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+
+class ReportWriter:
+    """Writes the report sections as Markdown or HTML."""
+
+    def __init__(self, html_output: bool):
+        self.html = html_output
+        self.parts: List[str] = []
+
+    def heading(self, text: str, level: int = 2):
+        if self.html:
+            self.parts.append(f"<h{level}>{html.escape(text)}</h{level}>")
+        else:
+            self.parts.append(f"{'#' * level} {text}\n")
+
+    def paragraph(self, text: str):
+        self.parts.append(f"<p>{html.escape(text)}</p>" if self.html
+                          else f"{text}\n")
+
+    def table(self, header: List[str], rows: List[List[str]]):
+        if self.html:
+            cells = "".join(f"<th>{html.escape(cell)}</th>"
+                            for cell in header)
+            lines = [f"<table><tr>{cells}</tr>"]
+            for row in rows:
+                cells = "".join(f"<td>{html.escape(cell)}</td>"
+                                for cell in row)
+                lines.append(f"<tr>{cells}</tr>")
+            lines.append("</table>")
+            self.parts.append("\n".join(lines))
+        else:
+            lines = ["| " + " | ".join(header) + " |",
+                     "|" + "---|" * len(header)]
+            lines += ["| " + " | ".join(row) + " |" for row in rows]
+            self.parts.append("\n".join(lines) + "\n")
+
+    def chart(self, svg: str):
+        """Add a chart; Markdown reports rely on their tables instead."""
+        if self.html and svg:
+            self.parts.append(svg)
+
+    def render(self, title: str) -> str:
+        if not self.html:
+            return f"# {title}\n\n" + "\n".join(self.parts)
+        return ("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+                f"<title>{html.escape(title)}</title><style>"
+                "body{font-family:sans-serif;margin:2em}"
+                "table{border-collapse:collapse;margin:1em 0}"
+                "td,th{border:1px solid #ccc;padding:4px 8px;"
+                "text-align:right}</style></head><body>"
+                f"<h1>{html.escape(title)}</h1>\n" + "\n".join(self.parts) +
+                "\n</body></html>\n")
+
+
+def build_report(runs: List[Run], baseline: Run, html_output: bool,
+                 confidence: float) -> str:
+    """Return the report of the runs as Markdown or HTML."""
+    writer = ReportWriter(html_output)
+    writer.paragraph(f"Generated {datetime.now(timezone.utc):%Y-%m-%d %H:%M} "
+                     f"UTC from {len(runs)} runs. Latencies in milliseconds; "
+                     f"intervals are {confidence:.0%} confidence intervals.")
+
+    writer.heading("Runs")
+    writer.table(["run", "sources", "requests", "throughput (req/s)",
+                  "errors"],
+                 [[run.name, ", ".join(os.path.basename(source)
+                                       for source in run.sources),
+                   str(sum(histogram.total_count
+                           for histogram in run.kinds.values())),
+                   f"{run.throughput_qps:.1f}"
+                   if run.throughput_qps is not None else "-",
+                   str(run.errors) if run.errors is not None else "-"]
+                  for run in runs])
+
+    writer.heading("Percentiles")
+    rows = []
+    for run in runs:
+        for kind, histogram in run.kinds.items():
+            row = [run.name, kind, str(histogram.total_count)]
+            for percentile in REPORT_PERCENTILES:
+                value, lower, upper = percentile_ci(histogram, percentile,
+                                                    confidence)
+                row.append(format_ms(value) if value is None else
+                           f"{format_ms(value)} [{format_ms(lower)}, "
+                           f"{format_ms(upper)}]")
+            row.append(format_ms(histogram.max))
+            rows.append(row)
+    writer.table(["run", "query", "count"] +
+                 [f"p{percentile:g}" for percentile in REPORT_PERCENTILES] +
+                 ["max"], rows)
+
+    if len(runs) > 1:
+        writer.heading(f"Comparison with {baseline.name}")
+        writer.paragraph("Changes marked * are significant: the confidence "
+                         "intervals of the two runs do not overlap.")
+        rows = []
+        for run in runs:
+            if run is baseline:
+                continue
+            for row in compare_runs(baseline, run, confidence):
+                median, tail = row[50.0], row[99.0]
+                rows.append([run.name, row['kind'],
+                             format_ms(median['baseline_ns']),
+                             format_ms(median['run_ns']),
+                             format_change(median['change'],
+                                           median['significant']),
+                             format_ms(tail['baseline_ns']),
+                             format_ms(tail['run_ns']),
+                             format_change(tail['change'],
+                                           tail['significant'])])
+        writer.table(["run", "query", "baseline p50", "p50", "p50 change",
+                      "baseline p99", "p99", "p99 change"], rows)
+
+    writer.heading("Latency CDF")
+    kinds = list(dict.fromkeys(kind for run in runs for kind in run.kinds))
+    for kind in kinds:
+        writer.heading(kind, 3)
+        measured = [run for run in runs
+                    if kind in run.kinds and run.kinds[kind].total_count]
+        if not measured:
+            writer.paragraph("No samples.")
+            continue
+        writer.chart(svg_chart(
+            [(run.name, cdf_points(run.kinds[kind])) for run in measured],
+            "latency (ms, log scale)", "fraction of requests", log_x=True))
+        writer.table(["quantile"] + [run.name for run in measured],
+                     [[f"{quantile:g}%"] +
+                      [format_ms(run.kinds[kind].percentile(quantile))
+                       for run in measured]
+                      for quantile in CDF_QUANTILES])
+
+    curves = throughput_curves(runs)
+    if curves:
+        writer.heading("Throughput vs latency")
+        lines = []
+        rows = []
+        for label, points in curves.items():
+            overall = []
+            for run in points:
+                histogram = LatencyHistogram()
+                for kind_histogram in run.kinds.values():
+                    histogram.merge(kind_histogram)
+                if not histogram.total_count:
+                    continue
+                overall.append((run.throughput_qps, histogram))
+                rows.append([label, f"{run.throughput_qps:.1f}",
+                             format_ms(histogram.percentile(50)),
+                             format_ms(histogram.percentile(99))])
+            for percentile in (50, 99):
+                lines.append((f"{label} p{percentile}",
+                              [(qps, histogram.percentile(percentile) / 1e6)
+                               for qps, histogram in overall]))
+        writer.chart(svg_chart(lines, "throughput (req/s)", "latency (ms)"))
+        writer.table(["run", "throughput (req/s)", "p50", "p99"], rows)
+
+    return writer.render("Latency report")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Latency report of benchmark runs, as Markdown or HTML")
+    parser.add_argument("runs", nargs='+', metavar="[LABEL=]PATH[,PATH...]",
+                        help="A run: load generator reports, benchmark "
+                             "suite results or delay CSV files, merged if "
+                             "several")
+    parser.add_argument("--baseline", default=None,
+                        help="Label of the run the others are compared "
+                             "with (default: the first run)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="Confidence level of the percentile intervals")
+    parser.add_argument("--output", default="latency_report.md",
+                        help="Report file, HTML if it ends in .html")
+    args = parser.parse_args()
+
+    runs = [load_run(spec) for spec in args.runs]
+    baseline = next((run for run in runs if run.label == args.baseline),
+                    runs[0])
+    report = build_report(runs, baseline,
+                          args.output.endswith(('.html', '.htm')),
+                          args.confidence)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        file.write(report)
+    print(f"Report of {len(runs)} runs written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
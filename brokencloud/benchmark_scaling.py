@@ -0,0 +1,197 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Scaling benchmark of the Redis backend. For every scale, a
+#              synthetic dataset is generated, loaded with
+#              « nobel_prize_rediscloud_setup.py » and measured: ingest
+#              throughput, prizeIdx and Redis memory, and the latency
+#              percentiles of each NobelPrizeClient query. The results of
+#              all scales are written to one JSON report.
+# DEPENDENCY: A Redis Stack instance configured in the « .env » file. Every
+#             scale replaces the loaded dataset.
+#
+# Example:
+#   python3 benchmark_scaling.py --scales 1,10,100 --queries 200
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import redis
+from dotenv import load_dotenv
+from nobel_prize_client import INDEX_NAME, NobelPrizeClient
+from nobel_prize_histogram import LatencyHistogram
+from nobel_prize_name_index import NAME_INDEX_KEY
+from nobel_prize_rediscloud_setup import in_year_range
+from nobel_prize_stream import iter_prizes_from_file
+from nobel_prize_synthetic import SyntheticPrizeGenerator
+
+# Loading variables from .env file
+load_dotenv()
+
+# Constants
+REDIS_HOST = os.getenv("REDIS_HOST")
+REDIS_PORT = os.getenv("REDIS_PORT")
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+SETUP_SCRIPT = os.path.join(os.path.dirname(__file__),
+                            'nobel_prize_rediscloud_setup.py')
+CATEGORIES = ["physics", "chemistry", "peace", "medicine", "literature",
+              "economics"]
+# FT.INFO fields describing the size of the index
+INDEX_INFO_FIELDS = ("num_docs", "num_terms", "num_records",
+                     "inverted_sz_mb", "offset_vectors_sz_mb",
+                     "doc_table_size_mb", "key_table_size_mb",
+                     "sortable_values_size_mb", "total_index_memory_sz_mb")
+
+
+def sample_queries(path: str, count: int,
+                   seed: int = None) -> Dict[str, List[Tuple]]:
+    """
+    Draw the arguments of every query kind from a dataset.
+
+    Keywords are drawn from the loaded motivations, weighted by frequency,
+    and names from the loaded laureates.
+    """
+    rng = random.Random(seed)
+    names = []
+    words = []
+    seen = 0
+    for prize in iter_prizes_from_file(path):
+        if not in_year_range(prize, 2013, 2023):
+            continue
+        for laureate in prize.get('laureates', []):
+            # Reservoir sampling keeps memory flat at any scale
+            seen += 1
+            sample = ((laureate['firstname'], laureate['surname']),
+                      rng.choice(laureate['motivation'].strip('"').split()
+                                 or ['the']))
+            if len(names) < count:
+                names.append(sample[0])
+                words.append(sample[1])
+            elif rng.randrange(seen) < count:
+                position = rng.randrange(count)
+                names[position], words[position] = sample
+
+    category_year = []
+    for _ in range(count):
+        start_year = rng.randint(2013, 2023)
+        category_year.append((rng.choice(CATEGORIES), start_year,
+                              rng.randint(start_year, 2023)))
+    return {
+        'count_laureates_by_category_and_years': category_year,
+        'count_laureates_by_motivation_keyword': [(word.strip('.,;:()'),)
+                                                  for word in words],
+        'get_laureate_details_by_name': names,
+    }
+
+
+def load(path: str) -> float:
+    """Load a dataset with the setup script and return the seconds taken."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, SETUP_SCRIPT, '--data-file', path],
+                   check=True, cwd=os.path.dirname(SETUP_SCRIPT) or None,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def index_memory(redis_client: redis.Redis) -> Dict:
+    """Return the index size fields of FT.INFO and the Redis memory use."""
+    info = redis_client.ft(INDEX_NAME).info()
+    memory = {field: float(info[field]) for field in INDEX_INFO_FIELDS
+              if field in info}
+    memory['used_memory_mb'] = (redis_client.info('memory')['used_memory'] /
+                                1024**2)
+    memory['name_index_mb'] = (
+        (redis_client.memory_usage(NAME_INDEX_KEY) or 0) / 1024**2)
+    return memory
+
+
+def query_latency(client: NobelPrizeClient,
+                  queries: Dict[str, List[Tuple]]) -> Dict:
+    """Run every sampled query once and return latency summaries in ms."""
+    latency = {}
+    for method, arguments in queries.items():
+        histogram = LatencyHistogram()
+        call = getattr(client, method)
+        for args in arguments[:10]:
+            call(*args)  # Warm-up
+        for args in arguments:
+            start = time.perf_counter_ns()
+            call(*args)
+            histogram.record(time.perf_counter_ns() - start)
+        latency[method] = histogram.summary()
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the Redis backend at growing data volumes")
+    parser.add_argument("--scales", default="1,10,100,1000",
+                        help="Comma separated multiples of the real data")
+    parser.add_argument("--queries", type=int, default=200,
+                        help="Measured calls per query kind and scale")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--work-dir", default=tempfile.gettempdir(),
+                        help="Directory of the generated datasets")
+    parser.add_argument("--output", default="scaling_results.json")
+    args = parser.parse_args()
+
+    redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT,
+                               password=REDIS_PASSWORD,
+                               decode_responses=True)
+    client = NobelPrizeClient(REDIS_HOST, REDIS_PORT, REDIS_PASSWORD)
+    generator = SyntheticPrizeGenerator(seed=args.seed)
+
+    results = []
+    for scale in (float(value) for value in args.scales.split(',')):
+        path = os.path.join(args.work_dir, f"prize_{scale:g}x.json")
+        print(f"Scale {scale:g}x: generating {path}...")
+        dataset = generator.write(path, scale)
+        size_mb = os.path.getsize(path) / 1024**2
+
+        print(f"Scale {scale:g}x: loading {dataset['in_range']} prizes...")
+        seconds = load(path)
+        row = {
+            'scale': scale,
+            'prizes_loaded': dataset['in_range'],
+            'file_mb': size_mb,
+            'ingest_s': seconds,
+            'ingest_prizes_per_s': dataset['in_range'] / seconds,
+            'ingest_mb_per_s': size_mb / seconds,
+            'memory': index_memory(redis_client),
+            'latency_ms': query_latency(
+                client, sample_queries(path, args.queries, args.seed)),
+        }
+        results.append(row)
+        os.unlink(path)
+
+        print(f"  ingest {row['ingest_prizes_per_s']:.0f} prizes/s, "
+              f"index {row['memory'].get('total_index_memory_sz_mb', 0):.1f}"
+              f" MB, Redis {row['memory']['used_memory_mb']:.1f} MB")
+        for method, summary in row['latency_ms'].items():
+            print(f"  {method:40} p50 {summary['p50']:8.3f} ms  "
+                  f"p99 {summary['p99']:8.3f} ms")
+
+    with open(args.output, 'w') as file:
+        json.dump({
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            'config': vars(args),
+            'scales': results,
+        }, file, indent=2)
+
+    # Latency curves: one row per query kind, one column per scale
+    print(f"\n{'p99 latency (ms)':40}" +
+          "".join(f"{row['scale']:>10g}x" for row in results))
+    for method in results[0]['latency_ms'] if results else []:
+        print(f"{method:40}" + "".join(
+            f"{row['latency_ms'][method]['p99']:>11.3f}" for row in results))
+    print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Hermetic microbenchmark suite with regression baselines. Every
+#              query shape in use (single year and full year range, common
+#              and rare keywords and a phrase, known and unknown names,
+#              misspelled and partial name searches) is timed through
+#              the backend client directly and through the gRPC service,
+#              served in-process on a loopback port. On the snapshot
+#              backend the motivation index is also timed on its own,
+#              below the count cache that answers the repeated keywords
+#              of the client cases. Results are compared with a JSON
+#              baseline: the run fails when there is none, or when a
+#              benchmark is slower by a statistically significant margin
+#              (one-sided Mann-Whitney U test) of at least --min-change.
+#              Every sample is divided by the time of a fixed calibration
+#              workload measured in the same round, so a machine that runs
+#              slower overall (shared CI hosts, frequency scaling) is not
+#              taken for a regression.
+# DEPENDENCY: None for the default snapshot backend, which answers from
+#             « data/prize.json ». The redis backend needs a local Redis
+#             Stack configured in the « .env » file and loaded with the
+#             « nobel_prize_rediscloud_setup.py » script.
+#
+# Example:
+#   python3 benchmark_suite.py --update-baseline   # Record the baseline
+#   python3 benchmark_suite.py                     # Compare with it
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent import futures
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+import grpc
+from dotenv import load_dotenv
+import nobel_prize_pb2
+import nobel_prize_pb2_grpc
+from nobel_prize_cache import ResponseCache
+from nobel_prize_grpc_client import RPCS, NobelPrizeGRPCClient, rpc_request
+from nobel_prize_grpc_server import NobelPrizeService, create_client
+from nobel_prize_snapshot import DATA_PATH
+
+# Loading variables from .env file
+load_dotenv()
+
+# Constants
+REDIS_HOST = os.getenv("REDIS_HOST")
+REDIS_PORT = os.getenv("REDIS_PORT")
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data',
+                             'benchmark_baseline.json')
+CALIBRATION = "calibration"
+
+# Query shapes: name -> (client method, arguments)
+CASES = {
+    'category_single_year': ('count_laureates_by_category_and_years',
+                             ('physics', 2018, 2018)),
+    'category_full_range': ('count_laureates_by_category_and_years',
+                            ('physics', 2013, 2023)),
+    'keyword_common': ('count_laureates_by_motivation_keyword',
+                       ('discovery',)),
+    'keyword_rare': ('count_laureates_by_motivation_keyword', ('neutrino',)),
+    'keyword_phrase': ('count_laureates_by_motivation_keyword',
+                       ('for the discovery of',)),
+    'name_hit': ('get_laureate_details_by_name', ('Alain', 'Aspect')),
+    'name_miss': ('get_laureate_details_by_name', ('Nobody', 'Unknown')),
+    'name_typo': ('search_laureates_by_name', ('Alian Aspect',)),
+    'name_prefix': ('search_laureates_by_name', ('fer',)),
+}
+
+# Motivation index queries, timed without the count cache: name -> query
+INDEX_CASES = {
+    'keyword_common': 'discovery',
+    'keyword_rare': 'neutrino',
+    'keyword_phrase': 'for the discovery of',
+    'keyword_prefix': 'discover*',
+}
+
+
+def calibration_work():
+    """Fixed CPU workload (bytecode, dictionaries, strings, JSON)."""
+    total = 0
+    for value in range(300):
+        total += value * value
+    document = {'year': 2020, 'category': 'physics',
+                'laureates': [{'firstname': 'A', 'surname': str(total)}]}
+    return json.loads(json.dumps(document))['category'].upper()
+
+
+def start_service(client) -> Tuple[grpc.Server, int]:
+    """
+    Serve a backend client on an ephemeral loopback port.
+
+    The response cache is disabled so that every call reaches the backend.
+    """
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    nobel_prize_pb2_grpc.add_NobelPrizeServiceServicer_to_server(
+        NobelPrizeService(client, ResponseCache(max_entries=0)), server)
+    port = server.add_insecure_port('127.0.0.1:0')
+    server.start()
+    return server, port
+
+
+def rpc_call(grpc_client: NobelPrizeGRPCClient, method: str,
+             query_args: tuple) -> Callable[[], object]:
+    """
+    Return a callable sending one query RPC on the client's stub.
+
+    The client methods print a failed RPC and return an empty result, which
+    would be timed as a fast success; the stub raises grpc.RpcError
+    instead, so a failing RPC fails the benchmark.
+    """
+    stub = grpc_client.stubs[0]
+    if method == 'search_laureates_by_name':
+        query, = query_args
+        return lambda: stub.SearchLaureatesByName(
+            nobel_prize_pb2.LaureateSearchRequest(query=query))
+    send = getattr(stub, RPCS[method][0])
+    return lambda: send(rpc_request(method, query_args))
+
+
+def measure(benchmarks: Dict[str, Callable[[], object]], samples: int,
+            calls: int, warmup: int) -> Dict[str, List[float]]:
+    """
+    Time every benchmark.
+
+    The benchmarks are sampled in rounds, one sample of each per round, so
+    a slow period of the machine affects all of them alike rather than
+    shifting a single one.
+
+    Args:
+        benchmarks: Name -> callable running one query
+        samples: Samples taken of every benchmark
+        calls: Calls averaged in every sample
+        warmup: Calls made before measuring
+
+    Returns:
+        Name -> sample times, in nanoseconds per call, including the
+        calibration workload's
+    """
+    benchmarks = dict(benchmarks, **{CALIBRATION: calibration_work})
+    for run in benchmarks.values():
+        for _ in range(warmup):
+            run()
+    times = {name: [] for name in benchmarks}
+    for _ in range(samples):
+        for name, run in benchmarks.items():
+            start = time.perf_counter_ns()
+            for _ in range(calls):
+                run()
+            times[name].append((time.perf_counter_ns() - start) / calls)
+    return times
+
+
+def summarize(sample_times: List[float],
+              calibration_times: List[float]) -> Dict:
+    """
+    Return the statistics stored for a benchmark, with its samples.
+
+    relative_samples are the samples divided by the calibration sample of
+    the same round; regressions are detected on them.
+    """
+    ordered = sorted(sample_times)
+    return {
+        'median_ns': statistics.median(ordered),
+        'mean_ns': statistics.fmean(ordered),
+        'stdev_ns': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        'min_ns': ordered[0],
+        'p90_ns': ordered[min(len(ordered) - 1,
+                              math.ceil(0.9 * len(ordered)) - 1)],
+        'samples_ns': [round(value) for value in sample_times],
+        'relative_samples': [round(value / calibration, 4) for value,
+                             calibration in zip(sample_times,
+                                                calibration_times)],
+    }
+
+
+def mann_whitney_greater(current: List[float],
+                         baseline: List[float]) -> float:
+    """
+    One-sided Mann-Whitney U test that current tends to be larger.
+
+    Uses the normal approximation with tie correction, accurate for the
+    sample sizes of the suite (a dozen or more per side).
+
+    Returns:
+        The p-value; small values mean current is significantly slower
+    """
+    n1, n2 = len(current), len(baseline)
+    values = sorted([(value, 0) for value in current] +
+                    [(value, 1) for value in baseline])
+    # Average ranks of tied values
+    ranks = [0.0] * len(values)
+    ties = 0.0
+    start = 0
+    while start < len(values):
+        end = start
+        while end + 1 < len(values) and values[end + 1][0] == values[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        size = end - start + 1
+        ties += size**3 - size
+        start = end + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, values)
+                   if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)  # Continuity corrected
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(results: Dict, baseline: Dict, alpha: float,
+            min_change: float, absolute: bool = False) -> List[Dict]:
+    """
+    Compare every benchmark with its baseline.
+
+    A benchmark regresses when it is significantly slower (p < alpha) and
+    its median is at least min_change (relative) above the baseline's;
+    it improves under the mirror conditions. Samples relative to the
+    calibration workload are compared unless absolute is set.
+    """
+    field = 'samples_ns' if absolute else 'relative_samples'
+    rows = []
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if name == CALIBRATION:
+            continue
+        if previous is None:
+            rows.append({'name': name, 'status': 'new'})
+            continue
+        change = (statistics.median(current[field]) /
+                  statistics.median(previous[field]) - 1)
+        p_slower = mann_whitney_greater(current[field], previous[field])
+        p_faster = mann_whitney_greater(previous[field], current[field])
+        status = 'ok'
+        if p_slower < alpha and change >= min_change:
+            status = 'REGRESSION'
+        elif p_faster < alpha and -change >= min_change:
+            status = 'improvement'
+        rows.append({'name': name, 'status': status, 'change': change,
+                     'p_value': min(p_slower, p_faster),
+                     'baseline_ns': previous['median_ns'],
+                     'current_ns': current['median_ns']})
+    return rows
+
+
+def print_comparison(rows: List[Dict]):
+    """Print the comparison; change is relative to the calibration."""
+    print(f"{'benchmark':40} {'baseline':>11} {'current':>11} "
+          f"{'change':>8} {'p':>8}  status")
+    for row in rows:
+        if row['status'] == 'new':
+            print(f"{row['name']:40} {'':>11} {'':>11} {'':>8} {'':>8}  new")
+            continue
+        print(f"{row['name']:40} {row['baseline_ns'] / 1000:>9.1f}us "
+              f"{row['current_ns'] / 1000:>9.1f}us "
+              f"{row['change']:>+8.1%} {row['p_value']:>8.1e}  "
+              f"{row['status']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Microbenchmarks of the Nobel prize queries with "
+                    "regression detection against a JSON baseline")
+    parser.add_argument("--backend", choices=("snapshot", "redis"),
+                        default="snapshot",
+                        help="snapshot (hermetic) or the Redis of .env")
+    parser.add_argument("--data-file", default=DATA_PATH,
+                        help="Prize data file for the snapshot backend")
+    parser.add_argument("--targets", default="client,index,grpc",
+                        help="Comma separated: client (direct calls), index "
+                             "(motivation index without its count cache, "
+                             "snapshot backend) and/or grpc (in-process "
+                             "server)")
+    parser.add_argument("--samples", type=int, default=30,
+                        help="Samples per benchmark")
+    parser.add_argument("--calls", type=int, default=20,
+                        help="Calls averaged in every sample")
+    parser.add_argument("--warmup", type=int, default=20,
+                        help="Calls per benchmark before measuring")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store the results as the new baseline")
+    parser.add_argument("--output", default=None,
+                        help="Also write the results to this JSON file")
+    parser.add_argument("--alpha", type=float, default=0.01,
+                        help="Significance level of the regression test")
+    parser.add_argument("--min-change", type=float, default=0.25,
+                        help="Smallest relative slowdown of the median "
+                             "reported as a regression")
+    parser.add_argument("--absolute", action="store_true",
+                        help="Compare raw times, not times relative to the "
+                             "calibration workload")
+    args = parser.parse_args()
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        # Nothing to compare with: passing would hide any regression
+        print(f"No baseline at {args.baseline}, record one with "
+              f"--update-baseline")
+        sys.exit(1)
+
+    client = create_client(args.backend, REDIS_HOST, REDIS_PORT,
+                           REDIS_PASSWORD, args.data_file)
+    targets = [target.strip() for target in args.targets.split(',')]
+    benchmarks = {}
+    server = grpc_client = None
+    if 'client' in targets:
+        for case, (method, query_args) in CASES.items():
+            benchmarks[f"client:{args.backend}/{case}"] = (
+                lambda method=method, query_args=query_args:
+                getattr(client, method)(*query_args))
+    if 'index' in targets and hasattr(client, 'motivation_index'):
+        for case, query in INDEX_CASES.items():
+            benchmarks[f"index:{args.backend}/{case}"] = (
+                lambda query=query: client.motivation_index.count(query))
+    if 'grpc' in targets:
+        server, port = start_service(client)
+        grpc_client = NobelPrizeGRPCClient(port=port, channels=1)
+        grpc_client.wait_for_ready()
+        for case, (method, query_args) in CASES.items():
+            benchmarks[f"grpc:{args.backend}/{case}"] = rpc_call(
+                grpc_client, method, query_args)
+
+    try:
+        print(f"Running {len(benchmarks)} benchmarks, {args.samples} "
+              f"samples of {args.calls} calls each...")
+        times = measure(benchmarks, args.samples, args.calls, args.warmup)
+    except grpc.RpcError as e:
+        print(f"Benchmark failed, RPC error: {e.code()} {e.details()}")
+        sys.exit(1)
+    finally:
+        if grpc_client is not None:
+            grpc_client.close()
+        if server is not None:
+            server.stop(0)
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'config': {key: value for key, value in vars(args).items()
+                   if key not in ('baseline', 'output', 'update_baseline')},
+        'benchmarks': {name: summarize(sample_times, times[CALIBRATION])
+                       for name, sample_times in times.items()},
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+        for name, summary in results['benchmarks'].items():
+            print(f"{name:40} {summary['median_ns'] / 1000:>9.1f}us")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline, 'r') as file:
+        baseline = json.load(file)
+    if baseline.get('environment') != results['environment']:
+        print("Warning: the baseline was recorded on a different "
+              "environment, differences may not be regressions")
+    rows = compare(results, baseline, args.alpha, args.min_change,
+                   args.absolute)
+    print_comparison(rows)
+    regressions = [row['name'] for row in rows
+                   if row['status'] == 'REGRESSION']
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regression")
+
+
+if __name__ == "__main__":
+    main()
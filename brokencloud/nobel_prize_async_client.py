@@ -0,0 +1,332 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: An asyncio version of NobelPrizeClient built on redis.asyncio.
+#              All coroutines share one connection pool, so thousands of
+#              concurrent queries can run on a single event loop. The query
+#              logic is shared with NobelPrizeClient: the query plans of
+#              « nobel_prize_client.py » decide the commands, and this
+#              client only awaits their pipelines.
+# DEPENDENCY: Ensure that the sample Noble prize data is added to Redis DB.
+#             This can be done using the « nobel_prize_rediscloud_setup.py »
+#             script.
+
+import asyncio
+import redis
+import redis.asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Tuple
+)
+from nobel_prize_cache import DATASET_VERSION_KEY
+from nobel_prize_metrics import redis_timer
+from nobel_prize_motivation_index import CountCache
+from nobel_prize_client import (
+    ALL_PRIZES_QUERY,
+    INDEX_NAME,
+    NAME_SEARCH_LOAD_COMMANDS,
+    SEARCH_NEEDED,
+    SEARCH_PAGE_SIZE,
+    MotivationIndexNeeded,
+    SearchCursorLost,
+    Step,
+    aggregate_command,
+    batch_plan,
+    build_motivation_counts,
+    build_name_search,
+    cursor_delete_command,
+    cursor_read_command,
+    decode_page,
+    fold_query,
+    laureate_motivations,
+    match_laureate_details,
+    merge_pool_stats,
+    name_query,
+    name_search_commands,
+    name_search_result,
+    query_commands,
+    query_result,
+    single_step
+)
+from nobel_prize_redis_pool import (
+    REDIS_MAX_CONNECTIONS,
+    REDIS_POOL_TIMEOUT,
+    connection_pool
+)
+from nobel_prize_replicas import REDIS_REPLICAS, ReplicaRouter, parse_endpoints
+from nobel_prize_trigram_index import SEARCH_LIMIT, TrigramIndex
+
+
+class AsyncNobelPrizeClient:
+    def __init__(self, host: str, port: int, password: str,
+                 max_connections: int = REDIS_MAX_CONNECTIONS,
+                 pool_timeout: float = REDIS_POOL_TIMEOUT,
+                 replicas: List[Tuple[str, int]] = None,
+                 page_size: int = SEARCH_PAGE_SIZE, **pool_options):
+        """
+        Initialize a pooled asyncio Redis connection with search capabilities.
+
+        Args:
+            host, port, password: Redis connection settings of the primary
+            max_connections: Size of the shared connection pool of every
+                             endpoint
+            pool_timeout: Seconds a query waits for a free connection
+            replicas: (host, port) of the read replicas, by default parsed
+                      from REDIS_REPLICAS; reads are routed as in
+                      NobelPrizeClient
+            page_size: Documents per page of a search
+            pool_options: Other settings of connection_pool(), e.g.
+                          socket_timeout
+        """
+        if replicas is None:
+            replicas = parse_endpoints(REDIS_REPLICAS)
+        endpoints = [(host, port)] + list(replicas)
+        self.pools = [connection_pool(endpoint_host, endpoint_port, password,
+                                      max_connections=max_connections,
+                                      pool_timeout=pool_timeout,
+                                      asynchronous=True, **pool_options)
+                      for endpoint_host, endpoint_port in endpoints]
+        self.redis_clients = [redis.asyncio.Redis(connection_pool=pool)
+                              for pool in self.pools]
+        self.pool = self.pools[0]
+        self.redis_client = self.redis_clients[0]
+        self.search_idx = self.redis_client.ft(INDEX_NAME)
+        self.router = ReplicaRouter(endpoints, password) \
+            if replicas else None
+        self.page_size = page_size
+        # (dataset version, TrigramIndex) of the name lookup hash's keys
+        self.name_search = None
+        self._name_search_lock = asyncio.Lock()
+        # (dataset version, CountCache) of the live generation's motivations
+        self.motivation_search = None
+        self._motivation_search_lock = asyncio.Lock()
+
+    async def _read(self, call: Callable[[redis.asyncio.Redis],
+                                         Awaitable[Any]]) -> Any:
+        """Run a read on the endpoint chosen by the router."""
+        if self.router is None:
+            return await call(self.redis_client)
+        failed = []
+        while True:
+            index = self.router.pick(exclude=failed)
+            try:
+                result = await call(self.redis_clients[index])
+            except (redis.ConnectionError, redis.TimeoutError):
+                self.router.record_failure(index)
+                failed.append(index)
+                if len(failed) == len(self.redis_clients):
+                    raise
+                continue
+            self.router.record_read(index)
+            return result
+
+    async def _search_pages(self, query_str: str, page_size: int = None
+                            ) -> AsyncIterator[List[Dict]]:
+        """Yield the prize documents matching a search, one page at a time."""
+        page_size = page_size or self.page_size
+        command = aggregate_command(query_str, page_size)
+
+        async def aggregate(client):
+            return client, await client.execute_command(*command)
+
+        with redis_timer("FT.AGGREGATE"):
+            client, reply = await self._read(aggregate)
+        cursor_id = 0
+        try:
+            while True:
+                prizes, cursor_id = decode_page(reply)
+                yield prizes
+                if not cursor_id:
+                    return
+                try:
+                    with redis_timer("FT.CURSOR"):
+                        reply = await client.execute_command(
+                            *cursor_read_command(cursor_id, page_size))
+                except redis.ResponseError as e:
+                    cursor_id = 0
+                    raise SearchCursorLost(str(e)) from e
+        finally:
+            if cursor_id:
+                try:
+                    await client.execute_command(
+                        *cursor_delete_command(cursor_id))
+                except redis.RedisError:
+                    pass  # The cursor expires after its idle time anyway
+
+    async def dataset_version(self) -> str | None:
+        """Return the version stamp written by the last data load."""
+        with redis_timer("GET"):
+            return await self._read(
+                lambda client: client.get(DATASET_VERSION_KEY))
+
+    def pool_stats(self) -> Dict[str, float]:
+        """Return the saturation counters of the connection pools."""
+        return merge_pool_stats([pool.pool_stats.stats()
+                                 for pool in self.pools])
+
+    async def _execute(self, plan: Generator[Step, list, Any]) -> Any:
+        """Send the pipelines of a query plan and return its result."""
+        client = None
+        replies = None
+        while True:
+            try:
+                step = plan.send(replies)
+            except StopIteration as done:
+                return done.value
+            if isinstance(step, MotivationIndexNeeded):
+                try:
+                    replies = await self._load_motivation_search(
+                        step.stale_version)
+                except redis.RedisError as e:
+                    replies = e
+                continue
+
+            async def execute(endpoint):
+                async with endpoint.pipeline(transaction=False) as pipeline:
+                    for command in step.commands:
+                        pipeline.execute_command(*command)
+                    return endpoint, await pipeline.execute(
+                        raise_on_error=False)
+
+            with redis_timer(step.label):
+                client, replies = await (execute(client)
+                                         if step.same_endpoint
+                                         else self._read(execute))
+
+    async def _query(self, method: str, args: tuple):
+        """Answer one query, see batch_plan."""
+        return query_result(await self._execute(batch_plan(
+            [(method, args)], self.page_size, self.motivation_search)))
+
+    async def count_laureates_by_category_and_years(
+            self, category: str, start_year: int, end_year: int) -> int:
+        """Count laureates in a category between specific years."""
+        try:
+            return await self._query("count_laureates_by_category_and_years",
+                                     (category, start_year, end_year))
+        except redis.ResponseError as e:
+            print(f"Search error: {e}")
+            return 0
+
+    async def count_laureates_by_motivation_keyword(self, keyword: str) -> int:
+        """Count laureates whose motivation contains a specific keyword."""
+        try:
+            return await self._query("count_laureates_by_motivation_keyword",
+                                     (keyword,))
+        except redis.ResponseError as e:
+            print(f"Search error: {e}")
+            return 0
+
+    async def get_laureate_details_by_name(
+            self, firstname: str, surname: str) -> List[Dict[str, str]]:
+        """Find prize details for a laureate by their full name."""
+        try:
+            return await self._query("get_laureate_details_by_name",
+                                     (firstname, surname))
+        except redis.ResponseError as e:
+            print(f"Search error: {e}")
+            return []
+
+    async def iter_laureate_details_by_name(
+            self, firstname: str, surname: str,
+            page_size: int = None) -> AsyncIterator[List[Dict[str, str]]]:
+        """Yield the prize details of a laureate page by page."""
+        page_size = page_size or self.page_size
+        method, args = "get_laureate_details_by_name", (firstname, surname)
+        try:
+            details = fold_query(method, args, await self._execute(
+                single_step(query_commands(method, args))))
+            if details is not SEARCH_NEEDED:
+                for start in range(0, len(details), page_size):
+                    yield details[start:start + page_size]
+                return
+
+            async for prizes in self._search_pages(
+                    name_query(firstname, surname), page_size):
+                matches = match_laureate_details(prizes, firstname, surname)
+                if matches:
+                    yield matches
+        except redis.ResponseError as e:
+            print(f"Search error: {e}")
+
+    async def search_laureates_by_name(self, query: str,
+                                       limit: int = SEARCH_LIMIT
+                                       ) -> List[Dict[str, Any]]:
+        """Find the laureates whose name is closest to a partial name."""
+        try:
+            name_search = self.name_search or await self._load_name_search()
+            for _ in range(2):
+                version, index = name_search
+                matches = index.search(query, limit)
+                current, *replies = await self._execute(
+                    single_step(name_search_commands(matches)))
+                if current == version:
+                    return name_search_result(matches, replies)
+                # The data was reloaded since the index was built
+                name_search = await self._load_name_search(version)
+            raise redis.RedisError("The dataset changed during every "
+                                   "name search attempt")
+        except redis.ResponseError as e:
+            print(f"Search error: {e}")
+            return []
+
+    async def _load_name_search(self, stale_version: str = None
+                                ) -> Tuple[str, TrigramIndex]:
+        """
+        Build the trigram index of the names of the lookup hash.
+
+        The index is built on a worker thread, so that a large dataset does
+        not block the event loop.
+        """
+        async with self._name_search_lock:
+            if (self.name_search is not None and
+                    self.name_search[0] != stale_version):
+                return self.name_search
+
+            version, names, displays = await self._execute(
+                single_step(NAME_SEARCH_LOAD_COMMANDS))
+            self.name_search = (version, await asyncio.to_thread(
+                build_name_search, names, displays))
+            return self.name_search
+
+    async def _load_motivation_search(self, stale_version: str = None
+                                      ) -> Tuple[str, CountCache]:
+        """
+        Build the motivation index of every laureate of the live
+        generation, on a worker thread like the trigram index.
+        """
+        async with self._motivation_search_lock:
+            if (self.motivation_search is not None and
+                    self.motivation_search[0] != stale_version):
+                return self.motivation_search
+
+            for _ in range(2):
+                version = await self.dataset_version()
+                motivations = []
+                try:
+                    async for prizes in self._search_pages(ALL_PRIZES_QUERY):
+                        motivations.extend(laureate_motivations(prizes))
+                except SearchCursorLost:
+                    continue  # Reloaded under the search
+                if await self.dataset_version() == version:
+                    self.motivation_search = (version, await asyncio.to_thread(
+                        build_motivation_counts, motivations))
+                    return self.motivation_search
+            raise redis.RedisError("The dataset changed during every "
+                                   "motivation index load")
+
+    async def run_batch(self, queries: List[Tuple[str, tuple]]) -> List[Any]:
+        """Run several queries with their Redis commands pipelined."""
+        return await self._execute(batch_plan(queries, self.page_size,
+                                              self.motivation_search))
+
+    async def close(self):
+        """Close the connection pools and stop probing the endpoints."""
+        if self.router is not None:
+            self.router.close()
+        for client in self.redis_clients:
+            await client.aclose()
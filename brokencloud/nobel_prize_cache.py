@@ -0,0 +1,171 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: A bounded response cache for the gRPC service. Entries are
+#              evicted in LRU order once either the entry count or the byte
+#              budget is exceeded, expire after a TTL, and the whole cache is
+#              invalidated when the dataset version stamp written by
+#              « nobel_prize_rediscloud_setup.py » changes.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# Redis key holding the dataset version stamp
+DATASET_VERSION_KEY = "prizeVersion"
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 8 * 1024**2,
+                 ttl: float = 300.0,
+                 version_source: Optional[Callable[[], object]] = None,
+                 version_check_interval: float = 1.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached responses (0 disables)
+            max_bytes: Maximum total size of the cached responses
+            ttl: Seconds a response stays valid
+            version_source: Callable returning the current dataset version
+            version_check_interval: Minimum seconds between version checks
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version_source = version_source
+        self.version_check_interval = version_check_interval
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._version = None
+        self._version_checked_at = float('-inf')
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def version_check_due(self) -> bool:
+        """
+        Return True if the dataset version should be checked again.
+
+        Only one caller per check interval gets True, so the version source
+        is queried at most once per interval whatever the request rate.
+        """
+        if self.version_source is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._version_checked_at < self.version_check_interval:
+                return False
+            self._version_checked_at = now
+            return True
+
+    def set_version(self, version):
+        """Record the current dataset version, clearing the cache on change."""
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+
+    def _evict(self):
+        """Drop least recently used entries until within both limits."""
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 self._bytes > self.max_bytes):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def lookup(self, key: Hashable) -> Tuple[bool, object, object]:
+        """
+        Look a key up.
+
+        Returns:
+            (hit, value, version): the cached value on a hit, and the dataset
+            version to pass to ``store`` after computing it on a miss
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, entry_size, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value, self._version
+                del self._entries[key]
+                self._bytes -= entry_size
+                self.expirations += 1
+            self.misses += 1
+            return False, None, self._version
+
+    def store(self, key: Hashable, value, size: int, version):
+        """Cache a value computed against the given dataset version."""
+        with self._lock:
+            # Do not store a value computed against a replaced dataset
+            if version != self._version or size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        """Return True unless the cache was configured with no entries."""
+        return self.max_entries > 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object],
+                       size: Callable[[object], int]):
+        """
+        Return the cached value for a key, computing it on a miss.
+
+        Args:
+            key: Hashable cache key
+            compute: Callable producing the value on a miss
+            size: Callable returning the size in bytes of a value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        if not self.enabled:
+            return compute()
+
+        # Query the version source outside the lock so that a slow lookup
+        # never blocks cache hits
+        if self.version_check_due():
+            self.set_version(self.version_source())
+        hit, value, version = self.lookup(key)
+        if hit:
+            return value
+
+        # Compute outside the lock so slow backend calls do not serialize
+        value = compute()
+        self.store(key, value, size(value), version)
+        return value
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache counters and current usage."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
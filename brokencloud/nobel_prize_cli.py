@@ -4,6 +4,10 @@
 
 import os
 
+# Laureates suggested when a name is not found
+SUGGESTIONS = 5
+
+
 class NobelPrizeCLI:
     def __init__(self, client):
         """Initialize CLI with Redis connection from environment variables."""
@@ -104,9 +108,19 @@ class NobelPrizeCLI:
                 print(f"Motivation: {prize['motivation']}")
         else:
             print(f"\nNo prizes found for {firstname} {surname}")
+            self.suggest_laureates(f"{firstname} {surname}")
         
         input("\nPress Enter to continue...")
 
+    def suggest_laureates(self, name: str):
+        """Print the laureates whose name is closest to a misspelled one."""
+        matches = self.client.search_laureates_by_name(name, SUGGESTIONS)
+        if matches:
+            print("\nDid you mean:")
+            for match in matches:
+                full_name = f"{match['firstname']} {match['surname']}"
+                print(f"  {full_name} ({len(match['details'])} prize(s))")
+
     def run(self):
         """Run the CLI menu loop."""
         while True:
@@ -6,12 +6,39 @@
 # 
 # TODO: Refactor
 
+import json
 import redis
 import os
+import threading
 from dotenv import load_dotenv
-from redis.commands.search.query import Query
-from typing import List, Dict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple
+)
 from nobel_prize_cli import NobelPrizeCLI
+from nobel_prize_cache import DATASET_VERSION_KEY
+from nobel_prize_metrics import redis_timer
+from nobel_prize_motivation_index import CountCache, MotivationIndex
+from nobel_prize_counts import LAUREATE_COUNTS_KEY, count_keys, sum_counts
+from nobel_prize_name_index import (
+    NAME_DISPLAY_KEY,
+    NAME_INDEX_KEY,
+    name_key
+)
+from nobel_prize_redis_pool import connection_pool
+from nobel_prize_replicas import REDIS_REPLICAS, ReplicaRouter, parse_endpoints
+from nobel_prize_trigram_index import (
+    SEARCH_LIMIT,
+    NameMatch,
+    TrigramIndex,
+    laureate_match
+)
 
 # Loading variables from .env file
 load_dotenv()
@@ -20,24 +47,652 @@ load_dotenv()
 REDIS_HOST = os.getenv("REDIS_HOST")
 REDIS_PORT = os.getenv("REDIS_PORT")
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+INDEX_NAME = "prizeIdx"
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "100"))
+SEARCH_CURSOR_MAX_IDLE_MS = int(os.getenv("SEARCH_CURSOR_MAX_IDLE_MS",
+                                          "10000"))
+QUERY_METHODS = (
+    "count_laureates_by_category_and_years",
+    "count_laureates_by_motivation_keyword",
+    "get_laureate_details_by_name",
+)
+# Returned by fold_query when a lookup in a precomputed index must fall back
+# to a search
+SEARCH_NEEDED = object()
+# Search matching every prize document of the live generation
+ALL_PRIZES_QUERY = "*"
+
+
+def category_year_query(category: str, start_year: int, end_year: int) -> str:
+    """Validate a year range and build the category/year search query."""
+    # Validate year range
+    if not (2013 <= start_year <= end_year <= 2023):
+        raise ValueError("Years must be between 2013 and 2023")
+
+    return f"@category:{category} @year:[{start_year} {end_year}]"
+
+
+def motivation_query(keyword: str) -> str:
+    """Build the motivation keyword search query."""
+    return f'@motivation:"{keyword}"'
+
+
+def name_query(firstname: str, surname: str) -> str:
+    """Build the laureate name search query."""
+    return f'@firstname:"{firstname}" @surname:"{surname}"'
+
+
+def count_laureates(prizes: List[Dict]) -> int:
+    """Count the laureates of the given prizes."""
+    total_laureates = 0
+    for prize_data in prizes:
+        if 'laureates' in prize_data:
+            total_laureates += len(prize_data['laureates'])
+    return total_laureates
+
+
+def laureate_motivations(prizes: List[Dict]) -> Iterator[str]:
+    """Yield the motivation of every laureate of the given prizes."""
+    for prize_data in prizes:
+        for laureate in prize_data.get('laureates', []):
+            yield laureate.get('motivation', '')
+
+
+def count_motivation_matches(prizes: List[Dict], keyword: str) -> int:
+    """
+    Count the laureates whose motivation matches the keyword, with the
+    whole-word, phrase and prefix rules of MotivationIndex.
+    """
+    return MotivationIndex(laureate_motivations(prizes)).count(keyword)
+
+
+def build_motivation_counts(motivations: List[str]) -> CountCache:
+    """Build the memoized motivation index of the given motivations."""
+    return CountCache(MotivationIndex(motivations))
+
+
+def match_laureate_details(prizes: List[Dict], firstname: str,
+                           surname: str) -> List[Dict[str, str]]:
+    """Extract the prize details of a laureate from prize documents."""
+    laureate_prizes = []
+    for prize_data in prizes:
+        # Find matching laureate in the prize data
+        for laureate in prize_data.get('laureates', []):
+            if (laureate.get('firstname', '').lower() == 
+                firstname.lower() and 
+                laureate.get('surname', '').lower() == surname.lower()):
+                laureate_prizes.append({
+                    'year': prize_data['year'],
+                    'category': prize_data['category'],
+                    'motivation': laureate.get('motivation', 
+                                               'No motivation provided')
+                })
+    return laureate_prizes
+
+
+def merge_pool_stats(stats: List[Dict[str, float]]) -> Dict[str, float]:
+    """Combine the saturation counters of several pools."""
+    merged = dict(stats[0])
+    for other in stats[1:]:
+        for name, value in other.items():
+            if name in ('max_in_use', 'wait_seconds_p99'):
+                merged[name] = max(merged[name], value)
+            else:
+                merged[name] += value
+    return merged
+
+
+class SearchCursorLost(redis.RedisError):
+    """
+    A search cursor could not be read to the end, e.g. because the data was
+    reloaded and its index dropped while the search was paged.
+    """
+
+
+class PartialResult(NamedTuple):
+    """Result of a paged search whose cursor still has pages to read."""
+    result: Any
+    cursor_id: int
+
+
+class Step(NamedTuple):
+    """
+    Redis commands a query plan sends in one pipeline.
+
+    A plan is a generator yielding the Step of every round trip and sent
+    back the replies of its pipeline, executed with raise_on_error=False;
+    its return value is the answer. Plans hold the query logic of both the
+    synchronous and the asyncio client, which only send the pipelines.
+    """
+    commands: List[tuple]
+    label: str                      # Name the round trip is timed under
+    same_endpoint: bool = False     # Sent to the endpoint of the previous
+                                    # step, which holds its open cursors
+
+
+class MotivationIndexNeeded(NamedTuple):
+    """
+    Plan step asking the client for the motivation index of the live
+    generation instead of sending a pipeline. The client loads it if its
+    own is at the stale version, and sends back its (version, CountCache).
+    """
+    stale_version: Any
+
+
+def aggregate_command(query_str: str,
+                      page_size: int = SEARCH_PAGE_SIZE) -> tuple:
+    """
+    Return the command opening a cursor over the documents of a search.
+
+    Unlike FT.SEARCH, whose default LIMIT returns only the first 10 matches,
+    FT.AGGREGATE WITHCURSOR returns every match, page_size documents at a
+    time; the following pages are read with cursor_read_command.
+    """
+    return ("FT.AGGREGATE", INDEX_NAME, query_str, "LOAD", 1, "$",
+            "WITHCURSOR", "COUNT", page_size,
+            "MAXIDLE", SEARCH_CURSOR_MAX_IDLE_MS)
+
+
+def cursor_read_command(cursor_id: int,
+                        page_size: int = SEARCH_PAGE_SIZE) -> tuple:
+    """Return the command reading the next page of a search cursor."""
+    return ("FT.CURSOR", "READ", INDEX_NAME, cursor_id, "COUNT", page_size)
+
+
+def cursor_delete_command(cursor_id: int) -> tuple:
+    """Return the command releasing a search cursor not read to the end."""
+    return ("FT.CURSOR", "DEL", INDEX_NAME, cursor_id)
+
+
+def decode_page(reply) -> Tuple[List[Dict], int]:
+    """
+    Decode one page of a search cursor.
+
+    Returns:
+        The prize documents of the page and the cursor id, 0 once the
+        last page has been read
+    """
+    rows, cursor_id = reply
+    prizes = []
+    for row in rows[1:]:
+        fields = dict(zip(row[::2], row[1::2]))
+        if fields.get('$'):
+            prizes.append(json.loads(fields['$']))
+    return prizes, int(cursor_id)
+
+
+def empty_result(method: str):
+    """Return the result of a query that matched nothing."""
+    return [] if method == "get_laureate_details_by_name" else 0
+
+
+def fold_prizes(method: str, args: tuple, prizes: List[Dict]):
+    """
+    Compute the part of a query's result contributed by some prizes.
+
+    Partial results of successive pages add up with +.
+    """
+    if method == "count_laureates_by_category_and_years":
+        return count_laureates(prizes)
+    if method == "count_laureates_by_motivation_keyword":
+        return count_motivation_matches(prizes, *args)
+    return match_laureate_details(prizes, *args)
+
+
+def fold_page(method: str, args: tuple, reply, result=None):
+    """
+    Add one page of a search cursor to a query's result.
+
+    Args:
+        method, args: Query the page answers
+        reply: FT.AGGREGATE or FT.CURSOR READ reply
+        result: Result of the previous pages
+
+    Returns:
+        The result, or a PartialResult if the cursor has more pages
+    """
+    if result is None:
+        result = empty_result(method)
+    if isinstance(reply, Exception):
+        raise reply
+    prizes, cursor_id = decode_page(reply)
+    result = result + fold_prizes(method, args, prizes)
+    return PartialResult(result, cursor_id) if cursor_id else result
+
+
+def query_commands(method: str, args: tuple, use_precomputed: bool = True,
+                   page_size: int = SEARCH_PAGE_SIZE) -> List[tuple]:
+    """
+    Return the Redis commands answering one query. Motivation keyword
+    counts are answered by the motivation index instead, see batch_plan.
+
+    Args:
+        method: Name of the client query method
+        args: Arguments of the query method
+        use_precomputed: Read names and category/year counts from the
+                         hashes built at ingest time first
+        page_size: Documents per page of a search
+
+    Returns:
+        Commands to send in one pipeline, one reply each
+    """
+    if method == "count_laureates_by_category_and_years":
+        query_str = category_year_query(*args)
+        if use_precomputed:
+            return [("HMGET", LAUREATE_COUNTS_KEY, *count_keys(*args)),
+                    ("EXISTS", LAUREATE_COUNTS_KEY)]
+    elif method == "get_laureate_details_by_name":
+        if use_precomputed:
+            return [("HGET", NAME_INDEX_KEY, name_key(*args)),
+                    ("EXISTS", NAME_INDEX_KEY)]
+        query_str = name_query(*args)
+    else:
+        raise ValueError(f"Unknown query '{method}'")
+    return [aggregate_command(query_str, page_size)]
+
+
+def fold_query(method: str, args: tuple, replies: list):
+    """
+    Compute the result of one query from its pipelined replies.
+
+    Returns:
+        The query result, SEARCH_NEEDED if the precomputed index does not
+        exist and the query must be queued again without it, or a
+        PartialResult if the search has more pages to read
+    """
+    if len(replies) == 2:
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise reply
+        value, index_exists = replies
+        if not index_exists:
+            return SEARCH_NEEDED
+        if method == "count_laureates_by_category_and_years":
+            return sum_counts(value)
+        return json.loads(value) if value else []
+
+    return fold_page(method, args, replies[0])
+
+
+def batch_plan(queries: List[Tuple[str, tuple]],
+               page_size: int = SEARCH_PAGE_SIZE,
+               motivation_search: Tuple[Any, CountCache] = None
+               ) -> Generator[Step, list, List[Any]]:
+    """
+    Plan the pipelines answering several queries.
+
+    Every query's commands are sent in a single pipeline, so a batch costs
+    one round trip (two if the precomputed hashes are missing) whatever its
+    size, plus one per extra page of its longest search: the next page of
+    every open cursor is read in one pipeline per round. A search whose
+    cursor is lost, when the data is reloaded and the old generation's
+    index dropped, is run again once from its first page on the new
+    generation; its result is SearchCursorLost if the cursor is lost again.
+
+    Motivation keyword counts are answered by the motivation index of the
+    live generation, so they follow the same whole-word, phrase and prefix
+    rules as the snapshot and offline clients. Only the dataset version is
+    read for them; the client's index is asked for again when it is at
+    another version (see MotivationIndexNeeded).
+
+    Args:
+        queries: (method name, arguments) pairs, e.g.
+                 ("count_laureates_by_motivation_keyword", ("peace",))
+        page_size: Documents per page of a search
+        motivation_search: Dataset version and counts of the client's
+                           motivation index, None if not loaded yet
+
+    Returns:
+        One result per query in request order; a failed query's result is
+        the exception it raised
+    """
+    results: List[Any] = [None] * len(queries)
+    # A single query is timed under its first command, a batch as a whole
+    label = "PIPELINE" if len(queries) > 1 else None
+    keywords = []
+    pending = []
+    for position, (method, args) in enumerate(queries):
+        if method == "count_laureates_by_motivation_keyword":
+            keywords.append((position, args))
+        else:
+            pending.append((position, (method, args)))
+    use_precomputed = True
+    restarted = set()
+    while pending or keywords:
+        commands = [("GET", DATASET_VERSION_KEY)] if keywords else []
+        queued = []
+        for position, (method, args) in pending:
+            try:
+                query = query_commands(method, args, use_precomputed,
+                                       page_size)
+            except (ValueError, TypeError) as e:
+                results[position] = e
+                continue
+            commands.extend(query)
+            queued.append((position, method, args, len(query)))
+        if not commands:
+            break
+        replies = yield Step(commands, label or commands[0][0])
+
+        if keywords:
+            version, replies = replies[0], replies[1:]
+            counts = version if isinstance(version, Exception) else None
+            if (counts is None and motivation_search is not None and
+                    motivation_search[0] == version):
+                counts = motivation_search[1]
+            if counts is None:
+                # Sent back the reloaded index, or the error of its load
+                loaded = yield MotivationIndexNeeded(
+                    motivation_search and motivation_search[0])
+                counts = (loaded if isinstance(loaded, Exception)
+                          else loaded[1])
+            for position, args in keywords:
+                try:
+                    results[position] = (counts if isinstance(
+                        counts, Exception) else counts(*args))
+                except Exception as e:
+                    results[position] = e
+            keywords = []
+
+        pending = []
+        cursors = []
+        offset = 0
+        for position, method, args, count in queued:
+            try:
+                result = fold_query(method, args,
+                                    replies[offset:offset + count])
+            except Exception as e:
+                result = e
+            offset += count
+            if result is SEARCH_NEEDED:
+                pending.append((position, (method, args)))
+            elif isinstance(result, PartialResult):
+                cursors.append((position, method, args, result))
+            else:
+                results[position] = result
+
+        while cursors:
+            replies = yield Step(
+                [cursor_read_command(partial.cursor_id, page_size)
+                 for _, _, _, partial in cursors],
+                label or "FT.CURSOR", same_endpoint=True)
+            open_cursors = []
+            for (position, method, args, partial), reply in zip(cursors,
+                                                                replies):
+                if isinstance(reply, redis.ResponseError):
+                    if position in restarted:
+                        results[position] = SearchCursorLost(
+                            f"Search cursor lost twice: {reply}")
+                    else:
+                        # Its pages are read again from the new generation
+                        restarted.add(position)
+                        pending.append((position, (method, args)))
+                    continue
+                try:
+                    result = fold_page(method, args, reply, partial.result)
+                except Exception as e:
+                    result = e
+                if isinstance(result, PartialResult):
+                    open_cursors.append((position, method, args, result))
+                else:
+                    results[position] = result
+            cursors = open_cursors
+        use_precomputed = False
+    return results
+
+
+def single_step(commands: List[tuple]) -> Generator[Step, list, list]:
+    """Plan one pipeline of commands and return its replies."""
+    return (yield Step(commands, commands[0][0]))
+
+
+def query_result(plan_results: List[Any]):
+    """Return the result of a one-query batch, raising its exception."""
+    result, = plan_results
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def name_search_commands(matches: List[NameMatch]) -> List[tuple]:
+    """
+    Return the commands reading the details of name search matches, with
+    the dataset version the trigram index must still be at.
+    """
+    commands = [("GET", DATASET_VERSION_KEY)]
+    if matches:
+        commands.append(("HMGET", NAME_INDEX_KEY,
+                         *(match.key for match in matches)))
+    return commands
+
+
+def name_search_result(matches: List[NameMatch],
+                       replies: list) -> List[Dict[str, Any]]:
+    """Return the laureates of name search matches from their details."""
+    details = replies[0] if matches else []
+    return [laureate_match(match, json.loads(found))
+            for match, found in zip(matches, details) if found]
+
+
+# Commands reading the names a trigram index is built from
+NAME_SEARCH_LOAD_COMMANDS = [
+    ("GET", DATASET_VERSION_KEY),
+    ("HKEYS", NAME_INDEX_KEY),
+    ("HGETALL", NAME_DISPLAY_KEY),
+]
+
+
+def build_name_search(names: List[str],
+                      displays: Dict[str, str]) -> TrigramIndex:
+    """Build the trigram index of the name lookup hash's names."""
+    return TrigramIndex(names, {name: json.loads(display)
+                                for name, display in displays.items()})
+
 
 class NobelPrizeClient:
-    def __init__(self, host: str, port: int, password: str):
-        """Initialize Redis connection with search capabilities."""
-        self.redis_client = redis.Redis(
-            host=host,
-            port=port,
-            password=password,
-            decode_responses=True
-        )
-        self.search_idx = self.redis_client.ft("prizeIdx")
+    def __init__(self, host: str, port: int, password: str,
+                 replicas: List[Tuple[str, int]] = None,
+                 page_size: int = SEARCH_PAGE_SIZE, **pool_options):
+        """
+        Initialize a pooled Redis connection with search capabilities.
+
+        The connection pool is shared by every thread using the client.
+        When read replicas are given, each endpoint has its own pool and
+        every query is read from the healthy endpoint with the lowest
+        measured latency (see ReplicaRouter), failing over to the next one
+        on connection errors.
+
+        Args:
+            host, port, password: Redis connection settings of the primary
+            replicas: (host, port) of the read replicas, sharing the
+                      primary's password; by default parsed from
+                      REDIS_REPLICAS
+            page_size: Documents read per page of a search
+            pool_options: Settings of connection_pool(), e.g.
+                          max_connections or socket_timeout; they default
+                          to the REDIS_* environment variables
+        """
+        self.page_size = page_size
+        if replicas is None:
+            replicas = parse_endpoints(REDIS_REPLICAS)
+        endpoints = [(host, port)] + list(replicas)
+        self.pools = [connection_pool(endpoint_host, endpoint_port, password,
+                                      **pool_options)
+                      for endpoint_host, endpoint_port in endpoints]
+        self.redis_clients = [redis.Redis(connection_pool=pool)
+                              for pool in self.pools]
+        self.pool = self.pools[0]
+        self.redis_client = self.redis_clients[0]
+        self.search_idx = self.redis_client.ft(INDEX_NAME)
+        self.router = ReplicaRouter(endpoints, password) \
+            if replicas else None
+        # (dataset version, TrigramIndex) of the name lookup hash's keys
+        self.name_search = None
+        self._name_search_lock = threading.Lock()
+        # (dataset version, CountCache) of the live generation's motivations
+        self.motivation_search = None
+        self._motivation_search_lock = threading.Lock()
         # TODO: add some exception handling so that it can check if data exists
 
+    def _read(self, call: Callable[[redis.Redis], Any]) -> Any:
+        """
+        Run a read on the endpoint chosen by the router.
+
+        Args:
+            call: Function issuing the read on an endpoint's client
+
+        Returns:
+            The result of call; connection errors are retried on the other
+            endpoints and raised once all of them failed
+        """
+        if self.router is None:
+            return call(self.redis_client)
+        failed = []
+        while True:
+            index = self.router.pick(exclude=failed)
+            try:
+                result = call(self.redis_clients[index])
+            except (redis.ConnectionError, redis.TimeoutError):
+                self.router.record_failure(index)
+                failed.append(index)
+                if len(failed) == len(self.redis_clients):
+                    raise
+                continue
+            self.router.record_read(index)
+            return result
+
+    def _search_pages(self, query_str: str,
+                      page_size: int = None) -> Iterator[List[Dict]]:
+        """
+        Yield the prize documents matching a search, one page at a time.
+
+        The search opens a cursor with FT.AGGREGATE WITHCURSOR, which
+        returns the first page, and every next page is read with
+        FT.CURSOR READ on the same endpoint, so only one page of documents
+        is held at a time however many prizes match. A cursor left unread
+        is deleted.
+
+        Raises:
+            SearchCursorLost: If a next page cannot be read, e.g. because
+                              the data was reloaded during the search
+
+        Args:
+            query_str: RediSearch query string
+            page_size: Documents per page, the client's page size by default
+
+        Yields:
+            Lists of prize documents decoded from JSON
+        """
+        page_size = page_size or self.page_size
+        command = aggregate_command(query_str, page_size)
+        with redis_timer("FT.AGGREGATE"):
+            client, reply = self._read(
+                lambda client: (client, client.execute_command(*command)))
+        cursor_id = 0
+        try:
+            while True:
+                prizes, cursor_id = decode_page(reply)
+                yield prizes
+                if not cursor_id:
+                    return
+                try:
+                    with redis_timer("FT.CURSOR"):
+                        reply = client.execute_command(
+                            *cursor_read_command(cursor_id, page_size))
+                except redis.ResponseError as e:
+                    cursor_id = 0
+                    raise SearchCursorLost(str(e)) from e
+        finally:
+            if cursor_id:
+                try:
+                    client.execute_command(*cursor_delete_command(cursor_id))
+                except redis.RedisError:
+                    pass  # The cursor expires after its idle time anyway
+
+    def _fold_search(self, method: str, args: tuple, query_str: str):
+        """
+        Answer a query from a search, folding every page into the result as
+        it arrives. A search whose cursor is lost is run again once, on the
+        new generation.
+        """
+        for attempt in range(2):
+            result = empty_result(method)
+            try:
+                for prizes in self._search_pages(query_str):
+                    result = result + fold_prizes(method, args, prizes)
+                return result
+            except SearchCursorLost:
+                if attempt:
+                    raise
+
+    def dataset_version(self) -> str | None:
+        """Return the version stamp written by the last data load."""
+        with redis_timer("GET"):
+            return self._read(
+                lambda client: client.get(DATASET_VERSION_KEY))
+
+    def pool_stats(self) -> Dict[str, float]:
+        """Return the saturation counters of the connection pools."""
+        return merge_pool_stats([pool.pool_stats.stats()
+                                 for pool in self.pools])
+
+    def pipeline(self, client: redis.Redis = None):
+        """
+        Return a non-transactional pipeline on an endpoint's pool.
+
+        The commands of a multi-step query queued on it are sent in one
+        round trip and hold a single pool connection.
+
+        Args:
+            client: Client of the endpoint, the primary by default
+        """
+        return (client or self.redis_client).pipeline(transaction=False)
+
+    def _execute(self, plan: Generator[Step, list, Any]) -> Any:
+        """
+        Send the pipelines of a query plan and return its result.
+
+        The first step is read on the endpoint chosen by the router, and a
+        step marked same_endpoint on the endpoint of the previous one.
+        """
+        client = None
+        replies = None
+        while True:
+            try:
+                step = plan.send(replies)
+            except StopIteration as done:
+                return done.value
+            if isinstance(step, MotivationIndexNeeded):
+                try:
+                    replies = self._load_motivation_search(step.stale_version)
+                except redis.RedisError as e:
+                    replies = e
+                continue
+
+            def execute(endpoint):
+                pipeline = self.pipeline(endpoint)
+                for command in step.commands:
+                    pipeline.execute_command(*command)
+                return endpoint, pipeline.execute(raise_on_error=False)
+
+            with redis_timer(step.label):
+                client, replies = (execute(client) if step.same_endpoint
+                                   else self._read(execute))
+
+    def _query(self, method: str, args: tuple):
+        """Answer one query, see batch_plan."""
+        return query_result(self._execute(batch_plan(
+            [(method, args)], self.page_size, self.motivation_search)))
+
     def count_laureates_by_category_and_years(self, category: str, start_year: 
                                               int, end_year: int) -> int:
         """
         Count total number of laureates in a given category between specific 
         years.
+
+        The per category and year counts built at ingest time answer the
+        query with a single HMGET; the full-text search is only used when
+        the counts have not been created yet.
         
         Args:
             category: Prize category (e.g., 'Physics', 'Chemistry')
@@ -47,27 +702,9 @@ class NobelPrizeClient:
         Returns:
             Total number of laureates found
         """
-        # Validate year range
-        if not (2013 <= start_year <= end_year <= 2023):
-            raise ValueError("Years must be between 2013 and 2023")
-
-        # Construct query
-        query_str = (
-            f"@category:{category} @year:[{start_year} {end_year}]"
-        )
-        
         try:
-            # Execute search
-            result = self.search_idx.search(Query(query_str))
-            
-            # Count laureates from results
-            total_laureates = 0
-            for doc in result.docs:
-                prize_data = self.redis_client.json().get(doc.id)
-                if 'laureates' in prize_data:
-                    total_laureates += len(prize_data['laureates'])
-            
-            return total_laureates
+            return self._query("count_laureates_by_category_and_years",
+                               (category, start_year, end_year))
         
         except redis.ResponseError as e:
             print(f"Search error: {e}")
@@ -76,33 +713,23 @@ class NobelPrizeClient:
     def count_laureates_by_motivation_keyword(self, keyword: str) -> int:
         """
         Count laureates whose motivation contains a specific keyword.
+
+        The count is answered by a motivation index of the live generation
+        kept in memory, with the same whole-word, phrase and prefix rules
+        as the snapshot client; only the dataset version is read from
+        Redis, and the index is reloaded when it changes.
         
         Args:
-            keyword: Word or phrase to search in motivations
+            keyword: Word or phrase to search in motivations, a trailing '*'
+                     matching every word starting with the last word
             
         Returns:
             Total number of laureates with matching motivations
         """
-        # Construct query for motivation field
-        query_str = f'@motivation:"{keyword}"'
-        
         try:
-            # Execute search
-            result = self.search_idx.search(Query(query_str))
-            
-            # Count laureates from matching results
-            total_laureates = 0
-            for doc in result.docs:
-                prize_data = self.redis_client.json().get(doc.id)
-                if 'laureates' in prize_data:
-                    # Only count laureates whose motivation matches the keyword
-                    total_laureates += sum(
-                        1 for laureate in prize_data['laureates']
-                        if keyword.lower() in laureate.get('motivation',
-                                                            '').lower()
-                    )
-            
-            return total_laureates
+            # Execute search and count laureates from matching results
+            return self._query("count_laureates_by_motivation_keyword",
+                               (keyword,))
             
         except redis.ResponseError as e:
             print(f"Search error: {e}")
@@ -112,6 +739,10 @@ class NobelPrizeClient:
                              surname: str) -> List[Dict[str, str]]:
         """
         Find prize details for a laureate by their full name.
+
+        The name lookup hash built at ingest time answers the query with a
+        single round trip; the full-text search is only used when the hash
+        has not been created yet.
         
         Args:
             firstname: Laureate's first name
@@ -121,36 +752,177 @@ class NobelPrizeClient:
             List of dictionaries containing year, category, and motivation 
             for each prize
         """
-        # Construct query to match both names
-        query_str = f'@firstname:"{firstname}" @surname:"{surname}"'
-        
         try:
-            # Execute search
-            result = self.search_idx.search(Query(query_str))
-            
-            # Extract relevant details
-            laureate_prizes = []
-            for doc in result.docs:
-                prize_data = self.redis_client.json().get(doc.id)
-                
-                # Find matching laureate in the prize data
-                for laureate in prize_data.get('laureates', []):
-                    if (laureate.get('firstname', '').lower() == 
-                        firstname.lower() and 
-                        laureate.get('surname', '').lower() == surname.lower()):
-                        laureate_prizes.append({
-                            'year': prize_data['year'],
-                            'category': prize_data['category'],
-                            'motivation': laureate.get('motivation', 
-                                                       'No motivation provided')
-                        })
-            
-            return laureate_prizes
+            return self._query("get_laureate_details_by_name",
+                               (firstname, surname))
             
         except redis.ResponseError as e:
             print(f"Search error: {e}")
             return []
 
+    def iter_laureate_details_by_name(self, firstname: str, surname: str,
+                                      page_size: int = None
+                                      ) -> Iterator[List[Dict[str, str]]]:
+        """
+        Yield the prize details of a laureate page by page.
+
+        Details from the name lookup hash are split into pages of page_size;
+        when the search is used instead, the matches of every search page
+        are yielded as soon as the page arrives.
+
+        Args:
+            firstname: Laureate's first name
+            surname: Laureate's last name
+            page_size: Details (or searched prizes) per page, the client's
+                       page size by default
+
+        Yields:
+            Non-empty lists of year, category and motivation dictionaries
+
+        Raises:
+            SearchCursorLost: If the data was reloaded while the search
+                              pages were read; the pages yielded so far
+                              came from the old generation
+        """
+        page_size = page_size or self.page_size
+        method, args = "get_laureate_details_by_name", (firstname, surname)
+        try:
+            details = fold_query(method, args, self._execute(
+                single_step(query_commands(method, args))))
+            if details is not SEARCH_NEEDED:
+                for start in range(0, len(details), page_size):
+                    yield details[start:start + page_size]
+                return
+
+            for prizes in self._search_pages(name_query(firstname, surname),
+                                             page_size):
+                matches = match_laureate_details(prizes, firstname, surname)
+                if matches:
+                    yield matches
+        except redis.ResponseError as e:
+            print(f"Search error: {e}")
+
+    def search_laureates_by_name(self, query: str, limit: int = SEARCH_LIMIT
+                                 ) -> List[Dict[str, Any]]:
+        """
+        Find the laureates whose name is closest to a possibly misspelled
+        or partial name.
+
+        The names of the lookup hash are matched in a trigram index kept in
+        memory (see nobel_prize_trigram_index.py); only the details of the
+        matches are read from Redis, together with the dataset version, in
+        one round trip. The index is reloaded when the version changes, and
+        the search is run again on it.
+
+        Args:
+            query: Full or partial name, e.g. 'Marie Cury' or 'ferenc kr'
+            limit: Largest number of laureates returned
+
+        Returns:
+            List of dictionaries with the first name, surname, score (share
+            of the query's trigrams found in the name) and prize details of
+            each laureate, best match first
+
+        Raises:
+            redis.RedisError: If the data was also reloaded while the search
+                              ran on the rebuilt index
+        """
+        try:
+            name_search = self.name_search or self._load_name_search()
+            for _ in range(2):
+                version, index = name_search
+                matches = index.search(query, limit)
+                current, *replies = self._execute(
+                    single_step(name_search_commands(matches)))
+                if current == version:
+                    return name_search_result(matches, replies)
+                # The data was reloaded since the index was built
+                name_search = self._load_name_search(version)
+            # Reloaded again while the rebuilt index was searched: its
+            # matches may name laureates no longer in the lookup hash
+            raise redis.RedisError("The dataset changed during every "
+                                   "name search attempt")
+        except redis.ResponseError as e:
+            print(f"Search error: {e}")
+            return []
+
+    def _load_name_search(self, stale_version: str = None
+                          ) -> Tuple[str, TrigramIndex]:
+        """
+        Build the trigram index of the names of the lookup hash, with the
+        names as stored of the display names hash.
+
+        Args:
+            stale_version: Version of the index found outdated; concurrent
+                           callers finding the same one reload it once
+
+        Returns:
+            The dataset version the index was built at, and the index
+        """
+        with self._name_search_lock:
+            if (self.name_search is not None and
+                    self.name_search[0] != stale_version):
+                return self.name_search
+
+            version, names, displays = self._execute(
+                single_step(NAME_SEARCH_LOAD_COMMANDS))
+            self.name_search = (version, build_name_search(names, displays))
+            return self.name_search
+
+    def _load_motivation_search(self, stale_version: str = None
+                                ) -> Tuple[str, CountCache]:
+        """
+        Build the motivation index of every laureate of the live
+        generation, read page by page from a search matching all prizes.
+
+        Args:
+            stale_version: Version of the index found outdated; concurrent
+                           callers finding the same one reload it once
+
+        Returns:
+            The dataset version the index was built at, and its counts
+
+        Raises:
+            redis.RedisError: If the data was reloaded during every attempt
+        """
+        with self._motivation_search_lock:
+            if (self.motivation_search is not None and
+                    self.motivation_search[0] != stale_version):
+                return self.motivation_search
+
+            for _ in range(2):
+                version = self.dataset_version()
+                motivations = []
+                try:
+                    for prizes in self._search_pages(ALL_PRIZES_QUERY):
+                        motivations.extend(laureate_motivations(prizes))
+                except SearchCursorLost:
+                    continue  # Reloaded under the search
+                if self.dataset_version() == version:
+                    self.motivation_search = (
+                        version, build_motivation_counts(motivations))
+                    return self.motivation_search
+            raise redis.RedisError("The dataset changed during every "
+                                   "motivation index load")
+
+    def run_batch(self, queries: List[Tuple[str, tuple]]) -> List[Any]:
+        """
+        Run several queries with their Redis commands pipelined.
+
+        See batch_plan: a batch costs one round trip (two if the
+        precomputed hashes are missing) whatever its size, plus one per
+        extra page of its longest search.
+
+        Args:
+            queries: (method name, arguments) pairs, e.g.
+                     ("count_laureates_by_motivation_keyword", ("peace",))
+
+        Returns:
+            One result per query in request order; a failed query's result
+            is the exception it raised
+        """
+        return self._execute(batch_plan(queries, self.page_size,
+                                        self.motivation_search))
 
 def main():
     """Main entry point of the application."""
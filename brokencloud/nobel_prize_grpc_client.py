@@ -6,67 +6,483 @@
 # TODO: Refactor
 
 # nobel_prize_client.py
+import asyncio
 import grpc
+import itertools
 import os
-from typing import List, Dict
+from concurrent import futures
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Tuple
+)
+from dotenv import load_dotenv
 
 # Import generated protocol buffer code
 import nobel_prize_pb2
 import nobel_prize_pb2_grpc
 from nobel_prize_cli import NobelPrizeCLI
 
+# Loading variables from .env file
+load_dotenv()
+
+# Constants
+GRPC_CHANNELS = int(os.getenv("GRPC_CHANNELS", "2"))
+GRPC_KEEPALIVE_MS = int(os.getenv("GRPC_KEEPALIVE_MS", "30000"))
+GRPC_KEEPALIVE_TIMEOUT_MS = int(os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS",
+                                          "10000"))
+GRPC_MAX_MESSAGE_BYTES = int(os.getenv("GRPC_MAX_MESSAGE_BYTES",
+                                       str(4 * 1024**2)))
+GRPC_READY_TIMEOUT = float(os.getenv("GRPC_READY_TIMEOUT", "5"))
+
+# Client method -> (RPC name, QueryRequest field of its request message)
+RPCS = {
+    'count_laureates_by_category_and_years': (
+        'CountLaureatesByCategoryAndYears', 'category_year'),
+    'count_laureates_by_motivation_keyword': (
+        'CountLaureatesByMotivationKeyword', 'motivation_keyword'),
+    'get_laureate_details_by_name': (
+        'GetLaureateDetailsByName', 'laureate_name'),
+}
+
+
+def channel_options(keepalive_ms: int = GRPC_KEEPALIVE_MS,
+                    keepalive_timeout_ms: int = GRPC_KEEPALIVE_TIMEOUT_MS,
+                    max_message_bytes: int = GRPC_MAX_MESSAGE_BYTES
+                    ) -> List[Tuple[str, Any]]:
+    """
+    Return the channel arguments of the pooled channels.
+
+    Args:
+        keepalive_ms: Interval of the HTTP/2 keepalive pings, 0 disables them
+        keepalive_timeout_ms: Time a ping may go unanswered before the
+                              connection is considered dead
+        max_message_bytes: Largest message sent or received
+    """
+    options = [
+        ('grpc.max_send_message_length', max_message_bytes),
+        ('grpc.max_receive_message_length', max_message_bytes),
+        # Give every channel of the pool its own TCP connection
+        ('grpc.use_local_subchannel_pool', 1),
+    ]
+    if keepalive_ms:
+        options += [
+            ('grpc.keepalive_time_ms', keepalive_ms),
+            ('grpc.keepalive_timeout_ms', keepalive_timeout_ms),
+            ('grpc.keepalive_permit_without_calls', 1),
+            ('grpc.http2.max_pings_without_data', 0),
+        ]
+    return options
+
+
+def query_request(method: str, args: tuple) -> nobel_prize_pb2.QueryRequest:
+    """Build the QueryRequest of a (client method, arguments) pair."""
+    if method == 'count_laureates_by_category_and_years':
+        category, start_year, end_year = args
+        return nobel_prize_pb2.QueryRequest(
+            category_year=nobel_prize_pb2.CategoryYearRequest(
+                category=category, start_year=start_year, end_year=end_year))
+    if method == 'count_laureates_by_motivation_keyword':
+        keyword, = args
+        return nobel_prize_pb2.QueryRequest(
+            motivation_keyword=nobel_prize_pb2.MotivationKeywordRequest(
+                keyword=keyword))
+    if method == 'get_laureate_details_by_name':
+        firstname, surname = args
+        return nobel_prize_pb2.QueryRequest(
+            laureate_name=nobel_prize_pb2.LaureateNameRequest(
+                firstname=firstname, surname=surname))
+    raise ValueError(f"Unknown query '{method}'")
+
+
+def query_result(method: str, response: nobel_prize_pb2.QueryResponse):
+    """Convert a QueryResponse to the result of the client method."""
+    if response.error:
+        print(f"Query error: {response.error}")
+        return [] if method == 'get_laureate_details_by_name' else 0
+    if response.HasField('details'):
+        return details_list(response.details)
+    return response.count.count
+
+
+def rpc_request(method: str, args: tuple):
+    """Build the request message of a unary query RPC."""
+    return getattr(query_request(method, args), RPCS[method][1])
+
+
+def rpc_result(method: str, response):
+    """Convert the response of a unary query RPC to the method's result."""
+    if method == 'get_laureate_details_by_name':
+        return details_list(response)
+    return response.count
+
+
+def default_result(method: str):
+    """Return the result of a query whose RPC failed."""
+    return [] if method == 'get_laureate_details_by_name' else 0
+
+
+def details_list(response) -> List[Dict[str, str]]:
+    """Convert a LaureateDetailsResponse to a list of dictionaries."""
+    return [
+        {
+            'year': detail.year,
+            'category': detail.category,
+            'motivation': detail.motivation
+        }
+        for detail in response.details
+    ]
+
+
+def matches_list(response) -> List[Dict[str, Any]]:
+    """Convert a LaureateSearchResponse to a list of dictionaries."""
+    return [
+        {
+            'firstname': match.firstname,
+            'surname': match.surname,
+            'score': match.score,
+            'details': details_list(match)
+        }
+        for match in response.matches
+    ]
+
+
 class NobelPrizeGRPCClient:
-    def __init__(self, host: str = 'localhost', port: int = 50051):
-        """Initialize gRPC channel and client stub."""
-        channel = grpc.insecure_channel(f'{host}:{port}')
-        self.stub = nobel_prize_pb2_grpc.NobelPrizeServiceStub(channel)
+    def __init__(self, host: str = 'localhost', port: int = 50051,
+                 channels: int = GRPC_CHANNELS,
+                 keepalive_ms: int = GRPC_KEEPALIVE_MS,
+                 keepalive_timeout_ms: int = GRPC_KEEPALIVE_TIMEOUT_MS,
+                 max_message_bytes: int = GRPC_MAX_MESSAGE_BYTES,
+                 ready_timeout: float = GRPC_READY_TIMEOUT):
+        """
+        Initialize a pool of gRPC channels and their client stubs.
+
+        Calls are spread round-robin over the channels, each with its own
+        connection, so concurrent calls are not limited by the streams of a
+        single HTTP/2 connection.
+
+        Args:
+            host, port: Address of the gRPC server
+            channels: Number of pooled channels
+            keepalive_ms, keepalive_timeout_ms, max_message_bytes: See
+                channel_options
+            ready_timeout: Seconds to wait for the channels to connect, 0
+                           skips the warm-up
+        """
+        options = channel_options(keepalive_ms, keepalive_timeout_ms,
+                                  max_message_bytes)
+        self.channels = [grpc.insecure_channel(f'{host}:{port}',
+                                               options=options)
+                         for _ in range(max(1, channels))]
+        self.stubs = [nobel_prize_pb2_grpc.NobelPrizeServiceStub(channel)
+                      for channel in self.channels]
+        self._next_stub = itertools.count()
+        self.stub = self.stubs[0]
+        if ready_timeout:
+            self.wait_for_ready(ready_timeout)
+
+    def wait_for_ready(self, timeout: float = GRPC_READY_TIMEOUT) -> bool:
+        """
+        Connect every channel of the pool.
+
+        Returns:
+            True if all channels are ready before the timeout
+        """
+        try:
+            for channel in self.channels:
+                grpc.channel_ready_future(channel).result(timeout=timeout)
+            return True
+        except grpc.FutureTimeoutError:
+            print(f"gRPC server not ready after {timeout:g} s")
+            return False
+
+    def _stub(self) -> nobel_prize_pb2_grpc.NobelPrizeServiceStub:
+        """Return the stub of the next channel of the pool."""
+        return self.stubs[next(self._next_stub) % len(self.stubs)]
+
+    def call(self, method: str, args: tuple):
+        """Run a query method by name and return its result."""
+        try:
+            response = getattr(self._stub(), RPCS[method][0])(
+                rpc_request(method, args))
+            return rpc_result(method, response)
+        except grpc.RpcError as e:
+            print(f"RPC error: {e.details()}")
+            return default_result(method)
+
+    def future(self, method: str, args: tuple) -> futures.Future:
+        """
+        Start a query method by name without waiting for its response.
+
+        Returns:
+            A future whose result is the query result, the empty result if
+            the RPC failed as with call(); other errors, such as a cancelled
+            call, are raised by the future
+        """
+        result = futures.Future()
+        call = getattr(self._stub(), RPCS[method][0]).future(
+            rpc_request(method, args))
+
+        def done(call):
+            try:
+                result.set_result(rpc_result(method, call.result()))
+            except grpc.RpcError as e:
+                print(f"RPC error: {e.details()}")
+                result.set_result(default_result(method))
+            except Exception as e:
+                # Left unset, the future would block its waiters forever
+                result.set_exception(e)
+
+        call.add_done_callback(done)
+        return result
+
+    def fan_out(self, queries: Iterable[Tuple[str, tuple]]) -> List[Any]:
+        """
+        Send queries concurrently as separate RPCs.
+
+        Args:
+            queries: (method name, arguments) pairs
+
+        Returns:
+            The result of each query in request order
+        """
+        pending = [self.future(method, args) for method, args in queries]
+        return [future.result() for future in pending]
 
     def count_laureates_by_category_and_years(self, category: str, 
                                             start_year: int, end_year: int) -> int:
         """Query laureate count by category and year range via gRPC."""
-        request = nobel_prize_pb2.CategoryYearRequest(
-            category=category,
-            start_year=start_year,
-            end_year=end_year
+        return self.call('count_laureates_by_category_and_years',
+                         (category, start_year, end_year))
+
+    def count_laureates_by_motivation_keyword(self, keyword: str) -> int:
+        """Query laureate count by motivation keyword via gRPC."""
+        return self.call('count_laureates_by_motivation_keyword', (keyword,))
+
+    def get_laureate_details_by_name(self, firstname: str, 
+                           surname: str) -> List[Dict[str, str]]:
+        """Query laureate details by name via gRPC."""
+        return self.call('get_laureate_details_by_name', (firstname, surname))
+
+    def count_laureates_by_category_and_years_future(
+            self, category: str, start_year: int,
+            end_year: int) -> futures.Future:
+        """Start a category/year count and return a future of the count."""
+        return self.future('count_laureates_by_category_and_years',
+                           (category, start_year, end_year))
+
+    def count_laureates_by_motivation_keyword_future(
+            self, keyword: str) -> futures.Future:
+        """Start a motivation keyword count and return a future of it."""
+        return self.future('count_laureates_by_motivation_keyword', (keyword,))
+
+    def get_laureate_details_by_name_future(
+            self, firstname: str, surname: str) -> futures.Future:
+        """Start a laureate lookup and return a future of the details."""
+        return self.future('get_laureate_details_by_name',
+                           (firstname, surname))
+
+    def stream_laureate_details_by_name(
+            self, firstname: str, surname: str,
+            page_size: int = 0) -> Iterator[List[Dict[str, str]]]:
+        """
+        Query laureate details by name, page by page, via gRPC.
+
+        Args:
+            firstname: Laureate's first name
+            surname: Laureate's last name
+            page_size: Details per page, 0 for the server default
+
+        Yields:
+            Lists of year, category and motivation dictionaries as the
+            server finds them; a laureate without prizes yields one empty list
+        """
+        request = nobel_prize_pb2.LaureateNamePageRequest(
+            firstname=firstname, surname=surname, page_size=page_size)
+        try:
+            for response in self._stub().StreamLaureateDetailsByName(request):
+                yield details_list(response)
+        except grpc.RpcError as e:
+            print(f"RPC error: {e.details()}")
+
+    def search_laureates_by_name(self, query: str,
+                                 limit: int = 0) -> List[Dict[str, Any]]:
+        """
+        Find the laureates closest to a misspelled or partial name via gRPC.
+
+        Args:
+            query: Full or partial name, e.g. 'Marie Cury'
+            limit: Largest number of laureates, 0 for the server default
+
+        Returns:
+            List of dictionaries with the first name, surname, score and
+            prize details of each laureate, best match first
+        """
+        request = nobel_prize_pb2.LaureateSearchRequest(query=query,
+                                                        limit=limit)
+        try:
+            return matches_list(self._stub().SearchLaureatesByName(request))
+        except grpc.RpcError as e:
+            print(f"RPC error: {e.details()}")
+            return []
+
+    def batch_query(self, queries: List[Tuple[str, tuple]]) -> List[Any]:
+        """
+        Run several queries in a single BatchQuery RPC.
+
+        Args:
+            queries: (method name, arguments) pairs, e.g.
+                     ('count_laureates_by_motivation_keyword', ('peace',))
+
+        Returns:
+            The result of each query in request order
+        """
+        request = nobel_prize_pb2.BatchQueryRequest(
+            queries=[query_request(method, args) for method, args in queries]
         )
         try:
-            response = self.stub.CountLaureatesByCategoryAndYears(request)
-            return response.count
+            response = self._stub().BatchQuery(request)
+            return [query_result(method, result) for (method, _), result
+                    in zip(queries, response.results)]
         except grpc.RpcError as e:
             print(f"RPC error: {e.details()}")
-            return 0
+            return [default_result(method) for method, _ in queries]
+
+    def query_stream(self, queries: Iterable[Tuple[str, tuple]]
+                     ) -> Iterator[Any]:
+        """
+        Send queries over a QueryStream RPC and yield their results.
+
+        Queries are consumed lazily from the iterable, so results start
+        coming back before the last query is sent.
+
+        Args:
+            queries: (method name, arguments) pairs
+
+        Yields:
+            The result of each query in request order
+        """
+        methods = []
+
+        def requests():
+            for method, args in queries:
+                methods.append(method)
+                yield query_request(method, args)
 
-    def count_laureates_by_motivation_keyword(self, keyword: str) -> int:
-        """Query laureate count by motivation keyword via gRPC."""
-        request = nobel_prize_pb2.MotivationKeywordRequest(keyword=keyword)
         try:
-            response = self.stub.CountLaureatesByMotivationKeyword(request)
-            return response.count
+            for position, response in enumerate(
+                    self._stub().QueryStream(requests())):
+                yield query_result(methods[position], response)
         except grpc.RpcError as e:
             print(f"RPC error: {e.details()}")
-            return 0
 
-    def get_laureate_details_by_name(self, firstname: str, 
-                           surname: str) -> List[Dict[str, str]]:
+    def close(self):
+        """Close the pooled channels."""
+        for channel in self.channels:
+            channel.close()
+
+
+class AsyncNobelPrizeGRPCClient:
+    def __init__(self, host: str = 'localhost', port: int = 50051,
+                 channels: int = GRPC_CHANNELS,
+                 keepalive_ms: int = GRPC_KEEPALIVE_MS,
+                 keepalive_timeout_ms: int = GRPC_KEEPALIVE_TIMEOUT_MS,
+                 max_message_bytes: int = GRPC_MAX_MESSAGE_BYTES):
+        """
+        Initialize a pool of grpc.aio channels, see NobelPrizeGRPCClient.
+
+        Must be created inside the event loop it is used from; call
+        wait_for_ready to warm the channels up.
+        """
+        options = channel_options(keepalive_ms, keepalive_timeout_ms,
+                                  max_message_bytes)
+        self.channels = [grpc.aio.insecure_channel(f'{host}:{port}',
+                                                   options=options)
+                         for _ in range(max(1, channels))]
+        self.stubs = [nobel_prize_pb2_grpc.NobelPrizeServiceStub(channel)
+                      for channel in self.channels]
+        self._next_stub = itertools.count()
+
+    async def wait_for_ready(self,
+                             timeout: float = GRPC_READY_TIMEOUT) -> bool:
+        """Connect every channel of the pool, see NobelPrizeGRPCClient."""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(channel.channel_ready()
+                                 for channel in self.channels)), timeout)
+            return True
+        except asyncio.TimeoutError:
+            print(f"gRPC server not ready after {timeout:g} s")
+            return False
+
+    async def call(self, method: str, args: tuple):
+        """Run a query method by name and return its result."""
+        stub = self.stubs[next(self._next_stub) % len(self.stubs)]
+        try:
+            response = await getattr(stub, RPCS[method][0])(
+                rpc_request(method, args))
+            return rpc_result(method, response)
+        except grpc.RpcError as e:
+            print(f"RPC error: {e.details()}")
+            return default_result(method)
+
+    async def fan_out(self, queries: Iterable[Tuple[str, tuple]]
+                      ) -> List[Any]:
+        """Send queries concurrently and return their results in order."""
+        return await asyncio.gather(*(self.call(method, args)
+                                      for method, args in queries))
+
+    async def count_laureates_by_category_and_years(
+            self, category: str, start_year: int, end_year: int) -> int:
+        """Query laureate count by category and year range via gRPC."""
+        return await self.call('count_laureates_by_category_and_years',
+                               (category, start_year, end_year))
+
+    async def count_laureates_by_motivation_keyword(self, keyword: str) -> int:
+        """Query laureate count by motivation keyword via gRPC."""
+        return await self.call('count_laureates_by_motivation_keyword',
+                               (keyword,))
+
+    async def get_laureate_details_by_name(
+            self, firstname: str, surname: str) -> List[Dict[str, str]]:
         """Query laureate details by name via gRPC."""
-        request = nobel_prize_pb2.LaureateNameRequest(
-            firstname=firstname,
-            surname=surname
-        )
+        return await self.call('get_laureate_details_by_name',
+                               (firstname, surname))
+
+    async def stream_laureate_details_by_name(
+            self, firstname: str, surname: str,
+            page_size: int = 0) -> AsyncIterator[List[Dict[str, str]]]:
+        """Query laureate details by name, page by page, via gRPC."""
+        stub = self.stubs[next(self._next_stub) % len(self.stubs)]
+        request = nobel_prize_pb2.LaureateNamePageRequest(
+            firstname=firstname, surname=surname, page_size=page_size)
         try:
-            response = self.stub.GetLaureateDetailsByName(request)
-            return [
-                {
-                    'year': detail.year,
-                    'category': detail.category,
-                    'motivation': detail.motivation
-                }
-                for detail in response.details
-            ]
+            async for response in stub.StreamLaureateDetailsByName(request):
+                yield details_list(response)
+        except grpc.RpcError as e:
+            print(f"RPC error: {e.details()}")
+
+    async def search_laureates_by_name(self, query: str, limit: int = 0
+                                       ) -> List[Dict[str, Any]]:
+        """Find the laureates closest to a partial name via gRPC."""
+        stub = self.stubs[next(self._next_stub) % len(self.stubs)]
+        request = nobel_prize_pb2.LaureateSearchRequest(query=query,
+                                                        limit=limit)
+        try:
+            return matches_list(await stub.SearchLaureatesByName(request))
         except grpc.RpcError as e:
             print(f"RPC error: {e.details()}")
             return []
 
+    async def close(self):
+        """Close the pooled channels."""
+        for channel in self.channels:
+            await channel.close()
+
 
 def main():
     """Main entry point of the application."""
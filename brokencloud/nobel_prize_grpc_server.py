@@ -4,7 +4,15 @@
 # ASSIGNMENT TASKS: Task 2.3
 #    
 
+import argparse
+import asyncio
+import inspect
+import multiprocessing
+import multiprocessing.connection
 import os
+import queue
+import signal
+import threading
 import grpc
 from concurrent import futures
 import time
@@ -12,10 +20,32 @@ from redis.commands.search.query import Query
 from nobel_prize_pb2 import (
     LaureateCountResponse,
     LaureateDetailsResponse,
-    LaureateDetail
+    LaureateDetail,
+    LaureateMatch,
+    LaureateSearchResponse,
+    QueryResponse,
+    BatchQueryResponse
 )
 import nobel_prize_pb2_grpc
+from nobel_prize_async_client import AsyncNobelPrizeClient
+from nobel_prize_cache import ResponseCache
 from nobel_prize_client import NobelPrizeClient  # Import the Redis client class
+from nobel_prize_client import SEARCH_PAGE_SIZE
+from nobel_prize_metrics import (
+    Metrics,
+    MetricsInterceptor,
+    AsyncMetricsInterceptor,
+    start_metrics_server
+)
+from nobel_prize_micro_batch import (
+    MICRO_BATCH_MAX,
+    MICRO_BATCH_WINDOW_MS,
+    MicroBatcher,
+    AsyncMicroBatcher
+)
+from nobel_prize_single_flight import SingleFlight, AsyncSingleFlight
+from nobel_prize_snapshot import NobelPrizeSnapshotClient, DATA_PATH
+from nobel_prize_trigram_index import MAX_SEARCH_LIMIT, SEARCH_LIMIT
 from dotenv import load_dotenv
 
 # Loading variables from .env file
@@ -25,26 +55,311 @@ load_dotenv()
 REDIS_HOST = os.getenv("REDIS_HOST")
 REDIS_PORT = os.getenv("REDIS_PORT")
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+BACKEND = os.getenv("NOBEL_BACKEND", "redis")
+BACKENDS = ("redis", "snapshot")
+MODE = os.getenv("SERVER_MODE", "threaded")
+MODES = ("threaded", "async")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "50051"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(8 * 1024**2)))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "300"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+SINGLE_FLIGHT = os.getenv("SINGLE_FLIGHT", "1") == "1"
+STREAM_BATCH_SIZE = 64
+WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+SHUTDOWN_GRACE = float(os.getenv("SHUTDOWN_GRACE", "5"))
+MIN_WORKER_UPTIME = 10.0  # Workers exiting sooner are restarted with backoff
+MAX_RESTART_DELAY = 30.0
 
+# QueryRequest field -> (client method, request message -> arguments)
+BATCH_QUERIES = {
+    'category_year': (
+        'count_laureates_by_category_and_years',
+        lambda request: (request.category, request.start_year,
+                         request.end_year)
+    ),
+    'motivation_keyword': (
+        'count_laureates_by_motivation_keyword',
+        lambda request: (request.keyword,)
+    ),
+    'laureate_name': (
+        'get_laureate_details_by_name',
+        lambda request: (request.firstname, request.surname)
+    ),
+}
 
-class NobelPrizeService(nobel_prize_pb2_grpc.NobelPrizeServiceServicer):
-    def __init__(self, redis_host: str, redis_port: int, redis_password: str):
-        """Initialize Redis connection."""
-        self.client = NobelPrizeClient(
+
+def create_client(backend: str, redis_host: str = None, redis_port: int = None,
+                  redis_password: str = None, data_path: str = DATA_PATH,
+                  asynchronous: bool = False):
+    """
+    Create the query backend used by the service.
+
+    Args:
+        backend: 'redis' to query Redis, 'snapshot' to answer from an
+                 in-memory snapshot of the prize data file
+        redis_host, redis_port, redis_password: Redis connection settings
+        data_path: Prize data file loaded by the snapshot backend
+        asynchronous: Use the redis.asyncio client for the Redis backend
+
+    Returns:
+        A client exposing the NobelPrizeClient query methods
+    """
+    if backend == "redis" and asynchronous:
+        return AsyncNobelPrizeClient(
             host=redis_host,
             port=redis_port,
             password=redis_password
         )
+    if backend == "redis":
+        return NobelPrizeClient(
+            host=redis_host,
+            port=redis_port,
+            password=redis_password
+        )
+    if backend == "snapshot":
+        return NobelPrizeSnapshotClient(data_path)
+    raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+
+def count_response(count: int) -> LaureateCountResponse:
+    return LaureateCountResponse(count=count, message="Success")
+
+
+def details_response(laureate_details) -> LaureateDetailsResponse:
+    details = [
+        LaureateDetail(year=detail['year'], category=detail['category'], motivation=detail['motivation'])
+        for detail in laureate_details
+    ]
+    return LaureateDetailsResponse(details=details, message=("Success" if laureate_details else "No prizes found"))
+
+
+def search_response(matches) -> LaureateSearchResponse:
+    laureates = [
+        LaureateMatch(firstname=match['firstname'], surname=match['surname'],
+                      score=match['score'],
+                      details=details_response(match['details']).details)
+        for match in matches
+    ]
+    return LaureateSearchResponse(matches=laureates, message=("Success" if matches else "No laureates found"))
+
+
+class InvalidArgument(ValueError):
+    """A request field outside its valid range, answered INVALID_ARGUMENT."""
+
+
+def search_limit(request) -> int:
+    """Return the number of matches requested, within MAX_SEARCH_LIMIT."""
+    if request.limit < 0:
+        raise InvalidArgument(f"limit must not be negative: {request.limit}")
+    return min(request.limit or SEARCH_LIMIT, MAX_SEARCH_LIMIT)
+
+
+def detail_pages(client, firstname: str, surname: str, page_size: int = 0):
+    """
+    Return an iterator over the pages of a laureate's prize details.
+
+    Backends without a paged query (the snapshot) have their full result
+    split into pages instead.
+
+    Raises:
+        InvalidArgument: If page_size is negative
+    """
+    if page_size < 0:
+        raise InvalidArgument(f"page_size must not be negative: {page_size}")
+    if hasattr(client, 'iter_laureate_details_by_name'):
+        return client.iter_laureate_details_by_name(firstname, surname,
+                                                    page_size or None)
+    details = client.get_laureate_details_by_name(firstname, surname)
+    page_size = page_size or SEARCH_PAGE_SIZE
+    return (details[start:start + page_size]
+            for start in range(0, len(details), page_size))
+
+
+def query_response(field: str, response) -> QueryResponse:
+    """Wrap the response to one sub-query of a batch."""
+    if field == 'laureate_name':
+        return QueryResponse(details=response)
+    return QueryResponse(count=response)
+
+
+def stream_batches(request_iterator, max_batch: int = STREAM_BATCH_SIZE):
+    """
+    Group the requests of a client stream into batches.
+
+    A reader thread consumes the stream while the caller works, and each
+    batch holds every request that arrived in the meantime (up to
+    max_batch), so a busy stream is answered with pipelined batches while
+    a slow one is still answered request by request.
+    """
+    requests = queue.Queue()
+    done = object()
+
+    def read():
+        try:
+            for request in request_iterator:
+                requests.put(request)
+        except grpc.RpcError:
+            pass  # Client cancelled the stream
+        finally:
+            requests.put(done)
+
+    threading.Thread(target=read, daemon=True).start()
+    finished = False
+    while not finished:
+        batch = [requests.get()]
+        while len(batch) < max_batch and not requests.empty():
+            batch.append(requests.get_nowait())
+        if batch[-1] is done:
+            batch.pop()
+            finished = True
+        if batch:
+            yield batch
+
+
+def cache_key(request) -> tuple:
+    """Return the response cache key of a request message."""
+    return (type(request).__name__,
+            request.SerializeToString(deterministic=True))
+
+
+class NobelPrizeService(nobel_prize_pb2_grpc.NobelPrizeServiceServicer):
+    flight_class = SingleFlight
+
+    def __init__(self, client, cache: ResponseCache = None,
+                 single_flight: SingleFlight = None,
+                 micro_batcher: MicroBatcher = None):
+        """
+        Initialize the service with a query backend client.
+
+        Args:
+            client: Backend exposing the NobelPrizeClient query methods
+            cache: Response cache, by default one invalidated whenever the
+                   backend's dataset version changes
+            single_flight: Coalescing of identical concurrent requests, by
+                           default enabled
+            micro_batcher: Dispatcher running the queries of concurrent
+                           requests as batches, None to run each alone
+        """
+        self.client = client
+        self.cache = cache if cache is not None else ResponseCache(
+            version_source=client.dataset_version
+        )
+        self.single_flight = single_flight if single_flight is not None \
+            else self.flight_class()
+        self.micro_batcher = micro_batcher
+
+    def _query(self, method: str, *args):
+        """Run a backend query, batched with concurrent ones if enabled."""
+        if self.micro_batcher is None:
+            return getattr(self.client, method)(*args)
+        return self.micro_batcher.submit(method, args)
+
+    def _respond(self, request, build):
+        """
+        Return the cached response to a request, building it on a miss.
+
+        Identical requests missing the cache at the same time share one
+        build.
+        """
+        key = cache_key(request)
+        return self.cache.get_or_compute(
+            key,
+            lambda: self.single_flight.do(key, lambda: build(request)),
+            lambda response: response.ByteSize() + len(key[1])
+        )
+
+    def _category_year_response(self, request) -> LaureateCountResponse:
+        count = self._query(
+            'count_laureates_by_category_and_years',
+            request.category, request.start_year, request.end_year
+        )
+        return count_response(count)
+
+    def _motivation_keyword_response(self, request) -> LaureateCountResponse:
+        count = self._query('count_laureates_by_motivation_keyword',
+                            request.keyword)
+        return count_response(count)
+
+    def _laureate_details_response(self, request) -> LaureateDetailsResponse:
+        laureate_details = self._query('get_laureate_details_by_name',
+                                       request.firstname, request.surname)
+        return details_response(laureate_details)
+
+    def _laureate_search_response(self, request) -> LaureateSearchResponse:
+        # Searched in the backend's in-memory trigram index, not batched
+        matches = self.client.search_laureates_by_name(request.query,
+                                                       search_limit(request))
+        return search_response(matches)
+
+    def _batch_lookup(self, queries):
+        """
+        Answer the sub-queries of a batch from the cache.
+
+        Returns:
+            (responses, misses): the responses list with cache hits and
+            invalid queries filled in, and (position, field, request,
+            version) for every sub-query the backend must run
+        """
+        responses = [None] * len(queries)
+        misses = []
+        for position, query in enumerate(queries):
+            field = query.WhichOneof('query')
+            if field is None:
+                responses[position] = QueryResponse(error="Empty query")
+                continue
+            request = getattr(query, field)
+            version = None
+            if self.cache.enabled:
+                hit, response, version = self.cache.lookup(cache_key(request))
+                if hit:
+                    responses[position] = query_response(field, response)
+                    continue
+            misses.append((position, field, request, version))
+        return responses, misses
+
+    def _batch_calls(self, misses):
+        """Return the backend calls answering the missed sub-queries."""
+        calls = []
+        for _, field, request, _ in misses:
+            method, arguments = BATCH_QUERIES[field]
+            calls.append((method, arguments(request)))
+        return calls
+
+    def _batch_complete(self, responses, misses, results):
+        """Fill in and cache the backend results of the missed sub-queries."""
+        for (position, field, request, version), result in zip(misses,
+                                                               results):
+            if isinstance(result, Exception):
+                responses[position] = QueryResponse(error=str(result))
+                continue
+            if field == 'laureate_name':
+                response = details_response(result)
+            else:
+                response = count_response(result)
+            if self.cache.enabled:
+                key = cache_key(request)
+                self.cache.store(key, response,
+                                 response.ByteSize() + len(key[1]), version)
+            responses[position] = query_response(field, response)
+        return responses
+
+    def _respond_batch(self, queries):
+        """Answer a batch of sub-queries with one pipelined backend call."""
+        if self.cache.enabled and self.cache.version_check_due():
+            self.cache.set_version(self.client.dataset_version())
+        responses, misses = self._batch_lookup(queries)
+        results = self.client.run_batch(self._batch_calls(misses)) \
+            if misses else []
+        return self._batch_complete(responses, misses, results)
 
     def CountLaureatesByCategoryAndYears(self, request, context):
         """
         Implement Service 1: Count laureates by category and year range
         """
         try:
-            count = self.client.count_laureates_by_category_and_years(
-                request.category, request.start_year, request.end_year
-            )
-            return LaureateCountResponse(count=count, message="Success")
+            return self._respond(request, self._category_year_response)
         except Exception as e:
             context.abort(grpc.StatusCode.INTERNAL, str(e))
     
@@ -53,8 +368,7 @@ class NobelPrizeService(nobel_prize_pb2_grpc.NobelPrizeServiceServicer):
         Implement Service 2: Count laureates by motivation keyword
         """
         try:
-            count = self.client.count_laureates_by_motivation_keyword(request.keyword)
-            return LaureateCountResponse(count=count, message="Success")
+            return self._respond(request, self._motivation_keyword_response)
         except Exception as e:
             context.abort(grpc.StatusCode.INTERNAL, str(e))
     
@@ -63,37 +377,484 @@ class NobelPrizeService(nobel_prize_pb2_grpc.NobelPrizeServiceServicer):
         Implement Query 3: Get laureate details by name
         """
         try:
-            laureate_details = self.client.get_laureate_details_by_name(request.firstname, request.surname)
-            details = [
-                LaureateDetail(year=detail['year'], category=detail['category'], motivation=detail['motivation'])
-                for detail in laureate_details
-            ]
-            return LaureateDetailsResponse(details=details, message=("Success" if laureate_details else "No prizes found"))
+            return self._respond(request, self._laureate_details_response)
+        except Exception as e:
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    def StreamLaureateDetailsByName(self, request, context):
+        """
+        Stream the result of Query 3 page by page as the pages are found
+        """
+        try:
+            found = False
+            for details in detail_pages(self.client, request.firstname,
+                                        request.surname, request.page_size):
+                found = True
+                yield details_response(details)
+            if not found:
+                yield details_response([])
+        except InvalidArgument as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except Exception as e:
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    def SearchLaureatesByName(self, request, context):
+        """
+        Find the laureates closest to a misspelled or partial name
+        """
+        try:
+            return self._respond(request, self._laureate_search_response)
+        except InvalidArgument as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
         except Exception as e:
             context.abort(grpc.StatusCode.INTERNAL, str(e))
 
-def serve(redis_host: str, redis_port: int, redis_password: str):
-    """Start the gRPC server."""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    def BatchQuery(self, request, context):
+        """
+        Run a batch of queries, pipelining their Redis work, and return the
+        results in request order
+        """
+        try:
+            return BatchQueryResponse(
+                results=self._respond_batch(request.queries))
+        except Exception as e:
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    def QueryStream(self, request_iterator, context):
+        """
+        Answer a stream of queries in request order, batching the queries
+        that arrive while the previous ones are being answered
+        """
+        try:
+            for batch in stream_batches(request_iterator):
+                yield from self._respond_batch(batch)
+        except Exception as e:
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+class AsyncNobelPrizeService(NobelPrizeService):
+    """
+    Service variant for the grpc.aio server whose handlers are coroutines.
+
+    The backend client may be asynchronous (AsyncNobelPrizeClient) or a
+    synchronous in-memory backend such as the snapshot, whose calls are fast
+    enough to run directly on the event loop.
+    """
+    flight_class = AsyncSingleFlight
+
+    async def _call(self, method, *args):
+        """Call a backend method, awaiting it if it is a coroutine."""
+        result = method(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _query(self, method: str, *args):
+        """Run a backend query, batched with concurrent ones if enabled."""
+        if self.micro_batcher is None:
+            return await self._call(getattr(self.client, method), *args)
+        return await self.micro_batcher.submit(method, args)
+
+    async def _respond(self, request, build):
+        """Return the cached response to a request, building it on a miss."""
+        key = cache_key(request)
+        if not self.cache.enabled:
+            return await self.single_flight.do(key, lambda: build(request))
+        if self.cache.version_check_due():
+            self.cache.set_version(await self._call(self.client.dataset_version))
+        hit, response, version = self.cache.lookup(key)
+        if hit:
+            return response
+        response = await self.single_flight.do(key, lambda: build(request))
+        self.cache.store(key, response, response.ByteSize() + len(key[1]),
+                         version)
+        return response
+
+    async def _category_year_response(self, request) -> LaureateCountResponse:
+        count = await self._query(
+            'count_laureates_by_category_and_years',
+            request.category, request.start_year, request.end_year
+        )
+        return count_response(count)
+
+    async def _motivation_keyword_response(self, request) -> LaureateCountResponse:
+        count = await self._query('count_laureates_by_motivation_keyword',
+                                  request.keyword)
+        return count_response(count)
+
+    async def _laureate_details_response(self, request) -> LaureateDetailsResponse:
+        laureate_details = await self._query(
+            'get_laureate_details_by_name', request.firstname,
+            request.surname
+        )
+        return details_response(laureate_details)
+
+    async def _laureate_search_response(self, request) -> LaureateSearchResponse:
+        matches = await self._call(self.client.search_laureates_by_name,
+                                   request.query, search_limit(request))
+        return search_response(matches)
+
+    async def _respond_batch(self, queries):
+        """Answer a batch of sub-queries with one pipelined backend call."""
+        if self.cache.enabled and self.cache.version_check_due():
+            self.cache.set_version(await self._call(self.client.dataset_version))
+        responses, misses = self._batch_lookup(queries)
+        results = await self._call(self.client.run_batch,
+                                   self._batch_calls(misses)) if misses else []
+        return self._batch_complete(responses, misses, results)
+
+    async def CountLaureatesByCategoryAndYears(self, request, context):
+        try:
+            return await self._respond(request, self._category_year_response)
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    async def CountLaureatesByMotivationKeyword(self, request, context):
+        try:
+            return await self._respond(request, self._motivation_keyword_response)
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    async def GetLaureateDetailsByName(self, request, context):
+        try:
+            return await self._respond(request, self._laureate_details_response)
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    async def StreamLaureateDetailsByName(self, request, context):
+        try:
+            pages = detail_pages(self.client, request.firstname,
+                                 request.surname, request.page_size)
+            found = False
+            if hasattr(pages, '__aiter__'):
+                async for details in pages:
+                    found = True
+                    yield details_response(details)
+            else:
+                for details in pages:
+                    found = True
+                    yield details_response(details)
+            if not found:
+                yield details_response([])
+        except InvalidArgument as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    async def SearchLaureatesByName(self, request, context):
+        try:
+            return await self._respond(request, self._laureate_search_response)
+        except InvalidArgument as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    async def BatchQuery(self, request, context):
+        try:
+            return BatchQueryResponse(
+                results=await self._respond_batch(request.queries))
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    async def QueryStream(self, request_iterator, context):
+        requests = asyncio.Queue()
+
+        async def read():
+            try:
+                async for request in request_iterator:
+                    await requests.put(request)
+            finally:
+                await requests.put(None)
+
+        reader = asyncio.create_task(read())
+        try:
+            finished = False
+            while not finished:
+                batch = [await requests.get()]
+                while (len(batch) < STREAM_BATCH_SIZE and
+                       not requests.empty()):
+                    batch.append(requests.get_nowait())
+                if batch[-1] is None:
+                    batch.pop()
+                    finished = True
+                if batch:
+                    for response in await self._respond_batch(batch):
+                        yield response
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+        finally:
+            reader.cancel()
+
+def start_metrics(cache: ResponseCache, metrics_host: str,
+                  metrics_port: int, client=None,
+                  single_flight: SingleFlight = None,
+                  micro_batcher: MicroBatcher = None) -> Metrics:
+    """Create the server metrics and serve them unless the port is 0."""
+    metrics = Metrics()
+    metrics.register_counters('nobel_cache', cache.stats)
+    if single_flight is not None:
+        metrics.register_counters('nobel_single_flight', single_flight.stats)
+    if micro_batcher is not None:
+        metrics.register_counters('nobel_micro_batch', micro_batcher.stats)
+    if hasattr(client, 'pool_stats'):
+        metrics.register_counters('nobel_redis_pool', client.pool_stats)
+    if getattr(client, 'router', None) is not None:
+        metrics.register_counters('nobel_redis', client.router.stats)
+    if metrics_port:
+        start_metrics_server(metrics, metrics_host, metrics_port)
+        print(f"Metrics on http://{metrics_host}:{metrics_port}/metrics")
+    return metrics
+
+def serve(redis_host: str, redis_port: int, redis_password: str,
+          backend: str = "redis", data_path: str = DATA_PATH,
+          port: int = SERVER_PORT,
+          cache_entries: int = CACHE_MAX_ENTRIES,
+          cache_bytes: int = CACHE_MAX_BYTES, cache_ttl: float = CACHE_TTL,
+          metrics_host: str = METRICS_HOST, metrics_port: int = METRICS_PORT,
+          reuse_port: bool = False, grace: float = SHUTDOWN_GRACE,
+          single_flight: bool = SINGLE_FLIGHT,
+          batch_window_ms: float = MICRO_BATCH_WINDOW_MS,
+          batch_max: int = MICRO_BATCH_MAX):
+    """
+    Start the gRPC server.
+
+    With reuse_port, several servers may listen on the same port at once
+    (SO_REUSEPORT), and the kernel spreads new connections among them.
+    """
+    client = create_client(backend, redis_host, redis_port, redis_password,
+                           data_path)
+    cache = ResponseCache(max_entries=cache_entries, max_bytes=cache_bytes,
+                          ttl=cache_ttl, version_source=client.dataset_version)
+    flights = SingleFlight(enabled=single_flight)
+    batcher = MicroBatcher(client.run_batch, batch_window_ms / 1000,
+                      batch_max) if batch_window_ms > 0 else None
+    metrics = start_metrics(cache, metrics_host, metrics_port, client,
+                            flights, batcher)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                         interceptors=[MetricsInterceptor(metrics)],
+                         options=[('grpc.so_reuseport', int(reuse_port))])
     nobel_prize_pb2_grpc.add_NobelPrizeServiceServicer_to_server(
-        NobelPrizeService(redis_host, redis_port, redis_password), 
+        NobelPrizeService(client, cache, flights, batcher),
         server
     )
-    server.add_insecure_port('[::]:50051')
+    server.add_insecure_port(f'[::]:{port}')
     server.start()
-    print("Server started on port 50051")
-    try:
-        while True:
-            time.sleep(86400)  # One day in seconds
-    except KeyboardInterrupt:
-        server.stop(0)
+    print(f"Server started on port {port} ({backend} backend, "
+          f"pid {os.getpid()})")
+
+    # Stop on Ctrl+C or SIGTERM (docker stop), letting calls in flight finish
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+    stop_event.wait()
+    server.stop(grace).wait()
+    print(f"Response cache: {cache.stats()}")
+    print(f"Single-flight: {flights.stats()}")
+    if batcher is not None:
+        print(f"Micro-batching: {batcher.stats()}")
+
+async def serve_async(redis_host: str, redis_port: int, redis_password: str,
+                      backend: str = "redis", data_path: str = DATA_PATH,
+                      port: int = SERVER_PORT,
+                      cache_entries: int = CACHE_MAX_ENTRIES,
+                      cache_bytes: int = CACHE_MAX_BYTES,
+                      cache_ttl: float = CACHE_TTL,
+                      metrics_host: str = METRICS_HOST,
+                      metrics_port: int = METRICS_PORT,
+                      reuse_port: bool = False,
+                      grace: float = SHUTDOWN_GRACE,
+                      single_flight: bool = SINGLE_FLIGHT,
+                      batch_window_ms: float = MICRO_BATCH_WINDOW_MS,
+                      batch_max: int = MICRO_BATCH_MAX):
+    """
+    Start the gRPC server on grpc.aio.
+
+    Every RPC runs as a coroutine on a single event loop and the Redis
+    backend shares one redis.asyncio connection pool, so the number of
+    in-flight requests is not bound to a thread count.
+    """
+    client = create_client(backend, redis_host, redis_port, redis_password,
+                           data_path, asynchronous=True)
+    cache = ResponseCache(max_entries=cache_entries, max_bytes=cache_bytes,
+                          ttl=cache_ttl, version_source=client.dataset_version)
+    flights = AsyncSingleFlight(enabled=single_flight)
+    batcher = AsyncMicroBatcher(client.run_batch, batch_window_ms / 1000,
+                      batch_max) if batch_window_ms > 0 else None
+    metrics = start_metrics(cache, metrics_host, metrics_port, client,
+                            flights, batcher)
+    server = grpc.aio.server(
+        interceptors=[AsyncMetricsInterceptor(metrics)],
+        options=[('grpc.so_reuseport', int(reuse_port))])
+    nobel_prize_pb2_grpc.add_NobelPrizeServiceServicer_to_server(
+        AsyncNobelPrizeService(client, cache, flights, batcher),
+        server
+    )
+    server.add_insecure_port(f'[::]:{port}')
+    await server.start()
+    print(f"Async server started on port {port} ({backend} backend, "
+          f"pid {os.getpid()})")
+
+    # Stop on Ctrl+C or SIGTERM (docker stop)
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop_event.set)
+    await stop_event.wait()
+    await server.stop(grace)
+    print(f"Response cache: {cache.stats()}")
+    print(f"Single-flight: {flights.stats()}")
+    if batcher is not None:
+        print(f"Micro-batching: {batcher.stats()}")
+
+def run_worker(mode: str, options: dict):
+    """Run one server process of serve_workers."""
+    # Forked from the supervisor, whose signal handlers must not apply here
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if mode == "async":
+        asyncio.run(serve_async(**options))
+    else:
+        serve(**options)
+
+def serve_workers(workers: int, mode: str = "threaded",
+                  grace: float = SHUTDOWN_GRACE, **options):
+    """
+    Start a pre-forked server of several processes sharing one port.
+
+    Each worker is a complete server with its own backend client (and Redis
+    connection pool), response cache and GIL; the kernel balances incoming
+    connections among them through SO_REUSEPORT. The supervisor restarts
+    workers that exit, with an increasing delay for those that keep
+    crashing on start, and stops them all gracefully on SIGINT or SIGTERM.
+    Worker i serves its metrics on metrics_port + i.
+
+    Args:
+        workers: Number of server processes
+        mode: 'threaded' or 'async' server in every worker
+        grace: Seconds calls in flight are given to finish on shutdown
+        options: Arguments of serve()/serve_async()
+    """
+    # Workers are forked before any gRPC or Redis object exists
+    context = multiprocessing.get_context("fork")
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    def start(index: int):
+        worker_options = dict(options, reuse_port=True, grace=grace)
+        if options.get('metrics_port'):
+            worker_options['metrics_port'] = options['metrics_port'] + index
+        process = context.Process(target=run_worker,
+                                  args=(mode, worker_options),
+                                  name=f"nobel-worker-{index}")
+        process.start()
+        started[index] = time.monotonic()
+        return process
+
+    started = [0.0] * workers
+    delays = [0.0] * workers
+    restart_at = {}  # Worker index -> time it is restarted
+    processes = [start(index) for index in range(workers)]
+    print(f"Supervisor {os.getpid()} started {workers} {mode} workers")
+
+    while not stop_event.is_set():
+        multiprocessing.connection.wait(
+            [process.sentinel for process in processes
+             if process.is_alive()], timeout=1.0)
+        now = time.monotonic()
+        for index, process in enumerate(processes):
+            if stop_event.is_set() or process.is_alive():
+                continue
+            if index not in restart_at:
+                uptime = now - started[index]
+                delays[index] = 0.0 if uptime >= MIN_WORKER_UPTIME else \
+                    min(max(2 * delays[index], 0.5), MAX_RESTART_DELAY)
+                restart_at[index] = now + delays[index]
+                print(f"Worker {index} (pid {process.pid}) exited with code "
+                      f"{process.exitcode}, restarting in "
+                      f"{delays[index]:g} s")
+            if now >= restart_at[index]:
+                del restart_at[index]
+                processes[index] = start(index)
+
+    print("Stopping workers...")
+    for process in processes:
+        if process.is_alive():
+            process.terminate()  # SIGTERM, handled as a graceful stop
+    deadline = time.monotonic() + grace + 5
+    for process in processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            print(f"Worker {process.name} did not stop, killing it")
+            process.kill()
+            process.join()
 
 if __name__ == '__main__':
-    serve(
+    parser = argparse.ArgumentParser(description="Nobel Prize gRPC server")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND,
+                        help="Query backend (default: $NOBEL_BACKEND or redis)")
+    parser.add_argument("--mode", choices=MODES, default=MODE,
+                        help="Threaded or asyncio server (default: "
+                             "$SERVER_MODE or threaded)")
+    parser.add_argument("--data-file", default=DATA_PATH,
+                        help="Prize data file for the snapshot backend")
+    parser.add_argument("--port", type=int, default=SERVER_PORT,
+                        help="Port the server listens on (default: "
+                             "$SERVER_PORT or 50051)")
+    parser.add_argument("--cache-entries", type=int, default=CACHE_MAX_ENTRIES,
+                        help="Maximum cached responses, 0 disables the cache")
+    parser.add_argument("--cache-bytes", type=int, default=CACHE_MAX_BYTES,
+                        help="Maximum total size of the cached responses")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL,
+                        help="Seconds a cached response stays valid")
+    parser.add_argument("--no-single-flight", action="store_true",
+                        default=not SINGLE_FLIGHT,
+                        help="Run every request, even identical ones in "
+                             "flight at the same time (default: "
+                             "$SINGLE_FLIGHT=0)")
+    parser.add_argument("--batch-window-ms", type=float,
+                        default=MICRO_BATCH_WINDOW_MS,
+                        help="Milliseconds the queries of concurrent requests "
+                             "are collected into one Redis pipeline, 0 "
+                             "disables micro-batching (default: "
+                             "$MICRO_BATCH_WINDOW_MS or 0)")
+    parser.add_argument("--batch-max", type=int, default=MICRO_BATCH_MAX,
+                        help="Queries that send a micro-batch before its "
+                             "window ends")
+    parser.add_argument("--metrics-host", default=METRICS_HOST,
+                        help="Address of the Prometheus metrics endpoint")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                        help="Port of the metrics endpoint, 0 disables it")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="Server processes sharing the port, 0 for one "
+                             "per CPU (default: $SERVER_WORKERS or 1)")
+    parser.add_argument("--grace", type=float, default=SHUTDOWN_GRACE,
+                        help="Seconds calls in flight may take to finish "
+                             "on shutdown")
+    args = parser.parse_args()
+    options = dict(
         redis_host=REDIS_HOST,
         redis_port=REDIS_PORT,
-        redis_password=REDIS_PASSWORD
+        redis_password=REDIS_PASSWORD,
+        backend=args.backend,
+        data_path=args.data_file,
+        port=args.port,
+        cache_entries=args.cache_entries,
+        cache_bytes=args.cache_bytes,
+        cache_ttl=args.cache_ttl,
+        metrics_host=args.metrics_host,
+        metrics_port=args.metrics_port,
+        grace=args.grace,
+        single_flight=not args.no_single_flight,
+        batch_window_ms=args.batch_window_ms,
+        batch_max=args.batch_max
     )
+    workers = args.workers or os.cpu_count()
+    if workers > 1:
+        serve_workers(workers, args.mode, **options)
+    elif args.mode == "async":
+        asyncio.run(serve_async(**options))
+    else:
+        serve(**options)
 
 
 
@@ -0,0 +1,191 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: An HDR-style latency histogram. Values are counted in
+#              log-linear buckets, so any value from nanoseconds to minutes
+#              is recorded in constant time and memory with a bounded
+#              relative error (under 1% with the default 2 significant
+#              digits), and histograms from several runs or threads can be
+#              merged exactly.
+
+import math
+import threading
+from typing import Dict, Iterator, Tuple
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    def __init__(self, significant_digits: int = 2):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            significant_digits: Decimal digits of precision kept for every
+                                recorded value (1 to 5)
+        """
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        self.significant_digits = significant_digits
+        # Each power-of-two range is split in sub_bucket_half linear buckets
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10**significant_digits))
+        self.sub_bucket_half = 1 << (self.sub_bucket_bits - 1)
+
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def _index(self, value: int) -> int:
+        """Return the bucket index of a value."""
+        shift = max(0, value.bit_length() - self.sub_bucket_bits)
+        return (shift << (self.sub_bucket_bits - 1)) + (value >> shift)
+
+    def _bucket_range(self, index: int) -> Tuple[int, int]:
+        """Return the lowest and highest values counted in a bucket."""
+        shift = max(0, (index >> (self.sub_bucket_bits - 1)) - 1)
+        sub_bucket = index - (shift << (self.sub_bucket_bits - 1))
+        lowest = sub_bucket << shift
+        return lowest, lowest + (1 << shift) - 1
+
+    def record(self, value: int, count: int = 1):
+        """
+        Record a value (e.g. a latency in nanoseconds).
+
+        Args:
+            value: Non-negative integer value
+            count: Number of times the value occurred
+        """
+        value = int(value)
+        if value < 0:
+            raise ValueError("Cannot record a negative value")
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + count
+            self.total_count += count
+            self.total += value * count
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def record_corrected(self, value: int, expected_interval: int):
+        """
+        Record a value and correct it for coordinated omission.
+
+        When a closed-loop caller waits for a slow response, the requests it
+        should have sent in the meantime are never measured. As in
+        HdrHistogram, the missing samples are back-filled with the
+        latencies they would have seen: value - interval, value - 2 *
+        interval, ... down to expected_interval.
+
+        Args:
+            value: Measured value
+            expected_interval: Expected interval between two requests
+        """
+        self.record(value)
+        if expected_interval <= 0:
+            return
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            self.record(missing)
+            missing -= expected_interval
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add the counts of another histogram with the same precision."""
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms of different precision")
+        with self._lock:
+            for index, count in other.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.total_count += other.total_count
+            self.total += other.total
+            if other.min is not None:
+                self.min = other.min if self.min is None else min(self.min,
+                                                                  other.min)
+                self.max = other.max if self.max is None else max(self.max,
+                                                                  other.max)
+
+    def buckets(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (lowest value, highest value, count) in value order."""
+        for index in sorted(self.counts):
+            lowest, highest = self._bucket_range(index)
+            yield lowest, highest, self.counts[index]
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Return the value at a percentile.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Highest value equivalent to the bucket holding the percentile,
+            capped at the maximum recorded value (0 if empty)
+        """
+        if not self.total_count:
+            return 0
+        return self.value_at_rank(
+            max(1, math.ceil(self.total_count * percentile / 100)))
+
+    def value_at_rank(self, rank: int) -> int:
+        """
+        Return the rank-th smallest recorded value (1-based).
+
+        Like percentile, the highest value equivalent to its bucket, capped
+        at the maximum recorded value (0 if empty).
+        """
+        if not self.total_count:
+            return 0
+        seen = 0
+        for _, highest, count in self.buckets():
+            seen += count
+            if seen >= rank:
+                return min(highest, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the recorded values."""
+        return self.total / self.total_count if self.total_count else 0.0
+
+    def summary(self, scale: float = 1e-6) -> Dict[str, float]:
+        """
+        Return count, mean, min, max and the usual percentiles.
+
+        Args:
+            scale: Factor applied to the values, by default nanoseconds to
+                   milliseconds
+        """
+        summary = {
+            'count': self.total_count,
+            'mean': self.mean * scale,
+            'min': (self.min or 0) * scale,
+            'max': (self.max or 0) * scale,
+        }
+        for percentile in PERCENTILES:
+            summary[f"p{percentile:g}"] = self.percentile(percentile) * scale
+        return summary
+
+    def to_dict(self) -> Dict:
+        """Return a JSON serializable representation of the histogram."""
+        return {
+            'significant_digits': self.significant_digits,
+            'total_count': self.total_count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': [[lowest, count] for lowest, _, count in self.buckets()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        """Rebuild a histogram written by to_dict."""
+        histogram = cls(data['significant_digits'])
+        for lowest, count in data['buckets']:
+            histogram.counts[histogram._index(lowest)] = count
+        histogram.total_count = data['total_count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
@@ -0,0 +1,324 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Open-loop load generator for the Nobel Prize gRPC service.
+#              Requests are scheduled at a fixed rate whatever the response
+#              times, and each latency is measured from the request's
+#              scheduled start, so queueing behind slow responses is counted
+#              (no coordinated omission). Latencies are recorded in HDR-style
+#              histograms per RPC and written as JSON.
+#
+# Example (against a local server started by the script):
+#   python3 nobel_prize_load_generator.py --start-server snapshot \
+#       --qps 500 --concurrency 32 --duration 30 --output run.json
+
+import argparse
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import grpc
+import nobel_prize_pb2
+import nobel_prize_pb2_grpc
+from nobel_prize_histogram import LatencyHistogram
+from nobel_prize_rediscloud_setup import filter_prize_by_year
+from nobel_prize_snapshot import DATA_PATH
+
+# Constants
+CATEGORIES = ["physics", "chemistry", "peace", "medicine", "literature",
+              "economics"]
+KEYWORDS = ["discovery", "peace", "development", "quantum", "theory",
+            "protein", "the", "for their", "xyzzy"]
+DEFAULT_MIX = "category_year=1,motivation_keyword=1,laureate_name=1"
+SERVER_SCRIPT = os.path.join(os.path.dirname(__file__),
+                             'nobel_prize_grpc_server.py')
+
+
+class QueryMix:
+    def __init__(self, weights: Dict[str, float], data_path: str = DATA_PATH,
+                 seed: int = None):
+        """
+        Initialize a weighted random mix of the three queries.
+
+        Args:
+            weights: Relative weight of each query kind ('category_year',
+                     'motivation_keyword', 'laureate_name')
+            data_path: Prize data file the laureate names are drawn from
+            seed: Random seed, for reproducible runs
+        """
+        unknown = set(weights) - {'category_year', 'motivation_keyword',
+                                  'laureate_name'}
+        if unknown:
+            raise ValueError(f"Unknown query kinds: {sorted(unknown)}")
+        self.kinds = [kind for kind, weight in weights.items() if weight > 0]
+        self.weights = [weights[kind] for kind in self.kinds]
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        with open(data_path, 'r', encoding='utf-8') as file:
+            prizes = filter_prize_by_year(json.load(file), 2013, 2023)
+        self.names = [(laureate['firstname'], laureate['surname'])
+                      for prize in prizes
+                      for laureate in prize.get('laureates', [])
+                      if laureate.get('surname')]
+        # A few misses, as typed by real users
+        self.names += [("Jane", "Doe"), ("Albert", "Einstein")]
+
+    def next(self) -> Tuple[str, object]:
+        """Return the kind and request message of the next query."""
+        with self._lock:
+            kind = self.random.choices(self.kinds, self.weights)[0]
+            if kind == 'category_year':
+                start_year = self.random.randint(2013, 2023)
+                return kind, nobel_prize_pb2.CategoryYearRequest(
+                    category=self.random.choice(CATEGORIES),
+                    start_year=start_year,
+                    end_year=self.random.randint(start_year, 2023))
+            if kind == 'motivation_keyword':
+                return kind, nobel_prize_pb2.MotivationKeywordRequest(
+                    keyword=self.random.choice(KEYWORDS))
+            firstname, surname = self.random.choice(self.names)
+            return kind, nobel_prize_pb2.LaureateNameRequest(
+                firstname=firstname, surname=surname)
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse a « kind=weight,kind=weight » query mix."""
+    weights = {}
+    for item in mix.split(','):
+        kind, _, weight = item.partition('=')
+        weights[kind.strip()] = float(weight or 1)
+    return weights
+
+
+class LoadGenerator:
+    def __init__(self,
+                 stubs: List[nobel_prize_pb2_grpc.NobelPrizeServiceStub],
+                 mix: QueryMix, qps: float, concurrency: int,
+                 timeout: float = 10.0):
+        """
+        Initialize the generator.
+
+        Args:
+            stubs: gRPC stubs of the service under test, one per channel.
+                   Workers are spread over them, so that a server with
+                   several processes sharing its port receives several
+                   connections
+            mix: Query mix to draw requests from
+            qps: Target request rate
+            concurrency: Maximum number of requests in flight
+            timeout: Deadline of every RPC in seconds
+        """
+        self.stubs = stubs
+        self.mix = mix
+        self.qps = qps
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.channel_rpcs = [
+            {
+                'category_year': stub.CountLaureatesByCategoryAndYears,
+                'motivation_keyword': stub.CountLaureatesByMotivationKeyword,
+                'laureate_name': stub.GetLaureateDetailsByName,
+            }
+            for stub in stubs
+        ]
+        self.rpcs = self.channel_rpcs[0]
+
+    def run(self, duration: float) -> Dict:
+        """
+        Send requests at the target rate for a duration.
+
+        Request i is scheduled at start + i / qps. A worker picks the next
+        slot as soon as it is free and sleeps until the slot is due; if all
+        workers are busy the slot is late, and the wait is part of the
+        recorded latency.
+
+        Returns:
+            Histograms and error counts per query kind
+        """
+        interval = int(1e9 / self.qps)
+        start = time.perf_counter_ns() + 10_000_000
+        end = start + int(duration * 1e9)
+        slots = itertools.count()
+        slot_lock = threading.Lock()
+
+        latency = {kind: LatencyHistogram() for kind in self.rpcs}
+        service_time = {kind: LatencyHistogram() for kind in self.rpcs}
+        errors: Dict[str, Dict[str, int]] = {kind: {} for kind in self.rpcs}
+        error_lock = threading.Lock()
+
+        def worker(rpcs):
+            while True:
+                with slot_lock:
+                    scheduled = start + next(slots) * interval
+                if scheduled >= end:
+                    return
+                delay = scheduled - time.perf_counter_ns()
+                if delay > 0:
+                    time.sleep(delay / 1e9)
+                kind, request = self.mix.next()
+                sent = time.perf_counter_ns()
+                try:
+                    rpcs[kind](request, timeout=self.timeout)
+                except grpc.RpcError as e:
+                    with error_lock:
+                        code = e.code().name
+                        errors[kind][code] = errors[kind].get(code, 0) + 1
+                done = time.perf_counter_ns()
+                latency[kind].record(done - scheduled)
+                service_time[kind].record(done - sent)
+
+        workers = [
+            threading.Thread(target=worker, daemon=True, args=(
+                self.channel_rpcs[index % len(self.channel_rpcs)],))
+            for index in range(self.concurrency)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+
+        return {
+            'elapsed': elapsed,
+            'latency': latency,
+            'service_time': service_time,
+            'errors': errors,
+        }
+
+
+def report(config: Dict, result: Dict) -> Dict:
+    """Build the machine-readable report of a measured run."""
+    overall = LatencyHistogram()
+    rpcs = {}
+    for kind, histogram in result['latency'].items():
+        overall.merge(histogram)
+        rpcs[kind] = {
+            'latency_ms': histogram.summary(),
+            'service_time_ms': result['service_time'][kind].summary(),
+            'errors': result['errors'][kind],
+            'latency_histogram_ns': histogram.to_dict(),
+        }
+    requests = overall.total_count
+    return {
+        'config': config,
+        'finished_at': datetime.now(timezone.utc).isoformat(),
+        'elapsed_s': result['elapsed'],
+        'requests': requests,
+        'errors': sum(sum(codes.values())
+                      for codes in result['errors'].values()),
+        'throughput_qps': requests / result['elapsed'],
+        'latency_ms': overall.summary(),
+        'latency_histogram_ns': overall.to_dict(),
+        'rpcs': rpcs,
+    }
+
+
+def print_report(data: Dict):
+    """Print the percentiles of a report."""
+    print(f"\n{data['requests']} requests in {data['elapsed_s']:.1f} s "
+          f"({data['throughput_qps']:.1f} req/s, {data['errors']} errors)")
+    print(f"{'rpc':20} {'count':>8} {'p50':>9} {'p90':>9} {'p99':>9} "
+          f"{'p99.9':>9} {'max':>9}  (ms)")
+    rows: List[Tuple[str, Dict]] = [(kind, rpc['latency_ms'])
+                                    for kind, rpc in data['rpcs'].items()]
+    rows.append(('all', data['latency_ms']))
+    for name, summary in rows:
+        print(f"{name:20} {summary['count']:>8} {summary['p50']:>9.3f} "
+              f"{summary['p90']:>9.3f} {summary['p99']:>9.3f} "
+              f"{summary['p99.9']:>9.3f} {summary['max']:>9.3f}")
+
+
+def start_server(backend: str, target: str, timeout: float = 30.0,
+                 workers: int = 1) -> subprocess.Popen:
+    """
+    Start a local gRPC server on the port of target and wait until it
+    accepts connections.
+    """
+    port = target.rsplit(':', 1)[1]
+    server = subprocess.Popen([sys.executable, SERVER_SCRIPT,
+                               '--backend', backend,
+                               '--port', port,
+                               '--workers', str(workers)],
+                              cwd=os.path.dirname(SERVER_SCRIPT) or None)
+    channel = grpc.insecure_channel(target)
+    try:
+        grpc.channel_ready_future(channel).result(timeout=timeout)
+    except grpc.FutureTimeoutError:
+        server.kill()
+        raise RuntimeError(f"Server did not start on {target}")
+    finally:
+        channel.close()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Open-loop load generator for the Nobel Prize service")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument("--qps", type=float, default=100.0,
+                        help="Target request rate")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Maximum number of requests in flight")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0,
+                        help="Seconds of unmeasured load before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="Weighted query mix, e.g. "
+                             "category_year=3,motivation_keyword=1")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="load_results.json",
+                        help="JSON file the report is written to")
+    parser.add_argument("--label", default="",
+                        help="Free-form name of the run in the report")
+    parser.add_argument("--start-server", choices=("redis", "snapshot"),
+                        help="Start a local server with this backend first")
+    parser.add_argument("--server-workers", type=int, default=1,
+                        help="Worker processes of the started server")
+    parser.add_argument("--channels", type=int, default=1,
+                        help="gRPC channels, each with its own connection")
+    args = parser.parse_args()
+
+    target = f"{args.host}:{args.port}"
+    server = start_server(args.start_server, target,
+                          workers=args.server_workers) \
+        if args.start_server else None
+    try:
+        # A local subchannel pool gives every channel its own connection
+        channels = [grpc.insecure_channel(
+            target, options=[('grpc.use_local_subchannel_pool', 1)])
+            for _ in range(args.channels)]
+        stubs = [nobel_prize_pb2_grpc.NobelPrizeServiceStub(channel)
+                 for channel in channels]
+        mix = QueryMix(parse_mix(args.mix), seed=args.seed)
+        generator = LoadGenerator(stubs, mix, args.qps, args.concurrency)
+
+        if args.warmup > 0:
+            print(f"Warming up for {args.warmup:g} s...")
+            generator.run(args.warmup)
+        print(f"Measuring {args.qps:g} req/s for {args.duration:g} s...")
+        result = generator.run(args.duration)
+
+        config = {key: value for key, value in vars(args).items()
+                  if key != 'output'}
+        config['target'] = target
+        data = report(config, result)
+        with open(args.output, 'w') as file:
+            json.dump(data, file, indent=2)
+        print_report(data)
+        print(f"\nReport written to {args.output}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Server-side instrumentation of the gRPC service. A server
+#              interceptor records per-RPC latency histograms, in-flight
+#              counts and status codes, and the time every request spent
+#              waiting on Redis, per command, versus in Python. The metrics
+#              are served in the Prometheus text format over HTTP.
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import grpc
+from nobel_prize_histogram import LatencyHistogram
+
+# Prometheus histogram buckets, in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Redis time of the current request: command -> [calls, nanoseconds]
+_redis_time: contextvars.ContextVar[Optional[Dict[str, List[int]]]] = \
+    contextvars.ContextVar('redis_time', default=None)
+
+
+@contextmanager
+def redis_timer(command: str):
+    """
+    Time a Redis call made while serving a request.
+
+    The time is added to the request being served by the current thread or
+    asyncio task; outside of a request the call is not recorded.
+
+    Args:
+        command: Redis command name, e.g. 'FT.SEARCH' or 'PIPELINE'
+    """
+    timings = _redis_time.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        entry = timings.setdefault(command, [0, 0])
+        entry[0] += 1
+        entry[1] += time.perf_counter_ns() - start
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+class Metrics:
+    def __init__(self):
+        """Initialize empty per-method metrics."""
+        self._lock = threading.Lock()
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.redis_latency: Dict[str, LatencyHistogram] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.codes: Dict[Tuple[str, str], int] = {}
+        # (method, command) -> [calls, nanoseconds]
+        self.redis_commands: Dict[Tuple[str, str], List[int]] = {}
+        self.python_time: Dict[str, int] = {}
+        self._collectors: List[Tuple[str, Callable[[], Dict[str, int]]]] = []
+
+    def register_counters(self, prefix: str,
+                          collect: Callable[[], Dict[str, int]]):
+        """
+        Export counters owned by another component.
+
+        Args:
+            prefix: Metric name prefix, e.g. 'nobel_cache'
+            collect: Callable returning a name -> value dictionary
+        """
+        self._collectors.append((prefix, collect))
+
+    def start(self, method: str) -> Tuple[int, contextvars.Token]:
+        """Record the start of a request."""
+        with self._lock:
+            self.in_flight[method] = self.in_flight.get(method, 0) + 1
+        token = _redis_time.set({})
+        return time.perf_counter_ns(), token
+
+    def finish(self, method: str, started: Tuple[int, contextvars.Token],
+               code: grpc.StatusCode):
+        """Record the end of a request with its status code."""
+        start, token = started
+        elapsed = time.perf_counter_ns() - start
+        timings = _redis_time.get() or {}
+        _redis_time.reset(token)
+        redis_elapsed = sum(nanoseconds for _, nanoseconds in timings.values())
+
+        with self._lock:
+            self.in_flight[method] -= 1
+            key = (method, code.name)
+            self.codes[key] = self.codes.get(key, 0) + 1
+            if method not in self.latency:
+                self.latency[method] = LatencyHistogram()
+                self.redis_latency[method] = LatencyHistogram()
+            for command, (calls, nanoseconds) in timings.items():
+                entry = self.redis_commands.setdefault((method, command),
+                                                       [0, 0])
+                entry[0] += calls
+                entry[1] += nanoseconds
+            self.python_time[method] = (self.python_time.get(method, 0) +
+                                        max(0, elapsed - redis_elapsed))
+        self.latency[method].record(elapsed)
+        self.redis_latency[method].record(redis_elapsed)
+
+    def _histogram_lines(self, name: str, method: str,
+                         histogram: LatencyHistogram) -> List[str]:
+        """Render a nanosecond histogram as a Prometheus histogram."""
+        lines = []
+        cumulative = 0
+        buckets = list(histogram.buckets())
+        position = 0
+        for bound in BUCKETS:
+            limit = bound * 1e9
+            while position < len(buckets) and buckets[position][1] <= limit:
+                cumulative += buckets[position][2]
+                position += 1
+            lines.append(f'{name}_bucket{{{_labels(method=method, le=bound)}}}'
+                         f' {cumulative}')
+        lines.append(f'{name}_bucket{{{_labels(method=method, le="+Inf")}}}'
+                     f' {histogram.total_count}')
+        lines.append(f'{name}_sum{{{_labels(method=method)}}} '
+                     f'{histogram.total / 1e9}')
+        lines.append(f'{name}_count{{{_labels(method=method)}}} '
+                     f'{histogram.total_count}')
+        return lines
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                "# HELP nobel_rpc_requests_total RPCs handled by status code.",
+                "# TYPE nobel_rpc_requests_total counter",
+            ]
+            for (method, code), count in sorted(self.codes.items()):
+                lines.append(f'nobel_rpc_requests_total'
+                             f'{{{_labels(method=method, code=code)}}} {count}')
+
+            lines += [
+                "# HELP nobel_rpc_in_flight RPCs currently being handled.",
+                "# TYPE nobel_rpc_in_flight gauge",
+            ]
+            for method, count in sorted(self.in_flight.items()):
+                lines.append(f'nobel_rpc_in_flight{{{_labels(method=method)}}}'
+                             f' {count}')
+
+            lines += [
+                "# HELP nobel_rpc_latency_seconds RPC handling time.",
+                "# TYPE nobel_rpc_latency_seconds histogram",
+            ]
+            for method, histogram in sorted(self.latency.items()):
+                lines += self._histogram_lines('nobel_rpc_latency_seconds',
+                                               method, histogram)
+
+            lines += [
+                "# HELP nobel_rpc_redis_seconds Time an RPC waited on Redis.",
+                "# TYPE nobel_rpc_redis_seconds histogram",
+            ]
+            for method, histogram in sorted(self.redis_latency.items()):
+                lines += self._histogram_lines('nobel_rpc_redis_seconds',
+                                               method, histogram)
+
+            lines += [
+                "# HELP nobel_redis_command_seconds_total Time spent in "
+                "Redis calls by command.",
+                "# TYPE nobel_redis_command_seconds_total counter",
+            ]
+            for (method, command), (_, nanoseconds) in sorted(
+                    self.redis_commands.items()):
+                lines.append(f'nobel_redis_command_seconds_total'
+                             f'{{{_labels(method=method, command=command)}}} '
+                             f'{nanoseconds / 1e9}')
+
+            lines += [
+                "# HELP nobel_redis_commands_total Redis calls by command.",
+                "# TYPE nobel_redis_commands_total counter",
+            ]
+            for (method, command), (calls, _) in sorted(
+                    self.redis_commands.items()):
+                lines.append(f'nobel_redis_commands_total'
+                             f'{{{_labels(method=method, command=command)}}} '
+                             f'{calls}')
+
+            lines += [
+                "# HELP nobel_rpc_python_seconds_total Time spent outside "
+                "Redis calls.",
+                "# TYPE nobel_rpc_python_seconds_total counter",
+            ]
+            for method, nanoseconds in sorted(self.python_time.items()):
+                lines.append(f'nobel_rpc_python_seconds_total'
+                             f'{{{_labels(method=method)}}} {nanoseconds / 1e9}')
+
+        for prefix, collect in self._collectors:
+            for name, value in collect().items():
+                lines.append(f"# TYPE {prefix}_{name} untyped")
+                lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _method_name(handler_call_details) -> str:
+    """Return the short RPC name of a call, e.g. 'BatchQuery'."""
+    return handler_call_details.method.rsplit('/', 1)[-1]
+
+
+def _status(context, default: grpc.StatusCode) -> grpc.StatusCode:
+    """Return the status code a handler set on its context."""
+    try:
+        code = context.code()
+    except (AttributeError, NotImplementedError):
+        code = None
+    if isinstance(code, int):
+        code = next((status for status in grpc.StatusCode
+                     if status.value[0] == code), None)
+    return code or default
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    def __init__(self, metrics: Metrics):
+        """Record every RPC of a threaded gRPC server in metrics."""
+        self.metrics = metrics
+
+    def _wrap_unary(self, behavior, method: str):
+        metrics = self.metrics
+
+        def wrapper(request_or_iterator, context):
+            started = metrics.start(method)
+            code = grpc.StatusCode.UNKNOWN
+            try:
+                response = behavior(request_or_iterator, context)
+                code = _status(context, grpc.StatusCode.OK)
+                return response
+            except Exception:
+                code = _status(context, grpc.StatusCode.UNKNOWN)
+                raise
+            finally:
+                metrics.finish(method, started, code)
+        return wrapper
+
+    def _wrap_stream(self, behavior, method: str):
+        metrics = self.metrics
+
+        def wrapper(request_or_iterator, context):
+            started = metrics.start(method)
+            code = grpc.StatusCode.UNKNOWN
+            try:
+                yield from behavior(request_or_iterator, context)
+                code = _status(context, grpc.StatusCode.OK)
+            except Exception:
+                code = _status(context, grpc.StatusCode.UNKNOWN)
+                raise
+            finally:
+                metrics.finish(method, started, code)
+        return wrapper
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = _method_name(handler_call_details)
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary(handler.unary_unary, method),
+                handler.request_deserializer, handler.response_serializer)
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(
+                self._wrap_unary(handler.stream_unary, method),
+                handler.request_deserializer, handler.response_serializer)
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(
+                self._wrap_stream(handler.unary_stream, method),
+                handler.request_deserializer, handler.response_serializer)
+        return grpc.stream_stream_rpc_method_handler(
+            self._wrap_stream(handler.stream_stream, method),
+            handler.request_deserializer, handler.response_serializer)
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+    def __init__(self, metrics: Metrics):
+        """Record every RPC of a grpc.aio server in metrics."""
+        self.metrics = metrics
+
+    def _wrap_unary(self, behavior, method: str):
+        metrics = self.metrics
+
+        async def wrapper(request_or_iterator, context):
+            started = metrics.start(method)
+            code = grpc.StatusCode.UNKNOWN
+            try:
+                response = await behavior(request_or_iterator, context)
+                code = _status(context, grpc.StatusCode.OK)
+                return response
+            except BaseException:
+                code = _status(context, grpc.StatusCode.UNKNOWN)
+                raise
+            finally:
+                metrics.finish(method, started, code)
+        return wrapper
+
+    def _wrap_stream(self, behavior, method: str):
+        metrics = self.metrics
+
+        async def wrapper(request_or_iterator, context):
+            started = metrics.start(method)
+            code = grpc.StatusCode.UNKNOWN
+            try:
+                async for response in behavior(request_or_iterator, context):
+                    yield response
+                code = _status(context, grpc.StatusCode.OK)
+            except BaseException:
+                code = _status(context, grpc.StatusCode.UNKNOWN)
+                raise
+            finally:
+                metrics.finish(method, started, code)
+        return wrapper
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = _method_name(handler_call_details)
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary(handler.unary_unary, method),
+                handler.request_deserializer, handler.response_serializer)
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(
+                self._wrap_unary(handler.stream_unary, method),
+                handler.request_deserializer, handler.response_serializer)
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(
+                self._wrap_stream(handler.unary_stream, method),
+                handler.request_deserializer, handler.response_serializer)
+        return grpc.stream_stream_rpc_method_handler(
+            self._wrap_stream(handler.stream_stream, method),
+            handler.request_deserializer, handler.response_serializer)
+
+
+def start_metrics_server(metrics: Metrics, host: str = "127.0.0.1",
+                         port: int = 9100) -> ThreadingHTTPServer:
+    """
+    Serve the metrics at http://host:port/metrics from a daemon thread.
+
+    Returns:
+        The running HTTP server, stop it with shutdown()
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type',
+                             'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the server output
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,189 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Micro-batching of the queries of concurrent RPCs. Queries
+#              submitted by different handler threads (or coroutines) within
+#              a short window are answered together by one run_batch call of
+#              the backend, whose Redis commands go out as a single pipeline.
+#              Under high concurrency this replaces one round trip per
+#              request with one per batch, at the cost of at most one window
+#              of added latency.
+
+import asyncio
+import inspect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+# Loading variables from .env file
+load_dotenv()
+
+# Constants
+MICRO_BATCH_WINDOW_MS = float(os.getenv("MICRO_BATCH_WINDOW_MS", "0"))
+MICRO_BATCH_MAX = int(os.getenv("MICRO_BATCH_MAX", "64"))
+
+
+class _Slot:
+    """Result of one query of a batch, set once the batch has run."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
+
+class MicroBatcher:
+    def __init__(self, run_batch: Callable[[List[Tuple[str, tuple]]],
+                                           List[Any]],
+                 window: float = MICRO_BATCH_WINDOW_MS / 1000,
+                 max_batch: int = MICRO_BATCH_MAX):
+        """
+        Initialize a dispatcher batching the queries of threaded callers.
+
+        The first query submitted opens a batch and its caller runs it once
+        the window has passed, or as soon as max_batch queries have joined.
+        Queries submitted while a batch runs open the next one, so batches
+        run concurrently rather than queueing behind each other.
+
+        Args:
+            run_batch: Backend run_batch, taking (method, args) pairs and
+                       returning a result or exception per query
+            window: Seconds a batch stays open for more queries
+            max_batch: Queries that close a batch before the window ends
+        """
+        self.run_batch = run_batch
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._batch = None  # Batch open for new queries
+        self._cond = threading.Condition()
+        self.batches = 0
+        self.queries = 0
+        self.full_batches = 0
+        self.largest = 0
+
+    def _close(self, batch: list):
+        """Close a batch to new queries and count it."""
+        if self._batch is batch:
+            self._batch = None
+        self.batches += 1
+        self.queries += len(batch)
+        self.largest = max(self.largest, len(batch))
+        if len(batch) >= self.max_batch:
+            self.full_batches += 1
+
+    def _join(self, query: Tuple[str, tuple], slot) -> Tuple[list, bool]:
+        """Add a query to the open batch, returning it and if it was new."""
+        batch = self._batch
+        leader = batch is None
+        if leader:
+            batch = self._batch = []
+        batch.append((query, slot))
+        if len(batch) >= self.max_batch:
+            self._batch = None
+        return batch, leader
+
+    def submit(self, method: str, args: tuple):
+        """
+        Run one query as part of a batch and return its result.
+
+        Args:
+            method: Name of the backend query method
+            args: Arguments of the query method
+
+        Returns:
+            The query result; an exception raised for this query alone is
+            re-raised
+        """
+        slot = _Slot()
+        with self._cond:
+            batch, leader = self._join((method, args), slot)
+            if self._batch is not batch:
+                self._cond.notify_all()  # The batch is full
+
+        if leader:
+            with self._cond:
+                deadline = time.monotonic() + self.window
+                while self._batch is batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._close(batch)
+            self._run(batch)
+        else:
+            slot.done.wait()
+
+        if isinstance(slot.value, Exception):
+            raise slot.value
+        return slot.value
+
+    def _run(self, batch: list):
+        queries = [query for query, _ in batch]
+        try:
+            results = self.run_batch(queries)
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, slot), result in zip(batch, results):
+            slot.value = result
+            slot.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the batch counters."""
+        with self._cond:
+            return {
+                'batches_total': self.batches,
+                'queries_total': self.queries,
+                'full_batches_total': self.full_batches,
+                'largest_batch': self.largest,
+            }
+
+
+class AsyncMicroBatcher(MicroBatcher):
+    """
+    MicroBatcher for coroutines of one event loop.
+
+    Every batch is run by its own task, so a cancelled RPC never holds up
+    the other queries of its batch. run_batch may be a coroutine function
+    or a plain function, such as the snapshot backend's.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._full: Dict[int, asyncio.Event] = {}  # Batch id -> full event
+        self._tasks = set()  # Batch tasks, referenced until they finish
+
+    async def submit(self, method: str, args: tuple):
+        """Run one query as part of a batch and await its result."""
+        future = asyncio.get_running_loop().create_future()
+        batch, leader = self._join((method, args), future)
+        if leader:
+            full = asyncio.Event()
+            batch_task = asyncio.ensure_future(self._flush(batch, full))
+            self._tasks.add(batch_task)
+            batch_task.add_done_callback(self._tasks.discard)
+            self._full[id(batch)] = full
+        if self._batch is not batch:
+            self._full[id(batch)].set()
+        return await future
+
+    async def _flush(self, batch: list, full: asyncio.Event):
+        try:
+            await asyncio.wait_for(full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        del self._full[id(batch)]
+        self._close(batch)
+
+        queries = [query for query, _ in batch]
+        try:
+            results = self.run_batch(queries)
+            if inspect.isawaitable(results):
+                results = await results
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,228 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: A token-level inverted index over laureate motivations used to
+#              count laureates by motivation keyword without scanning the
+#              motivation texts on every request.
+#
+# Query syntax:
+#   word            laureates whose motivation contains the token « word »
+#   two words       laureates whose motivation contains the exact phrase
+#   quant*          laureates whose motivation has a token starting with
+#                   « quant » (the prefix may end a phrase: « quantum inf* »)
+
+import re
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+CACHE_SIZE = 4096
+SHINGLE_SIZES = (2, 3)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def pack_postings(laureates: FrozenSet[int]) -> bytes:
+    """Pack a set of laureate ids into the bytes of an array."""
+    return array('I', sorted(laureates)).tobytes()
+
+
+class PackedPostings(dict):
+    """Postings whose packed values are unpacked into sets on first access."""
+
+    def __getitem__(self, key) -> FrozenSet[int]:
+        laureates = super().__getitem__(key)
+        if isinstance(laureates, bytes):
+            laureates = frozenset(array('I', laureates))
+            self[key] = laureates
+        return laureates
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+class MotivationIndex:
+    def __init__(self, motivations: Iterable[str]):
+        """
+        Build the index from the motivation of every laureate.
+
+        Args:
+            motivations: Motivation texts; the position of a text in the
+                         iterable is the laureate id stored in the postings
+        """
+        positions: Dict[str, Dict[int, List[int]]] = {}
+        shingles: Dict[Tuple[str, ...], set] = {}
+        for laureate, motivation in enumerate(motivations):
+            tokens = tokenize(motivation)
+            for position, token in enumerate(tokens):
+                positions.setdefault(token, {}).setdefault(
+                    laureate, []).append(position)
+            for size in SHINGLE_SIZES:
+                for start in range(len(tokens) - size + 1):
+                    shingles.setdefault(tuple(tokens[start:start + size]),
+                                        set()).add(laureate)
+
+        # Postings: token -> laureates, token -> laureate -> positions
+        self.postings: Dict[str, FrozenSet[int]] = {
+            token: frozenset(laureates)
+            for token, laureates in positions.items()
+        }
+        self.positions: Dict[str, Dict[int, Tuple[int, ...]]] = {
+            token: {laureate: tuple(offsets)
+                    for laureate, offsets in laureates.items()}
+            for token, laureates in positions.items()
+        }
+        # Shingles: runs of consecutive tokens -> laureates
+        self.shingles: Dict[Tuple[str, ...], FrozenSet[int]] = {
+            shingle: frozenset(laureates)
+            for shingle, laureates in shingles.items()
+        }
+        self.vocabulary: List[str] = sorted(self.postings)
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        """Return the indexed tokens starting with a prefix."""
+        start = bisect_left(self.vocabulary, prefix)
+        end = start
+        while (end < len(self.vocabulary) and
+               self.vocabulary[end].startswith(prefix)):
+            end += 1
+        return self.vocabulary[start:end]
+
+    def _prefix_laureates(self, prefix: str) -> FrozenSet[int]:
+        """Return the laureates with a token starting with a prefix."""
+        tokens = self._prefix_tokens(prefix)
+        if len(tokens) == 1:
+            return self.postings[tokens[0]]
+        return frozenset().union(*(self.postings[token] for token in tokens))
+
+    def _shingle_laureates(self, tokens: List[str]) -> FrozenSet[int]:
+        """Intersect the shingle postings covering consecutive tokens."""
+        size = min(len(tokens), SHINGLE_SIZES[-1])
+        candidates = None
+        for start in range(len(tokens) - size + 1):
+            laureates = self.shingles.get(tuple(tokens[start:start + size]),
+                                          frozenset())
+            candidates = (laureates if candidates is None
+                          else candidates & laureates)
+            if not candidates:
+                break
+        return candidates
+
+    def _phrase_laureates(self, tokens: List[str],
+                          prefix: bool) -> FrozenSet[int]:
+        """
+        Return the laureates whose motivation contains a phrase.
+
+        Candidates come from intersecting the postings of the two and three
+        token shingles covering the phrase, which is exact for phrases of up
+        to three tokens. Longer phrases are then verified on token positions,
+        only for the remaining candidates.
+        """
+        exact = tokens[:-1] if prefix else tokens
+        if len(exact) == 1:
+            candidates = self.postings.get(exact[0], frozenset())
+        else:
+            candidates = self._shingle_laureates(exact)
+
+        if prefix and candidates:
+            head = tuple(exact[1 - SHINGLE_SIZES[-1]:])
+            candidates = candidates & frozenset().union(*(
+                self.shingles.get(head + (token,), frozenset())
+                for token in self._prefix_tokens(tokens[-1])
+            ))
+
+        if len(tokens) <= SHINGLE_SIZES[-1]:
+            return candidates
+        return frozenset(
+            laureate for laureate in candidates
+            if self._contains_phrase(laureate, tokens, prefix)
+        )
+
+    def _contains_phrase(self, laureate: int, tokens: List[str],
+                         prefix: bool) -> bool:
+        """Check the token positions of one laureate for a phrase."""
+        exact = tokens[:-1] if prefix else tokens
+        starts = set(self.positions[exact[0]][laureate])
+        for offset, token in enumerate(exact[1:], 1):
+            starts &= {position - offset
+                       for position in self.positions[token][laureate]}
+            if not starts:
+                return False
+        if not prefix:
+            return True
+        last = len(exact)
+        return any(
+            position - last in starts
+            for token in self._prefix_tokens(tokens[-1])
+            for position in self.positions[token].get(laureate, ())
+        )
+
+    def search(self, query: str) -> FrozenSet[int]:
+        """
+        Return the ids of the laureates matching a query.
+
+        Args:
+            query: Word, phrase or prefix (trailing '*') query
+
+        Returns:
+            Set of laureate ids
+        """
+        prefix = query.rstrip().endswith('*')
+        tokens = tokenize(query)
+        if not tokens:
+            return frozenset()
+        if len(tokens) == 1:
+            if prefix:
+                return self._prefix_laureates(tokens[0])
+            return self.postings.get(tokens[0], frozenset())
+        return self._phrase_laureates(tokens, prefix)
+
+    def count(self, query: str) -> int:
+        """Return the number of laureates matching a query."""
+        return len(self.search(query))
+
+    def __getstate__(self) -> Dict:
+        """
+        Return the index in a compact form, e.g. for pickling.
+
+        Postings are stored as packed arrays of laureate ids, which load much
+        faster than sets; they become sets again on first use.
+        """
+        return {
+            'postings': {token: pack_postings(laureates)
+                         for token, laureates in self.postings.items()},
+            'positions': self.positions,
+            'shingles': {shingle: pack_postings(laureates)
+                         for shingle, laureates in self.shingles.items()},
+            'vocabulary': self.vocabulary,
+        }
+
+    def __setstate__(self, state: Dict):
+        """Restore an index saved by __getstate__."""
+        self.postings = PackedPostings(state['postings'])
+        self.positions = state['positions']
+        self.shingles = PackedPostings(state['shingles'])
+        self.vocabulary = state['vocabulary']
+
+
+class CountCache:
+    def __init__(self, index: MotivationIndex, max_size: int = CACHE_SIZE):
+        """
+        Memoize the laureate counts of a motivation index.
+
+        The cache is kept out of MotivationIndex so that the index itself
+        can be measured, and the cache hit path separately.
+
+        Args:
+            index: Index answering the queries missing the cache
+            max_size: Queries kept, least recently used evicted first
+        """
+        self.index = index
+        self.count = lru_cache(maxsize=max_size)(index.count)
+
+    def __call__(self, query: str) -> int:
+        """Return the number of laureates matching a query."""
+        return self.count(query)
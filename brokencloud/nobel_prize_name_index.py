@@ -0,0 +1,93 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: A precomputed laureate name lookup index. Names are normalized
+#              (Unicode NFKD, accents stripped, casefolded) so that a lookup
+#              by first name and surname is a single key access.
+#              The index is written to Redis at ingest time by
+#              « nobel_prize_rediscloud_setup.py » and kept in memory by the
+#              snapshot backend.
+
+import unicodedata
+from typing import Dict, Iterable, List
+
+# Redis hash holding one field per normalized name
+NAME_INDEX_KEY = "prizeNames"
+# Redis hash of the same fields holding the names as stored, for display
+NAME_DISPLAY_KEY = "prizeNameDisplays"
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a name for accent and case insensitive comparison.
+
+    Args:
+        name: First name or surname as typed or stored
+
+    Returns:
+        Casefolded name without diacritics and with collapsed whitespace
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed
+                       if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def name_key(firstname: str, surname: str) -> str:
+    """Return the index key of a laureate's full name."""
+    return f"{normalize_name(firstname)}|{normalize_name(surname)}"
+
+
+def build_name_index(prizes: Iterable[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Map every laureate name to the details of the prizes they received.
+
+    Args:
+        prizes: Prize documents as stored in Redis
+
+    Returns:
+        Dictionary of name key -> list of year, category and motivation
+    """
+    index: Dict[str, List[Dict]] = {}
+    for prize in prizes:
+        for laureate in prize.get('laureates', []):
+            key = name_key(laureate.get('firstname', ''),
+                           laureate.get('surname', ''))
+            index.setdefault(key, []).append({
+                'year': int(prize['year']),
+                'category': prize['category'],
+                'motivation': laureate.get('motivation',
+                                           'No motivation provided')
+            })
+    return index
+
+
+def build_name_displays(prizes: Iterable[Dict]) -> Dict[str, List[str]]:
+    """
+    Map every laureate name key to the name as stored in the prizes.
+
+    Args:
+        prizes: Prize documents as stored in Redis
+
+    Returns:
+        Dictionary of name key -> [first name, surname], from the last
+        prize of the laureate
+    """
+    return {
+        name_key(laureate.get('firstname', ''),
+                 laureate.get('surname', '')): [
+            " ".join(laureate.get('firstname', '').split()),
+            " ".join(laureate.get('surname', '').split())
+        ]
+        for prize in prizes for laureate in prize.get('laureates', [])
+    }
+
+
+class NameIndex:
+    def __init__(self, prizes: Iterable[Dict]):
+        """Build the in-memory name index from prize documents."""
+        prizes = list(prizes)
+        self.index = build_name_index(prizes)
+        self.displays = build_name_displays(prizes)
+
+    def lookup(self, firstname: str, surname: str) -> List[Dict]:
+        """Return the prize details of a laureate, or an empty list."""
+        return list(self.index.get(name_key(firstname, surname), []))
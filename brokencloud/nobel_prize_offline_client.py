@@ -0,0 +1,180 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: An embedded, offline client answering the NobelPrizeCLI
+#              queries from a local data file, without Redis or a gRPC
+#              server. It loads either the prize JSON file or an index file
+#              prebuilt from it, which skips parsing and indexing at startup.
+#              Only the standard library and the index modules are imported,
+#              so a query from a shell script completes in tens of ms.
+#
+# Usage:
+#   python3 nobel_prize_offline_client.py                  (interactive CLI)
+#   python3 nobel_prize_offline_client.py build-index prize.idx
+#   python3 nobel_prize_offline_client.py --data-file prize.idx \
+#       category physics 2013 2023
+#   python3 nobel_prize_offline_client.py motivation "quantum"
+#   python3 nobel_prize_offline_client.py name Alain Aspect
+#   python3 nobel_prize_offline_client.py search "alian aspect"
+
+import argparse
+import json
+import marshal
+import os
+from array import array
+from typing import Dict
+
+from nobel_prize_cli import NobelPrizeCLI
+from nobel_prize_motivation_index import CountCache, MotivationIndex
+from nobel_prize_name_index import NameIndex
+from nobel_prize_trigram_index import SEARCH_LIMIT
+from nobel_prize_snapshot import (
+    DATA_PATH,
+    FROM_YEAR,
+    TO_YEAR,
+    NobelPrizeSnapshotClient
+)
+
+# Constants
+INDEX_MAGIC = b"NOBELIDX"
+INDEX_FORMAT = 2
+# Snapshot attributes stored in an index file
+ARRAY_FIELDS = ("years", "category_codes", "laureate_counts",
+                "laureate_offsets", "laureate_prizes", "motivation_offsets")
+PLAIN_FIELDS = ("version", "from_year", "to_year", "categories",
+                "category_index", "firstnames", "surnames", "motivation_text")
+
+
+def is_index_file(path: str) -> bool:
+    """Return True if a file is an index written by build_index."""
+    with open(path, 'rb') as file:
+        return file.read(len(INDEX_MAGIC)) == INDEX_MAGIC
+
+
+class NobelPrizeOfflineClient(NobelPrizeSnapshotClient):
+    def __init__(self, data_path: str = DATA_PATH, from_year: int = FROM_YEAR,
+                 to_year: int = TO_YEAR):
+        """
+        Load the prize data from a JSON file or a prebuilt index file.
+
+        Args:
+            data_path: Prize JSON file, or index file written by build_index
+                       (its own year range then applies)
+            from_year, to_year: Year range kept from a JSON file
+        """
+        if is_index_file(data_path):
+            self._load_index(data_path)
+        else:
+            super().__init__(data_path, from_year, to_year)
+
+    def _load_index(self, index_path: str):
+        """Restore the snapshot state saved by save_index."""
+        with open(index_path, 'rb') as file:
+            data = file.read()
+        # marshal.loads on the whole buffer is far faster than marshal.load
+        state = marshal.loads(memoryview(data)[len(INDEX_MAGIC):])
+        if state.get('format') != INDEX_FORMAT:
+            raise ValueError(f"{index_path}: unsupported index format, "
+                             "rebuild it with build-index")
+
+        for field in PLAIN_FIELDS:
+            setattr(self, field, state[field])
+        for field in ARRAY_FIELDS:
+            typecode, packed = state[field]
+            setattr(self, field, array(typecode, packed))
+        self.prefix_sums = [array('I', table)
+                            for table in state['prefix_sums']]
+
+        self.motivation_index = MotivationIndex.__new__(MotivationIndex)
+        self.motivation_index.__setstate__(state['motivation_index'])
+        self.motivation_counts = CountCache(self.motivation_index)
+        self.name_index = NameIndex.__new__(NameIndex)
+        self.name_index.index = state['name_index']
+        self.name_index.displays = state['name_displays']
+
+    def save_index(self, index_path: str):
+        """
+        Write the loaded snapshot and its indexes to an index file.
+
+        The file is written with marshal, so it can only be read by the
+        Python version that wrote it; rebuild it after upgrading.
+        """
+        state: Dict = {'format': INDEX_FORMAT}
+        for field in PLAIN_FIELDS:
+            state[field] = getattr(self, field)
+        for field in ARRAY_FIELDS:
+            column = getattr(self, field)
+            state[field] = (column.typecode, column.tobytes())
+        state['prefix_sums'] = [table.tobytes() for table in self.prefix_sums]
+        state['motivation_index'] = self.motivation_index.__getstate__()
+        state['name_index'] = self.name_index.index
+        state['name_displays'] = self.name_index.displays
+
+        temporary_path = f"{index_path}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(INDEX_MAGIC)
+            marshal.dump(state, file)
+        os.replace(temporary_path, index_path)
+
+
+def build_index(data_path: str, index_path: str, from_year: int = FROM_YEAR,
+                to_year: int = TO_YEAR):
+    """Build an index file from a prize JSON file."""
+    NobelPrizeOfflineClient(data_path, from_year, to_year).save_index(
+        index_path)
+
+
+def main():
+    """Main entry point of the application."""
+    parser = argparse.ArgumentParser(
+        description="Query the Nobel prize data offline")
+    parser.add_argument("--data-file", default=DATA_PATH,
+                        help="Prize JSON file or prebuilt index file")
+    commands = parser.add_subparsers(dest="command")
+    build = commands.add_parser("build-index",
+                                help="Prebuild an index file")
+    build.add_argument("index_file")
+    build.add_argument("--from-year", type=int, default=FROM_YEAR)
+    build.add_argument("--to-year", type=int, default=TO_YEAR)
+    category = commands.add_parser(
+        "category", help="Count laureates by category and year range")
+    category.add_argument("category")
+    category.add_argument("start_year", type=int)
+    category.add_argument("end_year", type=int)
+    motivation = commands.add_parser(
+        "motivation", help="Count laureates by motivation keyword")
+    motivation.add_argument("keyword")
+    name = commands.add_parser("name", help="Find laureate details by name")
+    name.add_argument("firstname")
+    name.add_argument("surname")
+    search = commands.add_parser(
+        "search", help="Find the laureates closest to a partial name")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=SEARCH_LIMIT)
+    args = parser.parse_args()
+
+    if args.command == "build-index":
+        build_index(args.data_file, args.index_file, args.from_year,
+                    args.to_year)
+        print(f"Index written to {args.index_file}")
+        return
+
+    client = NobelPrizeOfflineClient(args.data_file)
+    if args.command == "category":
+        try:
+            print(client.count_laureates_by_category_and_years(
+                args.category, args.start_year, args.end_year))
+        except ValueError as e:
+            parser.exit(1, f"Error: {e}\n")
+    elif args.command == "motivation":
+        print(client.count_laureates_by_motivation_keyword(args.keyword))
+    elif args.command == "name":
+        print(json.dumps(client.get_laureate_details_by_name(
+            args.firstname, args.surname), indent=2))
+    elif args.command == "search":
+        print(json.dumps(client.search_laureates_by_name(
+            args.query, args.limit), indent=2))
+    else:
+        NobelPrizeCLI(client).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11nobel_prize.proto\x12\nnobelprize\"M\n\x13\x43\x61tegoryYearRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x12\n\nstart_year\x18\x02 \x01(\x05\x12\x10\n\x08\x65nd_year\x18\x03 \x01(\x05\"+\n\x18MotivationKeywordRequest\x12\x0f\n\x07keyword\x18\x01 \x01(\t\"9\n\x13LaureateNameRequest\x12\x11\n\tfirstname\x18\x01 \x01(\t\x12\x0f\n\x07surname\x18\x02 \x01(\t\"7\n\x15LaureateCountResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x0f\n\x07message\x18\x02 \x01(\t\"D\n\x0eLaureateDetail\x12\x0c\n\x04year\x18\x01 \x01(\x05\x12\x10\n\x08\x63\x61tegory\x18\x02 \x01(\t\x12\x12\n\nmotivation\x18\x03 \x01(\t\"W\n\x17LaureateDetailsResponse\x12+\n\x07\x64\x65tails\x18\x01 \x03(\x0b\x32\x1a.nobelprize.LaureateDetail\x12\x0f\n\x07message\x18\x02 \x01(\t2\xd1\x02\n\x11NobelPrizeService\x12h\n CountLaureatesByCategoryAndYears\x12\x1f.nobelprize.CategoryYearRequest\x1a!.nobelprize.LaureateCountResponse\"\x00\x12n\n!CountLaureatesByMotivationKeyword\x12$.nobelprize.MotivationKeywordRequest\x1a!.nobelprize.LaureateCountResponse\"\x00\x12\x62\n\x18GetLaureateDetailsByName\x12\x1f.nobelprize.LaureateNameRequest\x1a#.nobelprize.LaureateDetailsResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11nobel_prize.proto\x12\nnobelprize\"M\n\x13\x43\x61tegoryYearRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x12\n\nstart_year\x18\x02 \x01(\x05\x12\x10\n\x08\x65nd_year\x18\x03 \x01(\x05\"+\n\x18MotivationKeywordRequest\x12\x0f\n\x07keyword\x18\x01 \x01(\t\"9\n\x13LaureateNameRequest\x12\x11\n\tfirstname\x18\x01 \x01(\t\x12\x0f\n\x07surname\x18\x02 \x01(\t\"P\n\x17LaureateNamePageRequest\x12\x11\n\tfirstname\x18\x01 \x01(\t\x12\x0f\n\x07surname\x18\x02 \x01(\t\x12\x11\n\tpage_size\x18\x03 \x01(\x05\"5\n\x15LaureateSearchRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\"7\n\x15LaureateCountResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x0f\n\x07message\x18\x02 \x01(\t\"D\n\x0eLaureateDetail\x12\x0c\n\x04year\x18\x01 \x01(\x05\x12\x10\n\x08\x63\x61tegory\x18\x02 \x01(\t\x12\x12\n\nmotivation\x18\x03 \x01(\t\"W\n\x17LaureateDetailsResponse\x12+\n\x07\x64\x65tails\x18\x01 \x03(\x0b\x32\x1a.nobelprize.LaureateDetail\x12\x0f\n\x07message\x18\x02 \x01(\t\"o\n\rLaureateMatch\x12\x11\n\tfirstname\x18\x01 \x01(\t\x12\x0f\n\x07surname\x18\x02 \x01(\t\x12\r\n\x05score\x18\x03 \x01(\x02\x12+\n\x07\x64\x65tails\x18\x04 \x03(\x0b\x32\x1a.nobelprize.LaureateDetail\"U\n\x16LaureateSearchResponse\x12*\n\x07matches\x18\x01 \x03(\x0b\x32\x19.nobelprize.LaureateMatch\x12\x0f\n\x07message\x18\x02 \x01(\t\"\xcf\x01\n\x0cQueryRequest\x12\x38\n\rcategory_year\x18\x01 \x01(\x0b\x32\x1f.nobelprize.CategoryYearRequestH\x00\x12\x42\n\x12motivation_keyword\x18\x02 \x01(\x0b\x32$.nobelprize.MotivationKeywordRequestH\x00\x12\x38\n\rlaureate_name\x18\x03 \x01(\x0b\x32\x1f.nobelprize.LaureateNameRequestH\x00\x42\x07\n\x05query\"\x94\x01\n\rQueryResponse\x12\x32\n\x05\x63ount\x18\x01 \x01(\x0b\x32!.nobelprize.LaureateCountResponseH\x00\x12\x36\n\x07\x64\x65tails\x18\x02 \x01(\x0b\x32#.nobelprize.LaureateDetailsResponseH\x00\x12\r\n\x05\x65rror\x18\x03 \x01(\tB\x08\n\x06result\">\n\x11\x42\x61tchQueryRequest\x12)\n\x07queries\x18\x01 \x03(\x0b\x32\x18.nobelprize.QueryRequest\"@\n\x12\x42\x61tchQueryResponse\x12*\n\x07results\x18\x01 \x03(\x0b\x32\x19.nobelprize.QueryResponse2\xb9\x05\n\x11NobelPrizeService\x12h\n CountLaureatesByCategoryAndYears\x12\x1f.nobelprize.CategoryYearRequest\x1a!.nobelprize.LaureateCountResponse\"\x00\x12n\n!CountLaureatesByMotivationKeyword\x12$.nobelprize.MotivationKeywordRequest\x1a!.nobelprize.LaureateCountResponse\"\x00\x12\x62\n\x18GetLaureateDetailsByName\x12\x1f.nobelprize.LaureateNameRequest\x1a#.nobelprize.LaureateDetailsResponse\"\x00\x12k\n\x1bStreamLaureateDetailsByName\x12#.nobelprize.LaureateNamePageRequest\x1a#.nobelprize.LaureateDetailsResponse\"\x00\x30\x01\x12`\n\x15SearchLaureatesByName\x12!.nobelprize.LaureateSearchRequest\x1a\".nobelprize.LaureateSearchResponse\"\x00\x12M\n\nBatchQuery\x12\x1d.nobelprize.BatchQueryRequest\x1a\x1e.nobelprize.BatchQueryResponse\"\x00\x12H\n\x0bQueryStream\x12\x18.nobelprize.QueryRequest\x1a\x19.nobelprize.QueryResponse\"\x00(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -37,12 +37,28 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_MOTIVATIONKEYWORDREQUEST']._serialized_end=155
   _globals['_LAUREATENAMEREQUEST']._serialized_start=157
   _globals['_LAUREATENAMEREQUEST']._serialized_end=214
-  _globals['_LAUREATECOUNTRESPONSE']._serialized_start=216
-  _globals['_LAUREATECOUNTRESPONSE']._serialized_end=271
-  _globals['_LAUREATEDETAIL']._serialized_start=273
-  _globals['_LAUREATEDETAIL']._serialized_end=341
-  _globals['_LAUREATEDETAILSRESPONSE']._serialized_start=343
-  _globals['_LAUREATEDETAILSRESPONSE']._serialized_end=430
-  _globals['_NOBELPRIZESERVICE']._serialized_start=433
-  _globals['_NOBELPRIZESERVICE']._serialized_end=770
+  _globals['_LAUREATENAMEPAGEREQUEST']._serialized_start=216
+  _globals['_LAUREATENAMEPAGEREQUEST']._serialized_end=296
+  _globals['_LAUREATESEARCHREQUEST']._serialized_start=298
+  _globals['_LAUREATESEARCHREQUEST']._serialized_end=351
+  _globals['_LAUREATECOUNTRESPONSE']._serialized_start=353
+  _globals['_LAUREATECOUNTRESPONSE']._serialized_end=408
+  _globals['_LAUREATEDETAIL']._serialized_start=410
+  _globals['_LAUREATEDETAIL']._serialized_end=478
+  _globals['_LAUREATEDETAILSRESPONSE']._serialized_start=480
+  _globals['_LAUREATEDETAILSRESPONSE']._serialized_end=567
+  _globals['_LAUREATEMATCH']._serialized_start=569
+  _globals['_LAUREATEMATCH']._serialized_end=680
+  _globals['_LAUREATESEARCHRESPONSE']._serialized_start=682
+  _globals['_LAUREATESEARCHRESPONSE']._serialized_end=767
+  _globals['_QUERYREQUEST']._serialized_start=770
+  _globals['_QUERYREQUEST']._serialized_end=977
+  _globals['_QUERYRESPONSE']._serialized_start=980
+  _globals['_QUERYRESPONSE']._serialized_end=1128
+  _globals['_BATCHQUERYREQUEST']._serialized_start=1130
+  _globals['_BATCHQUERYREQUEST']._serialized_end=1192
+  _globals['_BATCHQUERYRESPONSE']._serialized_start=1194
+  _globals['_BATCHQUERYRESPONSE']._serialized_end=1258
+  _globals['_NOBELPRIZESERVICE']._serialized_start=1261
+  _globals['_NOBELPRIZESERVICE']._serialized_end=1958
 # @@protoc_insertion_point(module_scope)
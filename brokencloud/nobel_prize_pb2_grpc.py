@@ -50,6 +50,26 @@ class NobelPrizeServiceStub(object):
                 request_serializer=nobel__prize__pb2.LaureateNameRequest.SerializeToString,
                 response_deserializer=nobel__prize__pb2.LaureateDetailsResponse.FromString,
                 _registered_method=True)
+        self.StreamLaureateDetailsByName = channel.unary_stream(
+                '/nobelprize.NobelPrizeService/StreamLaureateDetailsByName',
+                request_serializer=nobel__prize__pb2.LaureateNamePageRequest.SerializeToString,
+                response_deserializer=nobel__prize__pb2.LaureateDetailsResponse.FromString,
+                _registered_method=True)
+        self.SearchLaureatesByName = channel.unary_unary(
+                '/nobelprize.NobelPrizeService/SearchLaureatesByName',
+                request_serializer=nobel__prize__pb2.LaureateSearchRequest.SerializeToString,
+                response_deserializer=nobel__prize__pb2.LaureateSearchResponse.FromString,
+                _registered_method=True)
+        self.BatchQuery = channel.unary_unary(
+                '/nobelprize.NobelPrizeService/BatchQuery',
+                request_serializer=nobel__prize__pb2.BatchQueryRequest.SerializeToString,
+                response_deserializer=nobel__prize__pb2.BatchQueryResponse.FromString,
+                _registered_method=True)
+        self.QueryStream = channel.stream_stream(
+                '/nobelprize.NobelPrizeService/QueryStream',
+                request_serializer=nobel__prize__pb2.QueryRequest.SerializeToString,
+                response_deserializer=nobel__prize__pb2.QueryResponse.FromString,
+                _registered_method=True)
 
 
 class NobelPrizeServiceServicer(object):
@@ -77,6 +97,34 @@ class NobelPrizeServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamLaureateDetailsByName(self, request, context):
+        """Service 3, streaming the details page by page as they are found
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchLaureatesByName(self, request, context):
+        """Find the laureates closest to a misspelled or partial name
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchQuery(self, request, context):
+        """Run several queries in one call, results come back in request order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QueryStream(self, request_iterator, context):
+        """Stream queries and receive their results in request order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_NobelPrizeServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -95,6 +143,26 @@ def add_NobelPrizeServiceServicer_to_server(servicer, server):
                     request_deserializer=nobel__prize__pb2.LaureateNameRequest.FromString,
                     response_serializer=nobel__prize__pb2.LaureateDetailsResponse.SerializeToString,
             ),
+            'StreamLaureateDetailsByName': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamLaureateDetailsByName,
+                    request_deserializer=nobel__prize__pb2.LaureateNamePageRequest.FromString,
+                    response_serializer=nobel__prize__pb2.LaureateDetailsResponse.SerializeToString,
+            ),
+            'SearchLaureatesByName': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchLaureatesByName,
+                    request_deserializer=nobel__prize__pb2.LaureateSearchRequest.FromString,
+                    response_serializer=nobel__prize__pb2.LaureateSearchResponse.SerializeToString,
+            ),
+            'BatchQuery': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchQuery,
+                    request_deserializer=nobel__prize__pb2.BatchQueryRequest.FromString,
+                    response_serializer=nobel__prize__pb2.BatchQueryResponse.SerializeToString,
+            ),
+            'QueryStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.QueryStream,
+                    request_deserializer=nobel__prize__pb2.QueryRequest.FromString,
+                    response_serializer=nobel__prize__pb2.QueryResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'nobelprize.NobelPrizeService', rpc_method_handlers)
@@ -187,3 +255,111 @@ class NobelPrizeService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamLaureateDetailsByName(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/nobelprize.NobelPrizeService/StreamLaureateDetailsByName',
+            nobel__prize__pb2.LaureateNamePageRequest.SerializeToString,
+            nobel__prize__pb2.LaureateDetailsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SearchLaureatesByName(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nobelprize.NobelPrizeService/SearchLaureatesByName',
+            nobel__prize__pb2.LaureateSearchRequest.SerializeToString,
+            nobel__prize__pb2.LaureateSearchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchQuery(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nobelprize.NobelPrizeService/BatchQuery',
+            nobel__prize__pb2.BatchQueryRequest.SerializeToString,
+            nobel__prize__pb2.BatchQueryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def QueryStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/nobelprize.NobelPrizeService/QueryStream',
+            nobel__prize__pb2.QueryRequest.SerializeToString,
+            nobel__prize__pb2.QueryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
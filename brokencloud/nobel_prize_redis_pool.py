@@ -0,0 +1,168 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Configurable Redis connection pools shared by the Redis query
+#              clients. The pools are bounded (callers wait for a free
+#              connection instead of opening new ones) and record how long
+#              callers waited and how many connections were in use, so pool
+#              sizes can be chosen for the server's thread and process counts.
+
+import os
+import threading
+import time
+from typing import Dict
+
+import redis
+import redis.asyncio
+from dotenv import load_dotenv
+from nobel_prize_histogram import LatencyHistogram
+
+# Loading variables from .env file
+load_dotenv()
+
+# Constants
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "10"))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "5"))
+REDIS_TCP_KEEPALIVE = os.getenv("REDIS_TCP_KEEPALIVE", "1") == "1"
+REDIS_HEALTH_CHECK_INTERVAL = int(
+    os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+
+class PoolStats:
+    """Saturation counters of a connection pool."""
+
+    def __init__(self, max_connections: int):
+        self._lock = threading.Lock()
+        self.max_connections = max_connections
+        self.in_use = 0
+        self.max_in_use = 0
+        self.acquired = 0
+        self.errors = 0
+        self.wait = LatencyHistogram()
+        self.handed_out = set()  # Ids of the connections in use
+
+    def record_acquire(self, connection, waited_ns: int):
+        """Record a connection handed out after waiting waited_ns."""
+        with self._lock:
+            self.handed_out.add(id(connection))
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.acquired += 1
+            self.wait.record(max(1, waited_ns))
+
+    def record_error(self):
+        """Record a caller that got no connection (timeout or failure)."""
+        with self._lock:
+            self.errors += 1
+
+    def record_release(self, connection):
+        """Record a connection given back, unless it was never handed out."""
+        with self._lock:
+            if id(connection) in self.handed_out:
+                self.handed_out.discard(id(connection))
+                self.in_use -= 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return the counters, with wait times in seconds."""
+        with self._lock:
+            return {
+                'max_connections': self.max_connections,
+                'in_use': self.in_use,
+                'max_in_use': self.max_in_use,
+                'acquired_total': self.acquired,
+                'acquire_errors_total': self.errors,
+                'wait_seconds_total': self.wait.total / 1e9,
+                'wait_seconds_p99': self.wait.percentile(99) / 1e9
+                if self.acquired else 0.0,
+            }
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Bounded connection pool recording wait times and connections in use."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_stats = PoolStats(self.max_connections)
+
+    def get_connection(self, command_name, *keys, **options):
+        start = time.perf_counter_ns()
+        try:
+            connection = super().get_connection(command_name, *keys,
+                                                **options)
+        except redis.ConnectionError:
+            self.pool_stats.record_error()
+            raise
+        self.pool_stats.record_acquire(connection,
+                                       time.perf_counter_ns() - start)
+        return connection
+
+    def release(self, connection):
+        self.pool_stats.record_release(connection)
+        super().release(connection)
+
+
+class AsyncInstrumentedConnectionPool(redis.asyncio.BlockingConnectionPool):
+    """asyncio variant of InstrumentedConnectionPool."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_stats = PoolStats(self.max_connections)
+
+    async def get_connection(self, command_name, *keys, **options):
+        start = time.perf_counter_ns()
+        try:
+            connection = await super().get_connection(command_name, *keys,
+                                                      **options)
+        except redis.asyncio.ConnectionError:
+            self.pool_stats.record_error()
+            raise
+        self.pool_stats.record_acquire(connection,
+                                       time.perf_counter_ns() - start)
+        return connection
+
+    async def release(self, connection):
+        self.pool_stats.record_release(connection)
+        await super().release(connection)
+
+
+def connection_pool(host: str, port: int, password: str,
+                    max_connections: int = REDIS_MAX_CONNECTIONS,
+                    pool_timeout: float = REDIS_POOL_TIMEOUT,
+                    socket_timeout: float = REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout: float = REDIS_CONNECT_TIMEOUT,
+                    socket_keepalive: bool = REDIS_TCP_KEEPALIVE,
+                    health_check_interval: int = REDIS_HEALTH_CHECK_INTERVAL,
+                    asynchronous: bool = False):
+    """
+    Create an instrumented, bounded Redis connection pool.
+
+    Args:
+        host, port, password: Redis connection settings
+        max_connections: Most connections open at once; callers beyond it
+                         wait for a connection to be released
+        pool_timeout: Seconds a caller waits for a free connection
+        socket_timeout: Seconds a command may take before it fails
+        socket_connect_timeout: Seconds allowed to open a connection
+        socket_keepalive: Enable TCP keepalive on the connections
+        health_check_interval: Seconds a connection may stay idle before it
+                               is checked with a PING when handed out,
+                               0 disables the checks
+        asynchronous: Create a redis.asyncio pool
+
+    Returns:
+        The pool; its pool_stats.stats() returns the saturation counters
+    """
+    pool_class = AsyncInstrumentedConnectionPool if asynchronous \
+        else InstrumentedConnectionPool
+    return pool_class(
+        host=host,
+        port=port,
+        password=password,
+        decode_responses=True,
+        max_connections=max_connections,
+        timeout=pool_timeout,
+        socket_timeout=socket_timeout or None,
+        socket_connect_timeout=socket_connect_timeout or None,
+        socket_keepalive=socket_keepalive,
+        health_check_interval=health_check_interval
+    )
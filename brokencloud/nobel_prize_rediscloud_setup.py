@@ -2,9 +2,16 @@
 # DESCRIPTION: Simple script to download Novel Prizes Data since year 
 #              1901 in JSON format. Filters out the prizes from 2013 
 #              to 2023 and addds it to the Redis DB. Creates requested 
-#              indexes.
+#              indexes. Each run loads a new generation of keys and index
+#              and then switches the « prizeIdx » alias to it, so reloads
+#              are invisible to live queries.
+#              With « --sync » only the prizes that changed since the last
+#              run are written to the live generation instead.
 # ASSIGNMENT TASKS: Tasks 1.1 and 1.2            
 
+import argparse
+import hashlib
+import json
 import requests
 import redis
 import os
@@ -12,34 +19,84 @@ from redis.commands.json.path import Path
 from dotenv import load_dotenv
 from redis.commands.search.field import TextField, NumericField
 from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+from nobel_prize_cache import DATASET_VERSION_KEY
+from nobel_prize_counts import LAUREATE_COUNTS_KEY, build_laureate_counts
+from nobel_prize_name_index import (
+    NAME_DISPLAY_KEY,
+    NAME_INDEX_KEY,
+    build_name_displays,
+    build_name_index
+)
+from nobel_prize_stream import (
+    CHUNK_SIZE,
+    iter_json_array,
+    iter_prizes_from_file
+)
 
 
 # Loading variables from .env file
 load_dotenv()
 
 # Constants
-API_URL = "https://api.nobelprize.org/v1/prize.json"
+API_URL = os.getenv("NOBEL_API_URL",
+                    "https://api.nobelprize.org/v1/prize.json")
 REDIS_HOST = os.getenv("REDIS_HOST")
 REDIS_PORT = os.getenv("REDIS_PORT")
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+INDEX_ALIAS = "prizeIdx"        # Name the clients query, an alias
+# Generation keys must not start with « prizes: », which the real index of a
+# pre-alias deployment keeps indexing until the first versioned load drops it
+KEY_PREFIX = "prizeDocs"
+LEGACY_KEY_PREFIX = "prizes"
+GENERATION_KEY = "prizeGeneration"
+PRIZE_HASHES_KEY = "prizeHashes"  # Prize id -> content hash
+SYNC_STATE_KEY = "prizeSync"      # URL, ETag and Last-Modified of the data
+BATCH_SIZE = 500
+SCAN_COUNT = 1000
 
-def fetch_nobel_prize_data(url: str) -> dict | None:
+def fetch_changed_prize_data(url: str, validators: dict) -> tuple:
     """
-    Fetch Nobel Prize data from the API.
-    
+    Stream Nobel Prize data from the API unless it has not changed.
+
+    The ETag and Last-Modified values of the previous response are sent as
+    If-None-Match and If-Modified-Since, so an unchanged dataset costs a
+    304 response without a body. The body is not read here: prizes are
+    parsed one at a time while the returned iterator is consumed.
+
     Args:
         url (str): The API URL to fetch data from
-        
+        validators (dict): 'etag' and 'last_modified' of the previous
+                           response, if any
+
     Returns:
-        dict | None: JSON response or None if request fails
+        tuple: (status code, prize iterator, validators of the response);
+               the status code is None if the request fails and the
+               iterator is None unless it is 200
     """
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
     try:
-        response = requests.get(url, timeout=30)  # Added timeout
+        response = requests.get(url, headers=headers, timeout=30,
+                                stream=True)
+        if response.status_code == 304:
+            response.close()
+            return 304, None, validators
         response.raise_for_status()
-        return response.json()
+        return response.status_code, iter_json_array(
+            response.iter_content(chunk_size=CHUNK_SIZE)), {
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+        }
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data: {e}")
-        return None
+        return None, None, {}
+
+def in_year_range(prize: dict, from_year: int, to_year: int) -> bool:
+    """Return True if a prize was awarded between two years (inclusive)."""
+    return from_year <= int(prize['year']) <= to_year
 
 def filter_prize_by_year(data: dict, from_year: int, to_year: int) -> list:
     """
@@ -56,58 +113,166 @@ def filter_prize_by_year(data: dict, from_year: int, to_year: int) -> list:
     if not data or 'prizes' not in data:
         return []
     return [prize for prize in data['prizes'] 
-            if from_year <= int(prize['year']) <= to_year]
+            if in_year_range(prize, from_year, to_year)]
 
-def save_to_redis(redis_client: redis.Redis, data: dict, from_year: int, 
-                  to_year: int) -> bool:
+def prize_id(prize: dict) -> str:
     """
-    Save filtered prize data to Redis.
-    
+    Return the stable id of a prize: « year:category », or the document's
+    own « id » when it has one (synthetic datasets hold many prizes per
+    year and category).
+    """
+    if 'id' in prize:
+        return str(prize['id'])
+    return f"{int(prize['year'])}:{prize['category']}"
+
+def prize_hash(prize: dict) -> str:
+    """Return a hash of a prize's content, as saved to Redis."""
+    content = dict(prize, year=int(prize['year']))
+    return hashlib.sha1(json.dumps(content, sort_keys=True).encode()
+                        ).hexdigest()
+
+def generation_names(generation: int) -> tuple:
+    """
+    Return the key prefix and index name of a dataset generation.
+
+    Every load writes its prizes under a fresh « prizeDocs:<generation>: »
+    prefix indexed by « prizeIdx:<generation> »; readers only ever see the
+    generation the « prizeIdx » alias points to.
+    """
+    return f"{KEY_PREFIX}:{generation}:", f"{INDEX_ALIAS}:{generation}"
+
+def save_to_redis(redis_client: redis.Redis, prizes, from_year: int,
+                  to_year: int, prefix: str = f"{KEY_PREFIX}:",
+                  name_index_key: str = NAME_INDEX_KEY,
+                  hashes_key: str = PRIZE_HASHES_KEY,
+                  batch_size: int = BATCH_SIZE,
+                  counts_key: str = LAUREATE_COUNTS_KEY,
+                  displays_key: str = NAME_DISPLAY_KEY) -> bool:
+    """
+    Save prizes to Redis as they are parsed.
+
+    Prizes are consumed one at a time, filtered by year, and written with
+    pipelined JSON.SET commands together with their content hash, one round
+    trip per batch. The name index is merged batch by batch (HMGET, then
+    HSET) and the laureate counts are added with HINCRBY, so only one batch
+    of prizes is ever held in memory whatever the size of the input.
+
     Args:
         redis_client: Redis client instance
-        data (dict): The complete prize data
+        prizes: Iterable of prize documents, e.g. from iter_json_array
         from_year (int): Start year
         to_year (int): End year
-        
+        prefix (str): Key prefix of the generation being loaded
+        name_index_key (str): Key of the name index to build
+        hashes_key (str): Key of the prize hashes to build
+        batch_size (int): Number of prizes written per round trip
+        counts_key (str): Key of the category/year laureate counts to build
+        displays_key (str): Key of the name index's display names to build
+
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        filtered_prizes = filter_prize_by_year(data, from_year, to_year)
-        if not filtered_prizes:
+        redis_client.delete(name_index_key, hashes_key, counts_key,
+                            displays_key)
+        pipeline = redis_client.pipeline(transaction=False)
+        batch = []
+        saved = 0
+        for prize in prizes:
+            if not in_year_range(prize, from_year, to_year):
+                continue
+            prize["year"] = int(prize["year"])
+            key = f'{prefix}{prize_id(prize)}'
+            pipeline.json().set(name=key, path=Path.root_path(), obj=prize)
+            pipeline.hset(hashes_key, prize_id(prize), prize_hash(prize))
+            batch.append(prize)
+            if len(batch) == batch_size:
+                add_laureate_counts(pipeline, batch, counts_key)
+                merge_name_index(redis_client, pipeline, batch,
+                                 name_index_key, displays_key)
+                saved += len(batch)
+                batch = []
+        add_laureate_counts(pipeline, batch, counts_key)
+        merge_name_index(redis_client, pipeline, batch, name_index_key,
+                         displays_key)
+        saved += len(batch)
+
+        if not saved:
             print("No prizes found in the specified year range")
             return False
-            
-        # Clear existing data before inserting new
-        existing_keys = redis_client.keys('prizes:*')
-        if existing_keys:
-            redis_client.delete(*existing_keys)
-            
-        for i, prize in enumerate(filtered_prizes, 1):
-            key = f'prizes:{i}'
-            prize["year"] = int(prize["year"])
-            redis_client.json().set(name=key, path=Path.root_path(), obj=prize)
-            
-        print(f"Successfully saved {len(filtered_prizes)} prizes to Redis")
+        print(f"Successfully saved {saved} prizes to Redis")
         return True
     except redis.RedisError as e:
         print(f"Redis error: {e}")
         return False
 
-def create_search_index(redis_client: redis.Redis) -> bool:
+def add_laureate_counts(pipeline, prizes: list,
+                        key: str = LAUREATE_COUNTS_KEY):
+    """
+    Queue the laureate counts of a batch of prizes on a pipeline.
+
+    Counts are added with HINCRBY, so batches need no read of the counts
+    already written.
+
+    Args:
+        pipeline: Pipeline holding the batch's queued writes
+        prizes (list): Prize documents of the batch
+        key (str): Key of the category/year counts hash
+    """
+    for field, count in build_laureate_counts(prizes).items():
+        pipeline.hincrby(key, field, count)
+
+def merge_name_index(redis_client: redis.Redis, pipeline, prizes: list,
+                     key: str = NAME_INDEX_KEY,
+                     displays_key: str = NAME_DISPLAY_KEY):
+    """
+    Add the laureates of a batch of prizes to a name index being built, and
+    send the batch's queued pipeline commands with them.
+
+    Args:
+        redis_client: Redis client instance
+        pipeline: Pipeline holding the batch's queued writes
+        prizes (list): Prize documents of the batch
+        key (str): Key of the name index
+        displays_key (str): Key of the name index's display names
+    """
+    index = build_name_index(prizes)
+    if index:
+        names = list(index)
+        existing = redis_client.hmget(key, names)
+        for name, details in zip(names, existing):
+            if details:
+                index[name] = json.loads(details) + index[name]
+        pipeline.hset(key, mapping={
+            name: json.dumps(details) for name, details in index.items()
+        })
+        pipeline.hset(displays_key, mapping={
+            name: json.dumps(display)
+            for name, display in build_name_displays(prizes).items()
+        })
+    pipeline.execute()
+
+def create_search_index(redis_client: redis.Redis,
+                        index_name: str = INDEX_ALIAS,
+                        prefix: str = f"{KEY_PREFIX}:") -> bool:
     """
     Create search index for Nobel Prize data.
+
+    The index is created before the prizes are written, so documents are
+    indexed as they are saved and the index is complete once the load ends.
     
     Args:
         redis_client: Redis client instance
+        index_name (str): Name of the index to create
+        prefix (str): Key prefix of the documents to index
         
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        # Delete existing index if it exists
+        # Delete a leftover index from a failed load with the same name
         try:
-            redis_client.ft("prizeIdx").dropindex()
+            redis_client.ft(index_name).dropindex()
         except redis.ResponseError:
             pass  # Index doesn't exist
         
@@ -119,10 +284,10 @@ def create_search_index(redis_client: redis.Redis) -> bool:
             TextField("$.laureates[*].motivation", as_name="motivation")
         )
 
-        redis_client.ft("prizeIdx").create_index(
+        redis_client.ft(index_name).create_index(
             schema,
             definition=IndexDefinition(
-                prefix=["prizes:"],
+                prefix=[prefix],
                 index_type=IndexType.JSON
             )
         )
@@ -131,17 +296,323 @@ def create_search_index(redis_client: redis.Redis) -> bool:
         print(f"Error creating search index: {e}")
         return False
 
+def switch_dataset(redis_client: redis.Redis, generation: int,
+                   name_index_key: str, hashes_key: str = None,
+                   counts_key: str = None, displays_key: str = None) -> bool:
+    """
+    Atomically make a loaded generation the live dataset.
+
+    In one MULTI/EXEC transaction the « prizeIdx » alias is pointed at the
+    generation's index (FT.ALIASUPDATE), its name index and display names,
+    prize hashes and laureate counts replace the live ones and the dataset
+    version is
+    stamped, so readers switch from the old to the new data without ever
+    seeing an empty or mixed state.
+
+    On a pre-alias deployment « prizeIdx » is still a real index. It is
+    dropped (FT.DROPINDEX, keeping its « prizes: » documents) in the same
+    transaction, so there is no moment where the name does not exist. This
+    one-time migration happens on the first versioned load only; the
+    legacy documents are removed afterwards by remove_old_generations.
+
+    Args:
+        redis_client: Redis client instance
+        generation (int): Generation to publish
+        name_index_key (str): Key the generation's name index was built at
+        hashes_key (str): Key the generation's prize hashes were built at
+        counts_key (str): Key the generation's laureate counts were built at
+        displays_key (str): Key the generation's display names were built at
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    _, index_name = generation_names(generation)
+    try:
+        try:
+            legacy_index = (redis_client.ft(INDEX_ALIAS).info()['index_name']
+                            == INDEX_ALIAS)
+        except redis.ResponseError:
+            legacy_index = False  # Index or alias doesn't exist
+
+        transaction = redis_client.pipeline(transaction=True)
+        if legacy_index:
+            transaction.ft(INDEX_ALIAS).dropindex(delete_documents=False)
+        transaction.ft(index_name).aliasupdate(INDEX_ALIAS)
+        transaction.rename(name_index_key, NAME_INDEX_KEY)
+        if hashes_key:
+            transaction.rename(hashes_key, PRIZE_HASHES_KEY)
+        if counts_key:
+            transaction.rename(counts_key, LAUREATE_COUNTS_KEY)
+        if displays_key:
+            transaction.rename(displays_key, NAME_DISPLAY_KEY)
+        transaction.set(DATASET_VERSION_KEY, generation)
+        transaction.execute()
+
+        print(f"Index alias {INDEX_ALIAS} now points to {index_name}")
+        return True
+    except redis.RedisError as e:
+        print(f"Error switching to the new dataset: {e}")
+        return False
+
+def remove_old_generations(redis_client: redis.Redis, generation: int,
+                           batch_size: int = BATCH_SIZE) -> int:
+    """
+    Remove the indexes, prize keys and name indexes of every other
+    generation.
+
+    Keys are found with SCAN instead of the blocking KEYS command and
+    deleted with UNLINK, which frees memory in the background, so the
+    cleanup does not stall live queries.
+
+    Args:
+        redis_client: Redis client instance
+        generation (int): Live generation to keep
+        batch_size (int): Number of keys unlinked per round trip
+
+    Returns:
+        int: Number of keys removed
+    """
+    prefix, index_name = generation_names(generation)
+    try:
+        for name in redis_client.execute_command("FT._LIST"):
+            if name.startswith(f"{INDEX_ALIAS}:") and name != index_name:
+                redis_client.ft(name).dropindex()
+
+        removed = 0
+        stale_keys = []
+        # Prize documents, name indexes, hashes and counts left by earlier
+        # or failed loads, and the documents of a pre-alias deployment
+        for pattern in (f"{KEY_PREFIX}:*", f"{LEGACY_KEY_PREFIX}:*",
+                        f"{NAME_INDEX_KEY}:*", f"{NAME_DISPLAY_KEY}:*",
+                        f"{PRIZE_HASHES_KEY}:*", f"{LAUREATE_COUNTS_KEY}:*"):
+            for key in redis_client.scan_iter(match=pattern,
+                                              count=SCAN_COUNT):
+                if key.startswith(prefix):
+                    continue
+                stale_keys.append(key)
+                if len(stale_keys) == batch_size:
+                    removed += redis_client.unlink(*stale_keys)
+                    stale_keys = []
+        if stale_keys:
+            removed += redis_client.unlink(*stale_keys)
+
+        print(f"Removed {removed} keys of previous datasets")
+        return removed
+    except redis.RedisError as e:
+        print(f"Error removing previous datasets: {e}")
+        return 0
+
+def create_name_index(redis_client: redis.Redis, prizes: list,
+                      key: str = NAME_INDEX_KEY,
+                      displays_key: str = NAME_DISPLAY_KEY) -> bool:
+    """
+    Create the laureate name lookup hash.
+
+    Each field is a normalized « firstname|surname » key holding the JSON
+    list of the laureate's prizes, so a name lookup is a single HGET. The
+    same fields of a second hash hold the names as stored, which the name
+    search returns. A new load builds the hashes under their own keys, which
+    « switch_dataset » renames over the live ones, so readers never see a
+    partially built index.
+
+    Args:
+        redis_client: Redis client instance
+        prizes (list): Prize documents saved to Redis
+        key (str): Key of the hash to build
+        displays_key (str): Key of the display names hash to build
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        index = build_name_index(prizes)
+        if not index:
+            print("No laureates found to index by name")
+            return False
+
+        redis_client.delete(key, displays_key)
+        redis_client.hset(key, mapping={
+            name: json.dumps(details) for name, details in index.items()
+        })
+        redis_client.hset(displays_key, mapping={
+            name: json.dumps(display)
+            for name, display in build_name_displays(prizes).items()
+        })
+
+        print(f"Successfully indexed {len(index)} laureate names")
+        return True
+    except redis.RedisError as e:
+        print(f"Error creating name index: {e}")
+        return False
+
+def live_generation(redis_client: redis.Redis) -> int | None:
+    """Return the generation the « prizeIdx » alias points to."""
+    try:
+        index_name = redis_client.ft(INDEX_ALIAS).info()['index_name']
+    except redis.ResponseError:
+        return None  # No dataset loaded yet
+    _, _, generation = index_name.rpartition(':')
+    return int(generation) if generation.isdigit() else None
+
+def diff_prizes(stored_hashes: dict, prizes: list) -> tuple:
+    """
+    Compare prizes with the hashes stored by the previous load.
+
+    Args:
+        stored_hashes (dict): Prize id -> content hash
+        prizes (list): Current prize documents
+
+    Returns:
+        tuple: (added prizes, changed prizes, removed prize ids)
+    """
+    added, changed = [], []
+    for prize in prizes:
+        stored = stored_hashes.get(prize_id(prize))
+        if stored is None:
+            added.append(prize)
+        elif stored != prize_hash(prize):
+            changed.append(prize)
+    current = {prize_id(prize) for prize in prizes}
+    removed = [key for key in stored_hashes if key not in current]
+    return added, changed, removed
+
+def can_sync(redis_client: redis.Redis) -> bool:
+    """Return True if the live dataset has the hashes a sync diffs against."""
+    return (live_generation(redis_client) is not None and
+            bool(redis_client.exists(PRIZE_HASHES_KEY)))
+
+def sync_to_redis(redis_client: redis.Redis, prizes, from_year: int,
+                  to_year: int, batch_size: int = BATCH_SIZE) -> bool:
+    """
+    Apply only the prizes added, changed or removed since the last load to
+    the live generation.
+
+    Changed documents are rewritten in place, so the search index only
+    re-indexes them. The name index and laureate counts are rebuilt aside
+    and, with the prize hashes and a new dataset version, published in one
+    transaction. Only
+    the prizes in the year range are kept in memory for the diff. Check
+    can_sync first.
+
+    Args:
+        redis_client: Redis client instance
+        prizes: Iterable of all prize documents, e.g. from iter_json_array
+        from_year (int): Start year
+        to_year (int): End year
+        batch_size (int): Number of commands sent per round trip
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        generation = live_generation(redis_client)
+        stored_hashes = redis_client.hgetall(PRIZE_HASHES_KEY)
+        prizes = [prize for prize in prizes
+                  if in_year_range(prize, from_year, to_year)]
+        added, changed, removed = diff_prizes(stored_hashes, prizes)
+        print(f"{len(added)} prizes added, {len(changed)} changed, "
+              f"{len(removed)} removed")
+        if not (added or changed or removed):
+            return True
+
+        prefix, _ = generation_names(generation)
+        pipeline = redis_client.pipeline(transaction=False)
+        for i, prize in enumerate(added + changed, 1):
+            prize["year"] = int(prize["year"])
+            pipeline.json().set(name=f'{prefix}{prize_id(prize)}',
+                                path=Path.root_path(), obj=prize)
+            if i % batch_size == 0:
+                pipeline.execute()
+        for i in range(0, len(removed), batch_size):
+            pipeline.unlink(*(f'{prefix}{key}'
+                              for key in removed[i:i + batch_size]))
+        pipeline.execute()
+
+        name_index_key = f"{NAME_INDEX_KEY}:{generation}"
+        displays_key = f"{NAME_DISPLAY_KEY}:{generation}"
+        if not create_name_index(redis_client, prizes, name_index_key,
+                                 displays_key):
+            return False
+        counts_key = f"{LAUREATE_COUNTS_KEY}:{generation}"
+        counts = build_laureate_counts(prizes)
+        redis_client.delete(counts_key)
+        if counts:
+            redis_client.hset(counts_key, mapping=counts)
+
+        # The version changes with the content, so caches invalidate
+        hashes = {prize_id(prize): prize_hash(prize)
+                  for prize in added + changed}
+        current_hashes = {key: value for key, value in
+                          {**stored_hashes, **hashes}.items()
+                          if key not in removed}
+        digest = hashlib.sha1(json.dumps(sorted(current_hashes.items()))
+                              .encode()).hexdigest()
+        transaction = redis_client.pipeline(transaction=True)
+        if hashes:
+            transaction.hset(PRIZE_HASHES_KEY, mapping=hashes)
+        if removed:
+            transaction.hdel(PRIZE_HASHES_KEY, *removed)
+        transaction.rename(name_index_key, NAME_INDEX_KEY)
+        transaction.rename(displays_key, NAME_DISPLAY_KEY)
+        if counts:
+            transaction.rename(counts_key, LAUREATE_COUNTS_KEY)
+        else:
+            transaction.delete(LAUREATE_COUNTS_KEY)
+        transaction.set(DATASET_VERSION_KEY,
+                        f"{generation}.{digest[:12]}")
+        transaction.execute()
+        return True
+    except redis.RedisError as e:
+        print(f"Redis error: {e}")
+        return False
+
+def load_dataset(redis_client: redis.Redis, prizes) -> bool:
+    """Stream prizes into a new generation and switch readers to it."""
+    # Load the new data as a new generation next to the live one
+    generation = redis_client.incr(GENERATION_KEY)
+    prefix, index_name = generation_names(generation)
+    name_index_key = f"{NAME_INDEX_KEY}:{generation}"
+    hashes_key = f"{PRIZE_HASHES_KEY}:{generation}"
+    counts_key = f"{LAUREATE_COUNTS_KEY}:{generation}"
+    displays_key = f"{NAME_DISPLAY_KEY}:{generation}"
+    print(f"Loading dataset generation {generation}")
+
+    # Create index first
+    if not create_search_index(redis_client, index_name, prefix):
+        return False
+
+    # Then save data, with the name lookup index, the prize hashes and the
+    # laureate counts
+    if not save_to_redis(redis_client, prizes, 2013, 2023, prefix,
+                         name_index_key, hashes_key,
+                         counts_key=counts_key, displays_key=displays_key):
+        return False
+
+    # Switch readers to the new generation and stamp the dataset
+    # version so that service caches invalidate
+    if not switch_dataset(redis_client, generation, name_index_key,
+                          hashes_key, counts_key, displays_key):
+        return False
+    remove_old_generations(redis_client, generation)
+    return True
+
 def main():
+    parser = argparse.ArgumentParser(
+        description="Load the Nobel Prize data into Redis")
+    parser.add_argument("--sync", action="store_true",
+                        help="Only write the prizes changed since the last "
+                             "run, skipping unchanged data (HTTP 304)")
+    parser.add_argument("--api-url", default=API_URL,
+                        help="Prize data URL (default: $NOBEL_API_URL or "
+                             "the Nobel Prize API)")
+    parser.add_argument("--data-file",
+                        help="Load a local prize.json instead of the API")
+    args = parser.parse_args()
+
     if not all([REDIS_HOST, REDIS_PORT, REDIS_PASSWORD]):
         print("Missing required Redis configuration in .env file")
         return
 
-    print("Fetching Nobel Prize data...")
-    data = fetch_nobel_prize_data(API_URL)
-    if not data:
-        print("Failed to fetch Nobel Prize data")
-        return
-
     try:
         redis_client = redis.Redis(
             host=REDIS_HOST,
@@ -152,21 +623,49 @@ def main():
         redis_client.ping()
         print("Connected to Redis Cloud successfully")
 
-        # Create index first
-        if not create_search_index(redis_client):
-            return
+        if args.data_file:
+            source = args.data_file
+            prizes, validators = iter_prizes_from_file(args.data_file), {}
+        else:
+            # Validators of the last response are only reused in sync
+            # mode, for the same URL
+            source = args.api_url
+            validators = {}
+            if args.sync:
+                validators = redis_client.hgetall(SYNC_STATE_KEY)
+                if validators.get('url') != source:
+                    validators = {}
+
+            print("Fetching Nobel Prize data...")
+            status, prizes, validators = fetch_changed_prize_data(
+                args.api_url, validators)
+            if status == 304:
+                print("Nobel Prize data not modified since the last sync")
+                return
+            if prizes is None:
+                print("Failed to fetch Nobel Prize data")
+                return
 
-        # Then save data
-        if not save_to_redis(redis_client, data, 2013, 2023):
+        if args.sync and can_sync(redis_client):
+            loaded = sync_to_redis(redis_client, prizes, 2013, 2023)
+        else:
+            if args.sync:
+                print("No synced dataset found, loading all prizes")
+            loaded = load_dataset(redis_client, prizes)
+        if not loaded:
             return
+        redis_client.hset(SYNC_STATE_KEY,
+                          mapping=dict(validators, url=source))
 
         # Verify data was indexed
-        result = redis_client.ft("prizeIdx").search("*")
+        result = redis_client.ft(INDEX_ALIAS).search("*")
         print(f"Found {result.total} documents in index")
 
         print("Data processing completed successfully")
     except redis.ConnectionError as e:
         print(f"Redis connection error: {e}")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error reading Nobel Prize data: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
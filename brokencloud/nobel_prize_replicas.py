@@ -0,0 +1,180 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Latency-aware routing of reads across a Redis primary and its
+#              read replicas. A background thread pings every endpoint and
+#              keeps an exponentially weighted moving average (EWMA) of its
+#              round-trip time; reads go to the healthy endpoint with the
+#              lowest average. Endpoints whose reads or pings keep failing
+#              are ejected, and return once a ping succeeds again.
+
+import os
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import redis
+from dotenv import load_dotenv
+
+# Loading variables from .env file
+load_dotenv()
+
+# Constants
+REDIS_REPLICAS = os.getenv("REDIS_REPLICAS", "")
+REPLICA_EWMA_ALPHA = float(os.getenv("REPLICA_EWMA_ALPHA", "0.3"))
+REPLICA_EJECT_AFTER = int(os.getenv("REPLICA_EJECT_AFTER", "3"))
+REPLICA_PROBE_INTERVAL = float(os.getenv("REPLICA_PROBE_INTERVAL", "1"))
+REPLICA_PROBE_TIMEOUT = float(os.getenv("REPLICA_PROBE_TIMEOUT", "1"))
+
+
+def parse_endpoints(value: str) -> List[Tuple[str, int]]:
+    """
+    Parse a comma separated list of host:port endpoints.
+
+    Args:
+        value: e.g. "replica-1:6379,replica-2:6379"; the port defaults to
+               6379
+    """
+    endpoints = []
+    for endpoint in value.split(','):
+        endpoint = endpoint.strip()
+        if not endpoint:
+            continue
+        host, _, port = endpoint.rpartition(':') if ':' in endpoint \
+            else (endpoint, '', '6379')
+        endpoints.append((host, int(port)))
+    return endpoints
+
+
+class Endpoint:
+    """Health and latency state of one Redis endpoint."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.ewma_ns = None  # None until the first successful ping
+        self.healthy = True
+        self.failures = 0  # Consecutive failed reads or pings
+        self.reads = 0
+        self.errors = 0
+        self.ejections = 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+class ReplicaRouter:
+    def __init__(self, endpoints: Sequence[Tuple[str, int]],
+                 password: str = None, alpha: float = REPLICA_EWMA_ALPHA,
+                 eject_after: int = REPLICA_EJECT_AFTER,
+                 probe_interval: float = REPLICA_PROBE_INTERVAL,
+                 probe_timeout: float = REPLICA_PROBE_TIMEOUT):
+        """
+        Start tracking the latency and health of the endpoints.
+
+        Args:
+            endpoints: (host, port) of the primary followed by the replicas
+            password: Password of the endpoints
+            alpha: Weight of the newest ping in the moving average
+            eject_after: Consecutive failures that eject an endpoint
+            probe_interval: Seconds between two pings of every endpoint,
+                            0 disables the background probing
+            probe_timeout: Seconds a ping may take before it fails
+        """
+        self._lock = threading.Lock()
+        self.endpoints = [Endpoint(host, port) for host, port in endpoints]
+        self.alpha = alpha
+        self.eject_after = eject_after
+        self.probe_interval = probe_interval
+        # Pings use their own connections, never queued behind queries
+        self._probe_clients = [
+            redis.Redis(host=host, port=port, password=password,
+                        socket_timeout=probe_timeout,
+                        socket_connect_timeout=probe_timeout)
+            for host, port in endpoints
+        ]
+        self._stop = threading.Event()
+        if probe_interval > 0:
+            threading.Thread(target=self._probe_loop, daemon=True,
+                             name="redis-replica-probe").start()
+
+    def pick(self, exclude: Sequence[int] = ()) -> int:
+        """
+        Return the index of the endpoint the next read should use.
+
+        The healthy endpoint with the lowest average wins; endpoints not
+        measured yet count as the fastest. If every endpoint is ejected,
+        they are all tried anyway rather than failing the read.
+
+        Args:
+            exclude: Endpoints that already failed this read
+        """
+        with self._lock:
+            candidates = [index for index, endpoint
+                          in enumerate(self.endpoints)
+                          if endpoint.healthy and index not in exclude]
+            if not candidates:
+                candidates = [index for index in range(len(self.endpoints))
+                              if index not in exclude] or [0]
+            return min(candidates,
+                       key=lambda index: self.endpoints[index].ewma_ns or 0)
+
+    def record_read(self, index: int):
+        """Record a successful read from an endpoint."""
+        with self._lock:
+            endpoint = self.endpoints[index]
+            endpoint.reads += 1
+            endpoint.failures = 0
+
+    def record_failure(self, index: int):
+        """Record a failed read or ping, ejecting the endpoint if needed."""
+        with self._lock:
+            endpoint = self.endpoints[index]
+            endpoint.errors += 1
+            endpoint.failures += 1
+            if endpoint.healthy and endpoint.failures >= self.eject_after:
+                endpoint.healthy = False
+                endpoint.ejections += 1
+                print(f"Redis endpoint {endpoint.name} ejected after "
+                      f"{endpoint.failures} failures")
+
+    def probe(self, index: int):
+        """Ping an endpoint, updating its average or recording a failure."""
+        start = time.perf_counter_ns()
+        try:
+            self._probe_clients[index].ping()
+        except redis.RedisError:
+            self.record_failure(index)
+            return
+        elapsed = time.perf_counter_ns() - start
+        with self._lock:
+            endpoint = self.endpoints[index]
+            endpoint.ewma_ns = elapsed if endpoint.ewma_ns is None else \
+                self.alpha * elapsed + (1 - self.alpha) * endpoint.ewma_ns
+            endpoint.failures = 0
+            if not endpoint.healthy:
+                endpoint.healthy = True
+                print(f"Redis endpoint {endpoint.name} restored")
+
+    def _probe_loop(self):
+        while True:
+            for index in range(len(self.endpoints)):
+                self.probe(index)
+            if self._stop.wait(self.probe_interval):
+                return
+
+    def close(self):
+        """Stop probing the endpoints."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, float]:
+        """Return the state of every endpoint, by position."""
+        stats = {}
+        with self._lock:
+            for index, endpoint in enumerate(self.endpoints):
+                prefix = f"endpoint{index}"
+                stats[f"{prefix}_ewma_seconds"] = (endpoint.ewma_ns or 0) / 1e9
+                stats[f"{prefix}_healthy"] = int(endpoint.healthy)
+                stats[f"{prefix}_reads_total"] = endpoint.reads
+                stats[f"{prefix}_errors_total"] = endpoint.errors
+                stats[f"{prefix}_ejections_total"] = endpoint.ejections
+        return stats
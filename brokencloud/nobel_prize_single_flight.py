@@ -0,0 +1,118 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Request coalescing ("single-flight") for the gRPC service.
+#              While a backend call for a request is in progress, identical
+#              requests arriving in the meantime wait for that call and share
+#              its result instead of each querying Redis. The response cache
+#              only helps once a response is stored; this covers the burst of
+#              identical misses before that, e.g. a dashboard refresh.
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """A backend call in progress and the requests waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize a coalescing layer for threaded callers.
+
+        Args:
+            enabled: Coalesce identical calls; when False every call runs
+        """
+        self.enabled = enabled
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, compute: Callable[[], object]):
+        """
+        Return the result of compute, sharing it with identical callers.
+
+        The first caller of a key runs compute; callers of the same key
+        arriving before it returns wait and get the same value, or the
+        same exception.
+
+        Args:
+            key: Hashable identity of the request
+            compute: Callable producing the result
+
+        Returns:
+            The result of the shared call
+        """
+        if not self.enabled:
+            return compute()
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the call counters and the calls currently in flight."""
+        with self._lock:
+            return {
+                'calls_total': self.calls,
+                'collapsed_total': self.collapsed,
+                'in_flight': len(self._calls),
+            }
+
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    SingleFlight for coroutines of one event loop.
+
+    The shared call runs as its own task, so a waiting RPC that is
+    cancelled does not cancel the call the others are waiting on.
+    """
+
+    async def do(self, key: Hashable,
+                 compute: Callable[[], Awaitable[object]]):
+        """Await the result of compute, sharing it with identical callers."""
+        if not self.enabled:
+            return await compute()
+
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(compute())
+            task.add_done_callback(lambda _: self._finish(key, task))
+            self.calls += 1
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        self._calls.pop(key, None)
+        # Mark the error retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,228 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: An in-process, read-only snapshot of the Nobel prize data that
+#              answers the same queries as NobelPrizeClient without Redis.
+#              Prizes are stored column by column in compact arrays and the
+#              category/year-range count is served from a prefix-sum table.
+# DEPENDENCY: A local copy of the Nobel prize data (« data/prize.json »),
+#             which can be downloaded with « tests/get_data.py ».
+
+import json
+import os
+from array import array
+from typing import Any, List, Dict, Tuple
+from nobel_prize_motivation_index import CountCache, MotivationIndex
+from nobel_prize_name_index import NameIndex
+from nobel_prize_trigram_index import (
+    SEARCH_LIMIT,
+    TrigramIndex,
+    laureate_match
+)
+
+# Constants
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data',
+                         'prize.json')
+FROM_YEAR = 2013
+TO_YEAR = 2023
+
+
+class NobelPrizeSnapshotClient:
+    # Built from the name index on the first name search
+    trigram_index = None
+
+    def __init__(self, data_path: str = DATA_PATH, from_year: int = FROM_YEAR,
+                 to_year: int = TO_YEAR):
+        """Load the prize data file into columnar in-memory arrays."""
+        with open(data_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        self.version = str(os.stat(data_path).st_mtime_ns)
+        self.from_year = from_year
+        self.to_year = to_year
+        # Filtered here rather than with filter_prize_by_year so that the
+        # snapshot does not import the Redis and HTTP clients
+        prizes = [prize for prize in data.get('prizes', [])
+                  if from_year <= int(prize['year']) <= to_year]
+        self._load_columns(prizes)
+        self._build_prefix_sums()
+        self.motivation_index = MotivationIndex(
+            self.motivation(laureate)
+            for laureate in range(len(self.laureate_prizes))
+        )
+        self.motivation_counts = CountCache(self.motivation_index)
+        self.name_index = NameIndex(prizes)
+
+    def _load_columns(self, prizes: List[Dict]):
+        """
+        Store the prizes as parallel columns.
+
+        Prize columns (one row per prize): year, category code, laureate
+        count and the offset of the prize's first laureate. Laureate columns
+        (one row per laureate): the owning prize row, first name, surname and
+        the start offset of the motivation inside one shared text buffer.
+        """
+        self.categories: List[str] = []
+        category_codes: Dict[str, int] = {}
+
+        self.years = array('H')
+        self.category_codes = array('B')
+        self.laureate_counts = array('H')
+        self.laureate_offsets = array('I', [0])
+
+        self.laureate_prizes = array('I')
+        self.firstnames: List[str] = []
+        self.surnames: List[str] = []
+        self.motivation_offsets = array('I', [0])
+        motivations = []
+        text_length = 0
+
+        for row, prize in enumerate(prizes):
+            category = prize['category'].lower()
+            if category not in category_codes:
+                category_codes[category] = len(self.categories)
+                self.categories.append(category)
+            laureates = prize.get('laureates', [])
+
+            self.years.append(int(prize['year']))
+            self.category_codes.append(category_codes[category])
+            self.laureate_counts.append(len(laureates))
+
+            for laureate in laureates:
+                motivation = laureate.get('motivation', '')
+                self.laureate_prizes.append(row)
+                self.firstnames.append(laureate.get('firstname', ''))
+                self.surnames.append(laureate.get('surname', ''))
+                motivations.append(motivation)
+                text_length += len(motivation)
+                self.motivation_offsets.append(text_length)
+            self.laureate_offsets.append(len(self.laureate_prizes))
+
+        self.category_index = category_codes
+        self.motivation_text = ''.join(motivations)
+
+    def _build_prefix_sums(self):
+        """
+        Build one cumulative laureate count per category and year.
+
+        ``prefix_sums[code][i]`` holds the number of laureates in the
+        category awarded before ``from_year + i``, so any inclusive year range
+        is answered with two lookups.
+        """
+        span = self.to_year - self.from_year + 1
+        per_year = [[0] * span for _ in self.categories]
+        for year, code, count in zip(self.years, self.category_codes,
+                                     self.laureate_counts):
+            per_year[code][year - self.from_year] += count
+
+        self.prefix_sums = []
+        for counts in per_year:
+            table = array('I', [0])
+            for count in counts:
+                table.append(table[-1] + count)
+            self.prefix_sums.append(table)
+
+    def dataset_version(self) -> str:
+        """Return the version of the loaded data file."""
+        return self.version
+
+    def motivation(self, laureate: int) -> str:
+        """Return the motivation text of a laureate row."""
+        return self.motivation_text[self.motivation_offsets[laureate]:
+                                    self.motivation_offsets[laureate + 1]]
+
+    def count_laureates_by_category_and_years(self, category: str, start_year:
+                                              int, end_year: int) -> int:
+        """
+        Count total number of laureates in a given category between specific
+        years.
+
+        Args:
+            category: Prize category (e.g., 'Physics', 'Chemistry')
+            start_year: Starting year (>= 2013)
+            end_year: Ending year (<= 2023)
+
+        Returns:
+            Total number of laureates found
+        """
+        # Validate year range
+        if not (self.from_year <= start_year <= end_year <= self.to_year):
+            raise ValueError(f"Years must be between {self.from_year} and "
+                             f"{self.to_year}")
+
+        code = self.category_index.get(category.lower())
+        if code is None:
+            return 0
+        table = self.prefix_sums[code]
+        return (table[end_year - self.from_year + 1] -
+                table[start_year - self.from_year])
+
+    def count_laureates_by_motivation_keyword(self, keyword: str) -> int:
+        """
+        Count laureates whose motivation contains a specific keyword.
+
+        Args:
+            keyword: Word or phrase to search in motivations, a trailing '*'
+                     matches every word starting with the keyword
+
+        Returns:
+            Total number of laureates with matching motivations
+        """
+        return self.motivation_counts(keyword)
+
+    def get_laureate_details_by_name(self, firstname: str,
+                             surname: str) -> List[Dict[str, str]]:
+        """
+        Find prize details for a laureate by their full name, ignoring case
+        and accents.
+
+        Args:
+            firstname: Laureate's first name
+            surname: Laureate's last name
+
+        Returns:
+            List of dictionaries containing year, category, and motivation
+            for each prize
+        """
+        return self.name_index.lookup(firstname, surname)
+
+    def search_laureates_by_name(self, query: str, limit: int = SEARCH_LIMIT
+                                 ) -> List[Dict[str, Any]]:
+        """
+        Find the laureates whose name is closest to a possibly misspelled
+        or partial name.
+
+        Args:
+            query: Full or partial name, e.g. 'Marie Cury' or 'ferenc kr'
+            limit: Largest number of laureates returned
+
+        Returns:
+            List of dictionaries with the first name, surname, score and
+            prize details of each laureate, best match first
+        """
+        if self.trigram_index is None:
+            self.trigram_index = TrigramIndex(self.name_index.index,
+                                              self.name_index.displays)
+        return [laureate_match(match, list(self.name_index.index[match.key]))
+                for match in self.trigram_index.search(query, limit)]
+
+    def run_batch(self, queries: List[Tuple[str, tuple]]) -> List[Any]:
+        """
+        Run several queries.
+
+        Args:
+            queries: (method name, arguments) pairs
+
+        Returns:
+            One result per query in request order; a failed query's result
+            is the exception it raised
+        """
+        # Imported here so that loading a snapshot does not import redis
+        from nobel_prize_client import QUERY_METHODS
+
+        results: List[Any] = []
+        for method, args in queries:
+            try:
+                if method not in QUERY_METHODS:
+                    raise ValueError(f"Unknown query '{method}'")
+                results.append(getattr(self, method)(*args))
+            except (ValueError, TypeError) as e:
+                results.append(e)
+        return results
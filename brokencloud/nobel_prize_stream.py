@@ -0,0 +1,135 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Incremental parser yielding the prizes of a prize.json
+#              document one at a time from a stream of byte chunks (a file or
+#              an HTTP response body). Only the prize being parsed and one
+#              chunk are held in memory, so memory stays flat whatever the
+#              size of the document.
+
+import codecs
+import json
+import re
+from typing import Iterable, Iterator
+
+# Constants
+CHUNK_SIZE = 64 * 1024
+MAX_VALUE_SIZE = 64 * 1024**2  # Largest single value, guards bad input
+WHITESPACE = " \t\n\r"
+DELIMITERS = re.compile(r"[\s,\]}]")
+
+
+class _Buffer:
+    """Decoded text of a chunk stream with a read position."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ""
+        self.position = 0
+        self.finished = False
+
+    def fill(self) -> bool:
+        """
+        Append the next chunk, dropping the text already consumed.
+
+        Returns:
+            False once the stream is exhausted
+        """
+        if self.finished:
+            return False
+        self.text = self.text[self.position:]
+        self.position = 0
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.text += self.decoder.decode(b"", final=True)
+            self.finished = True
+        else:
+            self.text += self.decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, '' at the end."""
+        while True:
+            while (self.position < len(self.text) and
+                   self.text[self.position] in WHITESPACE):
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consume the next non-whitespace character, one of characters."""
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"Expected one of {characters!r}, found "
+                             f"{character or 'end of input'!r}")
+        self.position += 1
+        return character
+
+    def value(self, decoder: json.JSONDecoder):
+        """Decode the next JSON value, reading chunks until it is complete."""
+        if self.peek() not in '{["':
+            # A number or literal is only complete once followed by a
+            # delimiter, it may continue in the next chunk
+            while not self.finished and not DELIMITERS.search(
+                    self.text, self.position):
+                self.fill()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.position)
+            except json.JSONDecodeError:
+                if len(self.text) - self.position > MAX_VALUE_SIZE or \
+                        not self.fill():
+                    raise
+                continue
+            self.position = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str = "prizes"
+                    ) -> Iterator:
+    """
+    Yield the items of an array member of a top-level JSON object.
+
+    Args:
+        chunks: UTF-8 encoded JSON document, in chunks of any size
+        key: Member holding the array, other members are skipped
+
+    Yields:
+        Each item of the array, decoded
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        name = buffer.value(decoder)
+        buffer.expect(":")
+        if name == key:
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.position += 1
+            else:
+                while True:
+                    yield buffer.value(decoder)
+                    if buffer.expect(",]") == "]":
+                        break
+        else:
+            buffer.value(decoder)
+        if buffer.expect(",}") == "}":
+            return
+
+
+def iter_file_chunks(path: str, chunk_size: int = CHUNK_SIZE
+                     ) -> Iterator[bytes]:
+    """Yield the content of a file in chunks."""
+    with open(path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def iter_prizes_from_file(path: str, chunk_size: int = CHUNK_SIZE
+                          ) -> Iterator[dict]:
+    """Yield the prizes of a local prize.json file one at a time."""
+    return iter_json_array(iter_file_chunks(path, chunk_size))
@@ -0,0 +1,142 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Generator of synthetic prize.json datasets at any multiple of
+#              the real data volume, for scaling benchmarks. Each synthetic
+#              prize copies the year, category and laureate count of a
+#              randomly drawn real prize, so the category mix and laureate
+#              counts follow the real data. Laureate names are drawn from the
+#              real first names and surnames, and motivations are generated
+#              by a word-level Markov chain trained on the real motivations.
+#
+# Example:
+#   python3 nobel_prize_synthetic.py --scale 100 --output prize_100x.json
+
+import argparse
+import json
+import random
+from typing import Dict, List
+
+from nobel_prize_snapshot import DATA_PATH
+
+# Constants
+MAX_MOTIVATION_WORDS = 40
+END = None  # End of motivation marker of the Markov chain
+
+
+class SyntheticPrizeGenerator:
+    def __init__(self, data_path: str = DATA_PATH, seed: int = None):
+        """
+        Learn the shape of the real data.
+
+        Args:
+            data_path: Real prize data file the distributions are drawn from
+            seed: Random seed, for reproducible datasets
+        """
+        with open(data_path, 'r', encoding='utf-8') as file:
+            self.templates = json.load(file)['prizes']
+        self.random = random.Random(seed)
+
+        laureates = [laureate for prize in self.templates
+                     for laureate in prize.get('laureates', [])]
+        self.firstnames = [laureate['firstname'] for laureate in laureates
+                           if laureate.get('firstname')]
+        self.surnames = [laureate['surname'] for laureate in laureates
+                         if laureate.get('surname')]
+
+        # Next words of every word, repeated as often as they follow it
+        self.transitions: Dict[str, List[str]] = {}
+        self.first_words: List[str] = []
+        for laureate in laureates:
+            words = laureate.get('motivation', '').strip('"').split()
+            if not words:
+                continue
+            self.first_words.append(words[0])
+            for word, following in zip(words, words[1:] + [END]):
+                self.transitions.setdefault(word, []).append(following)
+
+    def motivation(self) -> str:
+        """Generate a motivation with the real vocabulary and word order."""
+        word = self.random.choice(self.first_words)
+        words = [word]
+        while len(words) < MAX_MOTIVATION_WORDS:
+            word = self.random.choice(self.transitions[word])
+            if word is END:
+                break
+            words.append(word)
+        return '"' + ' '.join(words) + '"'
+
+    def prize(self, number: int) -> Dict:
+        """
+        Generate one prize document in the API format.
+
+        Args:
+            number: Sequence number, which makes the prize id unique
+        """
+        template = self.random.choice(self.templates)
+        prize = {
+            'id': f"synthetic-{number}",
+            'year': template['year'],
+            'category': template['category'],
+        }
+        count = len(template.get('laureates', []))
+        if not count:
+            prize['overallMotivation'] = template.get('overallMotivation', '')
+            return prize
+
+        # Co-laureates usually share their prize's motivation
+        motivation = self.motivation()
+        prize['laureates'] = [
+            {
+                'id': f"{number}-{position}",
+                'firstname': self.random.choice(self.firstnames),
+                'surname': self.random.choice(self.surnames),
+                'motivation': motivation,
+                'share': str(count),
+            }
+            for position in range(count)
+        ]
+        return prize
+
+    def write(self, path: str, scale: float, from_year: int = 2013,
+              to_year: int = 2023) -> Dict:
+        """
+        Write a dataset of scale times the real number of prizes.
+
+        Prizes are written one at a time, so any scale fits in memory.
+
+        Returns:
+            Number of prizes written and of prizes between the two years
+        """
+        total = max(1, round(len(self.templates) * scale))
+        in_range = 0
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('{"prizes": [\n')
+            for number in range(total):
+                prize = self.prize(number)
+                if from_year <= int(prize['year']) <= to_year:
+                    in_range += 1
+                if number:
+                    file.write(',\n')
+                json.dump(prize, file, ensure_ascii=False)
+            file.write('\n]}\n')
+        return {'prizes': total, 'in_range': in_range}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic Nobel prize dataset")
+    parser.add_argument("--scale", type=float, default=10.0,
+                        help="Multiple of the real number of prizes")
+    parser.add_argument("--output", default="prize_synthetic.json")
+    parser.add_argument("--data-file", default=DATA_PATH,
+                        help="Real prize data to learn from")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    generator = SyntheticPrizeGenerator(args.data_file, args.seed)
+    stats = generator.write(args.output, args.scale)
+    print(f"Wrote {stats['prizes']} prizes ({stats['in_range']} between "
+          f"2013 and 2023) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: A trigram index over normalized laureate names for typo
+#              tolerant name search. Every word of a name is padded and cut
+#              into its three-character slices (« curie » gives « __c »,
+#              « _cu », « cur », « uri », « rie », « ie_ »), so a misspelled
+#              word still shares most of its trigrams with the right one.
+#              The last word of a query is not padded at its end, so a
+#              partly typed word matches every word it starts.
+#
+# The trigrams index the distinct words of the names rather than the names:
+# a larger dataset mostly adds names made of words already seen, so the
+# word vocabulary, and the cost of matching a query word against it, grows
+# far slower than the number of names. Each query word is expanded to its
+# closest words, and the names holding them are scored from the postings
+# of those words only.
+
+import re
+from array import array
+from collections import Counter
+from heapq import heappop, heappush, nsmallest
+from itertools import chain, islice
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple
+)
+
+from nobel_prize_name_index import normalize_name
+
+# Constants
+WORD_PATTERN = re.compile(r"\w+")
+MIN_SIMILARITY = 0.5
+MIN_WORD_SIMILARITY = 0.3
+WORD_EXPANSIONS = 16
+SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+
+
+class NameMatch(NamedTuple):
+    key: str            # Name index key, « firstname|surname »
+    score: float        # Share of the query's trigrams found in the name
+    firstname: str      # First name as stored
+    surname: str        # Surname as stored
+
+
+def name_words(name: str) -> List[str]:
+    """Split a name into normalized words, ignoring hyphens and dots."""
+    return WORD_PATTERN.findall(normalize_name(name))
+
+
+def trigrams(word: str, prefix: bool = False) -> FrozenSet[str]:
+    """
+    Return the trigrams of a padded word.
+
+    Args:
+        word: Normalized word
+        prefix: Leave the end of the word unpadded, for the last word of a
+                query
+    """
+    padded = f"  {word}" if prefix else f"  {word} "
+    return frozenset(padded[start:start + 3]
+                     for start in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    def __init__(self, keys: Iterable[str],
+                 displays: Dict[str, Sequence[str]] = None):
+        """
+        Build the index from name index keys.
+
+        Args:
+            keys: Keys of the name index (« firstname|surname », see
+                  name_key); the position of a key in the iterable is the
+                  name id stored in the postings
+            displays: Name key -> first name and surname as stored (see
+                      build_name_displays), returned with the matches; a
+                      key without one is returned normalized
+        """
+        self.displays = displays or {}
+        self.keys: List[str] = []
+        self.words: List[str] = []
+        word_ids: Dict[str, int] = {}
+        word_names: List[List[int]] = []
+        # Trigrams of every name, to rank names of equal score by length
+        self.name_sizes = array('H')
+
+        for name_id, key in enumerate(keys):
+            self.keys.append(key)
+            size = 0
+            for word in set(WORD_PATTERN.findall(key)):
+                if word not in word_ids:
+                    word_ids[word] = len(self.words)
+                    self.words.append(word)
+                    word_names.append([])
+                word_names[word_ids[word]].append(name_id)
+                size += len(word) + 1
+            self.name_sizes.append(min(size, 0xFFFF))
+
+        # Word postings: word id -> ids of the names holding the word
+        self.word_names: List[FrozenSet[int]] = [frozenset(name_ids)
+                                                 for name_ids in word_names]
+        # The same postings ordered by name size, shortest first
+        self.word_names_by_size: List[array] = [
+            array('I', sorted(name_ids, key=self.name_sizes.__getitem__))
+            for name_ids in word_names
+        ]
+        # Trigram postings: trigram -> ids of the words holding it
+        postings: Dict[str, List[int]] = {}
+        self.word_sizes = array('B')
+        for word_id, word in enumerate(self.words):
+            word_trigrams = trigrams(word)
+            self.word_sizes.append(min(len(word_trigrams), 0xFF))
+            for trigram in word_trigrams:
+                postings.setdefault(trigram, []).append(word_id)
+        self.postings: Dict[str, array] = {
+            trigram: array('I', ids) for trigram, ids in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def expand(self, word: str, prefix: bool = False) -> List[Tuple[int, int]]:
+        """
+        Return the indexed words closest to a query word.
+
+        Words are ranked by the number of the query word's trigrams they
+        hold, then by how close their length is to the query word's, so a
+        word typed in full ranks its exact match first, a misspelled one
+        the words of its length and a prefix its shortest completions.
+
+        Args:
+            word: Normalized query word
+            prefix: The word may be incomplete
+
+        Returns:
+            Up to WORD_EXPANSIONS (word id, shared trigrams) pairs, best
+            first, sharing at least MIN_WORD_SIMILARITY of the trigrams
+        """
+        query_trigrams = trigrams(word, prefix)
+        shared = Counter(chain.from_iterable(
+            self.postings.get(trigram, ()) for trigram in query_trigrams))
+        size = len(query_trigrams)
+        least = max(1, MIN_WORD_SIMILARITY * size)
+        closest = nsmallest(
+            WORD_EXPANSIONS,
+            ((-count, abs(self.word_sizes[word_id] - size), word_id)
+             for word_id, count in shared.items() if count >= least))
+        return [(word_id, -count) for count, _, word_id in closest]
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT,
+               min_similarity: float = MIN_SIMILARITY) -> List[NameMatch]:
+        """
+        Return the names closest to a query, best first.
+
+        A name scores the share of the query's trigrams held by its
+        closest word to every query word. Names of equal score are ranked
+        shortest first.
+
+        Args:
+            query: Name, full or partial, as typed, e.g. « mari cur »
+            limit: Largest number of matches returned
+            min_similarity: Smallest score of a match, between 0 and 1
+
+        Returns:
+            List of NameMatch
+        """
+        query_words = name_words(query)
+        if not query_words or limit <= 0:
+            return []
+        last = len(query_words) - 1
+        total = sum(len(trigrams(word, position == last))
+                    for position, word in enumerate(query_words))
+        # Options of every query word: its expansions, then no word at all
+        options = [self.expand(word, position == last) + [(None, 0)]
+                   for position, word in enumerate(query_words)]
+
+        least = max(min_similarity * total, 1)
+        seen = set()
+        ranked = []
+        for shared, word_ids in self._combinations(options):
+            if shared < least:
+                break
+            if len(ranked) >= limit and -shared > ranked[limit - 1][0]:
+                break
+            # The names of a combination share its score, only the limit
+            # shortest not ranked yet can be returned
+            if len(word_ids) == 1:
+                found = islice((name_id for name_id
+                                in self.word_names_by_size[word_ids[0]]
+                                if name_id not in seen), limit)
+            else:
+                names = sorted((self.word_names[word_id]
+                                for word_id in word_ids), key=len)
+                found = sorted(names[0].intersection(*names[1:]) - seen,
+                               key=self.name_sizes.__getitem__)[:limit]
+            for name_id in found:
+                seen.add(name_id)
+                ranked.append((-shared, self.name_sizes[name_id],
+                               self.keys[name_id]))
+            if len(ranked) >= limit:
+                ranked = nsmallest(limit, ranked)
+        return [NameMatch(key, -shared / total, *self.display(key))
+                for shared, _, key in nsmallest(limit, ranked)]
+
+    def display(self, key: str) -> Tuple[str, str]:
+        """Return the first name and surname of a name key as stored."""
+        display = self.displays.get(key)
+        if display:
+            return display[0], display[1]
+        firstname, surname = key.split('|', 1)
+        return firstname, surname
+
+    @staticmethod
+    def _combinations(options: List[List[Tuple[int, int]]]
+                      ) -> Iterator[Tuple[int, List[int]]]:
+        """
+        Yield one word option per query word, best combinations first.
+
+        Args:
+            options: Every query word's (word id, shared trigrams) options,
+                     best first; a None word id matches any name
+
+        Yields:
+            Total shared trigrams and the distinct word ids of the
+            combination; combinations giving one word to several query
+            words are skipped
+        """
+        def total(choice):
+            return sum(options[position][index][1]
+                       for position, index in enumerate(choice))
+
+        first = (0,) * len(options)
+        heap = [(-total(first), first)]
+        queued = {first}
+        while heap:
+            shared, choice = heappop(heap)
+            word_ids = [options[position][index][0]
+                        for position, index in enumerate(choice)]
+            word_ids = [word_id for word_id in word_ids
+                        if word_id is not None]
+            # A name word counts for one query word at most, so that a
+            # query repeating a word does not score it twice
+            if word_ids and len(set(word_ids)) == len(word_ids):
+                yield -shared, word_ids
+            for position, index in enumerate(choice):
+                if index + 1 < len(options[position]):
+                    following = (choice[:position] + (index + 1,) +
+                                 choice[position + 1:])
+                    if following not in queued:
+                        queued.add(following)
+                        heappush(heap, (-total(following), following))
+
+
+def laureate_match(match: NameMatch, details: List[Dict]) -> Dict:
+    """
+    Return a name search match in the form returned by the clients.
+
+    Args:
+        match: Match found in a TrigramIndex
+        details: Prize details stored under the match's name index key
+
+    Returns:
+        Dictionary of the first name and surname as stored, which the
+        exact lookup normalizes back to the match's key, the score and the
+        prize details
+    """
+    return {
+        'firstname': match.firstname,
+        'surname': match.surname,
+        'score': match.score,
+        'details': details,
+    }
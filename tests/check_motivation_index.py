@@ -0,0 +1,125 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Checks the motivation index against a brute-force scan of the
+#              motivation texts. Word, phrase and prefix queries are run on
+#              MotivationIndex.search and on a plain token-by-token scan of
+#              every motivation, and the matching laureates must be the same.
+#              The queries are a fixed set covering prefixes, punctuation
+#              and quotes, plus random phrases and prefixes cut from the
+#              motivations themselves, up to phrases longer than the
+#              three-token shingles. Synthetic motivations are added to the
+#              real ones: their Markov word chains repeat the same token
+#              pairs far more often, which is what exposes a phrase wrongly
+#              accepted on its shingles alone. Fails if any query differs.
+#
+# Example:
+#   python3 check_motivation_index.py --queries 2000 --seed 7
+#   python3 check_motivation_index.py --synthetic-scale 0
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'brokencloud'))
+
+from nobel_prize_motivation_index import MotivationIndex  # noqa: E402
+from nobel_prize_synthetic import SyntheticPrizeGenerator  # noqa: E402
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data',
+                         'prize.json')
+WORD = re.compile(r"\w+")
+QUERIES = [
+    'discovery', 'discover*', 'Discoveries', 'quantum inf*', 'neutrino',
+    'for the discovery of', 'for the discovery of the', 'x-ray', 'X-Ray*',
+    '"for their', '"for their discoveries"', 'nobel\'s', 'co-workers',
+    'the development of methods for', 'of the', 'in recognition of his',
+    'a*', 'z*', 'unknownword', 'for the *', '', '   ', '*',
+]
+
+
+def brute_force(texts, query: str) -> frozenset:
+    """
+    Return the laureates matching a query by scanning every motivation.
+
+    Args:
+        texts: Lowercase tokens of every motivation
+        query: Word, phrase or prefix (trailing '*') query
+    """
+    prefix = query.rstrip().endswith('*')
+    words = WORD.findall(query.lower())
+    if not words:
+        return frozenset()
+    exact, last = (words[:-1], words[-1]) if prefix else (words, None)
+    size = len(exact) + (1 if prefix else 0)
+    laureates = set()
+    for laureate, tokens in enumerate(texts):
+        for start in range(len(tokens) - size + 1):
+            if exact and tokens[start] != exact[0]:
+                continue
+            if (tokens[start:start + len(exact)] == exact and
+                    (last is None or
+                     tokens[start + len(exact)].startswith(last))):
+                laureates.add(laureate)
+                break
+    return frozenset(laureates)
+
+
+def random_queries(texts, count: int, rng: random.Random):
+    """Cut phrases and prefixes of one to six tokens out of motivations."""
+    queries = []
+    while len(queries) < count:
+        tokens = rng.choice(texts)
+        if not tokens:
+            continue
+        size = rng.randint(1, min(6, len(tokens)))
+        start = rng.randrange(len(tokens) - size + 1)
+        phrase = tokens[start:start + size]
+        queries.append(' '.join(phrase))
+        cut = rng.randint(1, len(phrase[-1]))
+        queries.append(' '.join(phrase[:-1] + [phrase[-1][:cut] + '*']))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the motivation index with a brute-force scan")
+    parser.add_argument("--data-file", default=DATA_PATH)
+    parser.add_argument("--queries", type=int, default=1000,
+                        help="Random phrase and prefix queries checked")
+    parser.add_argument("--synthetic-scale", type=float, default=5.0,
+                        help="Synthetic prizes added, as a multiple of the "
+                             "real ones, 0 for none")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(args.data_file, 'r', encoding='utf-8') as file:
+        prizes = json.load(file)['prizes']
+    generator = SyntheticPrizeGenerator(args.data_file, seed=args.seed)
+    prizes += [generator.prize(number) for number
+               in range(round(len(prizes) * args.synthetic_scale))]
+    motivations = [laureate.get('motivation', '') for prize in prizes
+                   for laureate in prize.get('laureates', [])]
+    index = MotivationIndex(motivations)
+    texts = [WORD.findall(motivation.lower()) for motivation in motivations]
+
+    queries = QUERIES + random_queries(texts, args.queries,
+                                       random.Random(args.seed))
+    failures = 0
+    for query in queries:
+        expected = brute_force(texts, query)
+        found = index.search(query)
+        if found != expected:
+            failures += 1
+            print(f"MISMATCH {query!r}: index {len(found)}, scan "
+                  f"{len(expected)}, missing {sorted(expected - found)[:5]}, "
+                  f"extra {sorted(found - expected)[:5]}")
+    print(f"{len(queries)} queries over {len(motivations)} motivations, "
+          f"{failures} mismatches")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
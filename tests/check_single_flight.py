@@ -0,0 +1,162 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Checks the request coalescing of the gRPC service. A threaded
+#              and an async server are started in-process on a snapshot
+#              backend slowed down to emulate Redis latency, with the
+#              response cache off. Bursts of identical requests are sent
+#              concurrently, and the backend calls are compared with the
+#              requests: with single-flight, each burst of one query should
+#              cost one backend call. Fails if a result differs from the
+#              snapshot's or if nothing was collapsed.
+#
+# Example:
+#   python3 check_single_flight.py --burst 50 --delay-ms 50
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent import futures
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'brokencloud'))
+
+import grpc  # noqa: E402
+import nobel_prize_pb2_grpc  # noqa: E402
+from nobel_prize_cache import ResponseCache  # noqa: E402
+from nobel_prize_grpc_client import NobelPrizeGRPCClient  # noqa: E402
+from nobel_prize_grpc_server import (  # noqa: E402
+    AsyncNobelPrizeService,
+    NobelPrizeService
+)
+from nobel_prize_single_flight import (  # noqa: E402
+    AsyncSingleFlight,
+    SingleFlight
+)
+from nobel_prize_snapshot import NobelPrizeSnapshotClient  # noqa: E402
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data',
+                         'prize.json')
+QUERIES = [
+    ("count_laureates_by_category_and_years", ("physics", 2013, 2023)),
+    ("count_laureates_by_motivation_keyword", ("discovery",)),
+]
+
+
+class SlowSnapshotClient(NobelPrizeSnapshotClient):
+    """Snapshot backend counting its calls, each taking delay seconds."""
+
+    def __init__(self, data_path: str, delay: float):
+        super().__init__(data_path)
+        self.delay = delay
+        self.backend_calls = 0
+        self._lock = threading.Lock()
+
+    def _slow(self):
+        with self._lock:
+            self.backend_calls += 1
+        time.sleep(self.delay)
+
+    def count_laureates_by_category_and_years(self, *args) -> int:
+        self._slow()
+        return super().count_laureates_by_category_and_years(*args)
+
+    def count_laureates_by_motivation_keyword(self, *args) -> int:
+        self._slow()
+        return super().count_laureates_by_motivation_keyword(*args)
+
+
+def send_bursts(port: int, burst: int, rounds: int, expected: dict) -> int:
+    """Send rounds of concurrent identical requests, return the mismatches."""
+    client = NobelPrizeGRPCClient(port=port)
+    client.wait_for_ready()
+    mismatches = 0
+    try:
+        for _ in range(rounds):
+            for method, args in QUERIES:
+                results = client.fan_out([(method, args)] * burst)
+                mismatches += sum(result != expected[method]
+                                  for result in results)
+    finally:
+        client.close()
+    return mismatches
+
+
+def run_threaded(backend, flights, port: int, burst: int, rounds: int,
+                 expected: dict) -> int:
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=burst))
+    nobel_prize_pb2_grpc.add_NobelPrizeServiceServicer_to_server(
+        NobelPrizeService(backend, ResponseCache(max_entries=0), flights),
+        server)
+    server.add_insecure_port(f'127.0.0.1:{port}')
+    server.start()
+    try:
+        return send_bursts(port, burst, rounds, expected)
+    finally:
+        server.stop(0).wait()
+
+
+def run_async(backend, flights, port: int, burst: int, rounds: int,
+              expected: dict) -> int:
+    # The snapshot backend is synchronous: its calls run on the loop's
+    # default executor so the coroutines waiting on them interleave
+    class Service(AsyncNobelPrizeService):
+        async def _call(self, method, *args):
+            return await asyncio.get_running_loop().run_in_executor(
+                None, method, *args)
+
+    async def main():
+        server = grpc.aio.server()
+        nobel_prize_pb2_grpc.add_NobelPrizeServiceServicer_to_server(
+            Service(backend, ResponseCache(max_entries=0), flights), server)
+        server.add_insecure_port(f'127.0.0.1:{port}')
+        await server.start()
+        try:
+            return await asyncio.to_thread(send_bursts, port, burst, rounds,
+                                           expected)
+        finally:
+            await server.stop(0)
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that identical concurrent requests are coalesced")
+    parser.add_argument("--data-file", default=DATA_PATH)
+    parser.add_argument("--burst", type=int, default=50,
+                        help="Identical requests sent at once")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--delay-ms", type=float, default=50.0,
+                        help="Time every backend call takes")
+    parser.add_argument("--port", type=int, default=50071)
+    args = parser.parse_args()
+
+    snapshot = NobelPrizeSnapshotClient(args.data_file)
+    expected = {method: getattr(snapshot, method)(*query_args)
+                for method, query_args in QUERIES}
+    requests = args.burst * args.rounds * len(QUERIES)
+
+    failed = False
+    for mode, run, flight_class in (("threaded", run_threaded, SingleFlight),
+                                    ("async", run_async, AsyncSingleFlight)):
+        for enabled in (False, True):
+            backend = SlowSnapshotClient(args.data_file,
+                                         args.delay_ms / 1000)
+            flights = flight_class(enabled=enabled)
+            mismatches = run(backend, flights, args.port, args.burst,
+                             args.rounds, expected)
+            stats = flights.stats()
+            print(f"{mode:8} single-flight {'on ' if enabled else 'off'}  "
+                  f"requests {requests:5}  backend calls "
+                  f"{backend.backend_calls:5}  collapsed "
+                  f"{stats['collapsed_total']:5}  wrong results "
+                  f"{mismatches}")
+            if mismatches or (enabled and not stats['collapsed_total']):
+                failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,19 +4,22 @@
 #              in JSON format.
 
 import requests
-import json
-import os
 
 # URL for the Nobel Prize API
 API_URL = "https://api.nobelprize.org/v1/prize.json"
 OUTPUT_FILE = "prize.json"
 
-def fetch_nobel_prize_data(url):
+def download_nobel_prize_data(url, output_file, chunk_size=64 * 1024):
+    """Stream the response body to a file, without holding it in memory."""
     try:
-        # Send a GET request to fetch the data
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an HTTPError for bad responses 
-        return response.json()  # Return the JSON content of the response
+        # Send a GET request and write the body as it arrives
+        with requests.get(url, stream=True, timeout=30) as response:
+            response.raise_for_status()  # Raise an HTTPError for bad responses 
+            with open(output_file, 'wb') as file:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    file.write(chunk)
+        print(f"Data successfully saved to {output_file}")
+        return True
     except requests.exceptions.HTTPError as http_err:
         print(f"HTTP error occurred: {http_err}")
     except requests.exceptions.ConnectionError as conn_err:
@@ -25,26 +28,14 @@ def fetch_nobel_prize_data(url):
         print(f"Timeout error occurred: {timeout_err}")
     except requests.exceptions.RequestException as req_err:
         print(f"An error occurred: {req_err}")
-    return None  # Return None if there's an error
-
-def save_to_json_file(data, output_file):
-    try:
-        # Write the fetched data to a file
-        with open(output_file, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4)
-        print(f"Data successfully saved to {output_file}")
     except IOError as io_err:
         print(f"File I/O error occurred: {io_err}")
+    return False
 
 def main():
-    # Fetch the Nobel Prize data
+    # Download the Nobel Prize data straight to the file
     print("Fetching Nobel Prize data...")
-    data = fetch_nobel_prize_data(API_URL)
-    
-    if data:
-        # If data is successfully fetched, save it to a file
-        save_to_json_file(data, OUTPUT_FILE)
-    else:
+    if not download_nobel_prize_data(API_URL, OUTPUT_FILE):
         print("Failed to fetch Nobel Prize data.")
 
 if __name__ == "__main__":
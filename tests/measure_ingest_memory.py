@@ -0,0 +1,206 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Measures the peak memory (RSS) of the streaming prize
+#              ingestion on a synthetic prize.json of several GB, and fails
+#              if it exceeds a limit. The synthetic file repeats the real
+#              prizes with unique ids and laureate names, so every copy is
+#              a distinct document in Redis. Each ingestion runs in its
+#              own process so that its peak RSS is measured in isolation:
+#                stream     parse, filter and transform every prize (hash,
+#                           name index and count batches) without Redis
+#                redis      full streaming load into the Redis of « .env »,
+#                           skipped if it is not configured
+#                json-load  json.load of the whole file, for comparison
+#
+# Example:
+#   python3 measure_ingest_memory.py --size-gb 2 --max-rss-mb 150
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'brokencloud'))
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data',
+                         'prize.json')
+BATCH_SIZE = 500
+
+
+def write_synthetic_data(path, size_bytes, data_path=DATA_PATH):
+    """
+    Write a prize.json of about size_bytes, streaming it to disk.
+
+    Every copy of a prize gets its own « synthetic-N » id, as in
+    nobel_prize_synthetic, so the loader writes it under its own key
+    instead of overwriting the previous copy's « year:category » one.
+    """
+    with open(data_path, 'r', encoding='utf-8') as file:
+        prizes = json.load(file)['prizes']
+    written = 0
+    copy = 0
+    number = 0
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('{"prizes": [')
+        while written < size_bytes:
+            for prize in prizes:
+                laureates = [
+                    dict(laureate,
+                         surname=f"{laureate.get('surname', '')} {copy}")
+                    for laureate in prize.get('laureates', [])
+                ]
+                text = json.dumps(dict(prize, id=f"synthetic-{number}",
+                                       laureates=laureates))
+                number += 1
+                if written:
+                    file.write(',\n')
+                file.write(text)
+                written += len(text) + 2
+            copy += 1
+        file.write(']}')
+    return os.path.getsize(path)
+
+
+def ingest_stream(path):
+    """Parse, filter and transform every prize, as the loader does."""
+    from nobel_prize_counts import build_laureate_counts
+    from nobel_prize_name_index import build_name_index
+    from nobel_prize_rediscloud_setup import (
+        in_year_range,
+        prize_hash,
+        prize_id
+    )
+    from nobel_prize_stream import iter_prizes_from_file
+
+    count = 0
+    batch = []
+    for prize in iter_prizes_from_file(path):
+        if not in_year_range(prize, 2013, 2023):
+            continue
+        prize["year"] = int(prize["year"])
+        prize_id(prize), prize_hash(prize)
+        batch.append(prize)
+        if len(batch) == BATCH_SIZE:
+            build_laureate_counts(batch)
+            build_name_index(batch)
+            count += len(batch)
+            batch = []
+    build_laureate_counts(batch)
+    build_name_index(batch)
+    return count + len(batch)
+
+
+def ingest_redis(path):
+    """Stream the file into a new dataset generation in Redis."""
+    import redis
+    from nobel_prize_rediscloud_setup import (
+        INDEX_ALIAS,
+        REDIS_HOST,
+        REDIS_PORT,
+        REDIS_PASSWORD,
+        load_dataset
+    )
+    from nobel_prize_stream import iter_prizes_from_file
+
+    client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT,
+                         password=REDIS_PASSWORD, decode_responses=True)
+    if not load_dataset(client, iter_prizes_from_file(path)):
+        raise RuntimeError("Loading the dataset into Redis failed")
+    return int(client.ft(INDEX_ALIAS).info()['num_docs'])
+
+
+def redis_configured():
+    """Return True if « .env » names a Redis to load into."""
+    from nobel_prize_rediscloud_setup import (
+        REDIS_HOST,
+        REDIS_PORT,
+        REDIS_PASSWORD
+    )
+    return all([REDIS_HOST, REDIS_PORT, REDIS_PASSWORD])
+
+
+def ingest_json_load(path):
+    """Load the whole document, as the loader used to."""
+    from nobel_prize_rediscloud_setup import filter_prize_by_year
+    with open(path, 'r', encoding='utf-8') as file:
+        return len(filter_prize_by_year(json.load(file), 2013, 2023))
+
+
+MODES = {
+    'stream': ingest_stream,
+    'redis': ingest_redis,
+    'json-load': ingest_json_load,
+}
+
+
+def measure(mode, path):
+    """Run one ingestion in a child process and return its measurements."""
+    output = subprocess.run([sys.executable, __file__, '--child', mode, path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the peak RSS of the streaming ingestion")
+    parser.add_argument("--size-gb", type=float, default=2.0,
+                        help="Size of the synthetic input")
+    parser.add_argument("--modes", default="stream,redis",
+                        help="Comma separated: stream, redis, json-load")
+    parser.add_argument("--max-rss-mb", type=float, default=150.0,
+                        help="Fail if the streaming peak RSS exceeds this")
+    parser.add_argument("--input", help="Existing input file to reuse")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, path = args.child
+        start = time.perf_counter()
+        result = MODES[mode](path)
+        elapsed = time.perf_counter() - start
+        # ru_maxrss is in kilobytes on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(json.dumps({'mode': mode, 'result': result,
+                          'elapsed_s': elapsed, 'peak_rss_mb': peak}))
+        return
+
+    path = args.input
+    temporary = None
+    if not path:
+        temporary = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+        temporary.close()
+        path = temporary.name
+        print(f"Writing {args.size_gb:g} GB of synthetic prizes to {path}...")
+        write_synthetic_data(path, int(args.size_gb * 1024**3))
+
+    try:
+        size_mb = os.path.getsize(path) / 1024**2
+        print(f"{'mode':10} {'input MB':>9} {'prizes':>9} {'seconds':>8} "
+              f"{'MB/s':>7} {'peak RSS MB':>12}")
+        failed = False
+        for mode in args.modes.split(','):
+            if mode == 'redis' and not redis_configured():
+                print(f"{mode:10} skipped, no Redis configured in .env")
+                continue
+            measured = measure(mode, path)
+            print(f"{mode:10} {size_mb:>9.0f} {measured['result']!s:>9} "
+                  f"{measured['elapsed_s']:>8.1f} "
+                  f"{size_mb / measured['elapsed_s']:>7.1f} "
+                  f"{measured['peak_rss_mb']:>12.1f}")
+            if mode != 'json-load' and \
+                    measured['peak_rss_mb'] > args.max_rss_mb:
+                print(f"FAIL: {mode} peak RSS above {args.max_rss_mb:g} MB")
+                failed = True
+    finally:
+        if temporary:
+            os.unlink(path)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
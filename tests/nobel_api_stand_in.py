@@ -0,0 +1,81 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: Local stand-in for the Nobel Prize API, to test the
+#              incremental sync of « nobel_prize_rediscloud_setup.py »
+#              without network access. It serves a prize JSON file at every
+#              path with ETag and Last-Modified headers, and answers
+#              conditional requests for an unchanged file with 304. The file
+#              is read again on every request, so editing it simulates an
+#              API update.
+#
+# Example:
+#   python3 nobel_api_stand_in.py --data ../data/prize.json --port 8080
+#   python3 nobel_prize_rediscloud_setup.py --sync \
+#       --api-url http://localhost:8080/v1/prize.json
+
+import argparse
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data',
+                         'prize.json')
+
+
+def make_handler(data_path):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with open(data_path, 'rb') as file:
+                body = file.read()
+            modified = int(os.stat(data_path).st_mtime)
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+            # If-None-Match takes precedence over If-Modified-Since
+            if_none_match = self.headers.get('If-None-Match')
+            if_modified_since = self.headers.get('If-Modified-Since')
+            not_modified = False
+            if if_none_match:
+                not_modified = etag in [tag.strip() for tag
+                                        in if_none_match.split(',')]
+            elif if_modified_since:
+                try:
+                    since = parsedate_to_datetime(if_modified_since)
+                    not_modified = modified <= since.timestamp()
+                except (TypeError, ValueError):
+                    pass
+
+            self.send_response(304 if not_modified else 200)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified',
+                             formatdate(modified, usegmt=True))
+            if not_modified:
+                self.end_headers()
+                return
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a prize JSON file like the Nobel Prize API")
+    parser.add_argument("--data", default=DATA_PATH,
+                        help="Prize JSON file to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port),
+                                 make_handler(args.data))
+    print(f"Serving {args.data} on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
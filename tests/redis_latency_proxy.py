@@ -0,0 +1,93 @@
+# AUTHOR: @TheBarzani
+# DESCRIPTION: TCP proxy standing in for a remote Redis replica in local
+#              tests of the read routing. It forwards connections to a local
+#              Redis, delaying every request by a fixed latency, and can be
+#              taken down and brought back with SIGUSR1 to test ejection.
+#
+# Example (a near and a far "replica" of the local Redis):
+#   python3 redis_latency_proxy.py --port 6380 --delay-ms 1 &
+#   python3 redis_latency_proxy.py --port 6381 --delay-ms 20 &
+#   REDIS_REPLICAS=localhost:6380,localhost:6381 \
+#       python3 ../brokencloud/nobel_prize_grpc_server.py
+#   kill -USR1 %2   # The far replica goes down, again to bring it back
+
+import argparse
+import asyncio
+import signal
+
+
+class LatencyProxy:
+    def __init__(self, target_host: str, target_port: int, delay_ms: float):
+        self.target_host = target_host
+        self.target_port = target_port
+        self.delay = delay_ms / 1000
+        self.down = False
+        self.connections = set()
+
+    def toggle(self):
+        """Take the proxy down, closing its connections, or bring it back."""
+        self.down = not self.down
+        if self.down:
+            for writer in list(self.connections):
+                writer.close()
+        print("Proxy down" if self.down else "Proxy up", flush=True)
+
+    async def pipe(self, reader, writer, delay: float):
+        try:
+            while data := await reader.read(65536):
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, client_reader, client_writer):
+        if self.down:
+            client_writer.close()
+            return
+        try:
+            server_reader, server_writer = await asyncio.open_connection(
+                self.target_host, self.target_port)
+        except OSError:
+            client_writer.close()
+            return
+        self.connections.update((client_writer, server_writer))
+        try:
+            await asyncio.gather(
+                self.pipe(client_reader, server_writer, self.delay),
+                self.pipe(server_reader, client_writer, 0))
+        finally:
+            self.connections.difference_update((client_writer,
+                                                server_writer))
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Delaying TCP proxy in front of a Redis server")
+    parser.add_argument("--port", type=int, required=True,
+                        help="Port the proxy listens on")
+    parser.add_argument("--target", default="localhost:6379",
+                        help="host:port of the proxied Redis")
+    parser.add_argument("--delay-ms", type=float, default=0.0,
+                        help="Latency added to every request")
+    args = parser.parse_args()
+
+    host, _, port = args.target.rpartition(':')
+    proxy = LatencyProxy(host, int(port), args.delay_ms)
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1,
+                                                  proxy.toggle)
+    server = await asyncio.start_server(proxy.handle, '127.0.0.1', args.port)
+    print(f"Proxying 127.0.0.1:{args.port} to {args.target} with "
+          f"{args.delay_ms:g} ms of latency", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass